@@ -0,0 +1,126 @@
+"""
+In-process execution of batched API requests.
+
+POST /api/v1/batch/ runs several GET requests of the API in one round
+trip. Each sub-request is dispatched straight to its view: the caller is
+authenticated once, by the batch request, and the same user and token are
+handed to every sub-request (DRF forced authentication), so there is no
+token lookup, middleware pass or throttle check per sub-request. Responses
+are not rendered individually: their data is embedded in the batch
+response, which is rendered once in the negotiated format.
+
+    POST /api/v1/batch/
+    {"requests": [
+        {"path": "/api/v1/cases/5/"},
+        {"path": "/api/v1/documents/?case=5"}
+    ]}
+"""
+
+import json
+import logging
+from io import BytesIO
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import FileResponse
+from django.urls import Resolver404, resolve
+from rest_framework import status
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/'
+BATCH_URL_NAME = 'batch'
+BATCH_METHODS = {'GET'}
+
+# Headers of the batch request that must not apply to its sub-requests
+SKIPPED_META = {'CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE'}
+
+
+def error_result(status_code: int, detail: str) -> dict:
+    """Return the result of a sub-request that could not be run."""
+    return {'status': status_code, 'body': {'detail': detail}}
+
+
+def build_subrequest(request, path: str) -> WSGIRequest:
+    """
+    Build a GET request for a path, authenticated as the batch request.
+
+    Args:
+        request: The batch request (DRF Request).
+        path: Path of the sub-request, with an optional query string.
+
+    Returns:
+        WSGIRequest: The sub-request, with the batch request's headers.
+    """
+    path_info, _, query_string = path.partition('?')
+    environ = {key: value for key, value in request.META.items() if key not in SKIPPED_META}
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path_info,
+        'QUERY_STRING': query_string,
+        'CONTENT_LENGTH': '0',
+        'wsgi.input': BytesIO(),
+    })
+    subrequest = WSGIRequest(environ)
+    # Reuse the batch request's authentication instead of authenticating again
+    subrequest._force_auth_user = request.user
+    subrequest._force_auth_token = request.auth
+    return subrequest
+
+
+def response_body(response):
+    """
+    Return the data of a sub-request's response.
+
+    Returns:
+        The response data, or None if the response is not JSON data
+        (e.g. a file download).
+    """
+    if hasattr(response, 'data'):
+        return response.data
+    if not response.get('Content-Type', '').startswith('application/json'):
+        if isinstance(response, FileResponse):
+            response.file_to_stream.close()
+        return None
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+    return json.loads(content)
+
+
+def run_subrequest(request, spec) -> dict:
+    """
+    Run one sub-request of a batch.
+
+    Args:
+        request: The batch request.
+        spec: The sub-request: {"path": "/api/v1/...", "method": "GET"}.
+
+    Returns:
+        dict: {"status": <HTTP status>, "body": <response data>}.
+    """
+    if not isinstance(spec, dict) or not isinstance(spec.get('path'), str):
+        return error_result(status.HTTP_400_BAD_REQUEST, "Cada petición requiere un campo 'path'.")
+    path = spec['path']
+    method = str(spec.get('method', 'GET')).upper()
+    if method not in BATCH_METHODS:
+        return error_result(status.HTTP_405_METHOD_NOT_ALLOWED, 'Solo se admiten peticiones GET en un lote.')
+    if not path.startswith(API_PREFIX):
+        return error_result(status.HTTP_400_BAD_REQUEST, 'Solo se admiten rutas de la API.')
+    try:
+        match = resolve(path.partition('?')[0])
+    except Resolver404:
+        return error_result(status.HTTP_404_NOT_FOUND, 'No encontrado.')
+    if match.url_name == BATCH_URL_NAME:
+        return error_result(status.HTTP_400_BAD_REQUEST, 'Un lote no puede contener otro lote.')
+
+    subrequest = build_subrequest(request, path)
+    subrequest.resolver_match = match
+    try:
+        response = match.func(subrequest, *match.args, **match.kwargs)
+        body = response_body(response)
+    except Exception:
+        logger.exception('Batch sub-request %s failed', path)
+        return error_result(status.HTTP_500_INTERNAL_SERVER_ERROR, 'Error interno del servidor.')
+    if body is None and response.status_code != status.HTTP_304_NOT_MODIFIED:
+        return error_result(
+            status.HTTP_406_NOT_ACCEPTABLE, 'La respuesta de esta ruta no se puede incluir en un lote.'
+        )
+    return {'status': response.status_code, 'body': body}
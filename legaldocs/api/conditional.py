@@ -0,0 +1,151 @@
+"""
+Conditional GET (ETag / If-None-Match) for polled read endpoints.
+
+Clients send back the ETag of the last response they received; while the
+data is unchanged the API answers 304 Not Modified, without a body,
+before the response is serialized and, in most cases, before the main
+query runs:
+
+- Lists: the ETag is derived from the write generations (core.cache) of
+  the tables the representation reads and the request's query string
+  (filters, ordering, cursor, fields), so checking it costs a cache
+  lookup and no query on the listed table.
+- Details: from the row version (updated_at, a single-row query by
+  primary key) plus the generations of the related tables the
+  representation reads. Models without a version column use the
+  generation of their own table.
+
+Generations only change on ORM saves and deletes (core.signals); code
+that writes with QuerySet.update() or bulk_create() must call
+core.cache.bump_generation() itself, and set updated_at.
+"""
+
+import hashlib
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.cache import get_generations, tracked_tables
+
+
+def make_etag(*parts) -> str:
+    """Return a strong ETag identifying the given version parts."""
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Return True if an If-None-Match header matches the ETag (weak comparison)."""
+    etags = parse_etags(header)
+    if '*' in etags:
+        return True
+    return any(candidate.removeprefix('W/') == etag for candidate in etags)
+
+
+def representation_key(request) -> tuple:
+    """
+    Return what, besides the data, determines the bytes of a response.
+
+    The media type (JSON, MessagePack, browsable API), the host (absolute
+    URLs in the output) and the full path with its query string.
+    """
+    return request.accepted_media_type, request.get_host(), request.get_full_path()
+
+
+def generations_of(labels) -> list:
+    """
+    Return the sorted write generations of the tables of the given models.
+
+    Returns:
+        list: (table, generation) pairs, or None if a model is not in
+        CACHE_GENERATION_MODELS (its writes could not be detected).
+    """
+    tables = {apps.get_model(label)._meta.db_table for label in labels}
+    if not tables <= tracked_tables():
+        return None
+    return sorted(get_generations(tables).items())
+
+
+def not_modified(etag: str) -> Response:
+    """Return a 304 Not Modified response for an ETag."""
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding ETags and If-None-Match handling to list and retrieve.
+
+    Attributes:
+        etag_models: Labels of the other models whose data the
+            representation includes (e.g. a nested client name); their
+            writes change the ETag too. See get_etag_models().
+        etag_version_field: Column that changes on every update of a row
+            (auto_now), or None to version details by table generation.
+
+    Object-level permissions are not checked before answering 304; read
+    access must be decided by get_queryset() and view-level permissions.
+    """
+
+    etag_models = []
+    etag_version_field = 'updated_at'
+
+    def get_etag_models(self) -> list:
+        """Return the labels of the related models read by the current action."""
+        return list(self.etag_models)
+
+    def get_list_etag(self, request):
+        """Return the ETag of the list response, or None if it cannot be derived."""
+        labels = [self.queryset.model._meta.label] + self.get_etag_models()
+        generations = generations_of(labels)
+        if generations is None:
+            return None
+        return make_etag('list', generations, representation_key(request))
+
+    def get_detail_etag(self, request):
+        """Return the ETag of the detail response, or None if it cannot be derived."""
+        model = self.queryset.model
+        labels = self.get_etag_models()
+        version = None
+        try:
+            model._meta.get_field(self.etag_version_field or '')
+        except FieldDoesNotExist:
+            labels.append(model._meta.label)
+        else:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+            version = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values_list(self.etag_version_field, flat=True).first()
+            if version is None:
+                return None
+        generations = generations_of(labels)
+        if generations is None:
+            return None
+        return make_etag('detail', version, generations, representation_key(request))
+
+    def is_not_modified(self, request, etag) -> bool:
+        """Return whether the request's If-None-Match matches the ETag."""
+        return etag is not None and etag_matches(request.headers.get('If-None-Match', ''), etag)
+
+    @staticmethod
+    def tag_response(response, etag):
+        """Set the ETag of a successful response."""
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """List objects, or answer 304 if the client's copy is current."""
+        etag = self.get_list_etag(request)
+        if self.is_not_modified(request, etag):
+            return not_modified(etag)
+        return self.tag_response(super().list(request, *args, **kwargs), etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve an object, or answer 304 if the client's copy is current."""
+        etag = self.get_detail_etag(request)
+        if self.is_not_modified(request, etag):
+            return not_modified(etag)
+        return self.tag_response(super().retrieve(request, *args, **kwargs), etag)
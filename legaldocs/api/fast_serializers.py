@@ -0,0 +1,245 @@
+"""
+Fast, read-only serialization for list endpoints.
+
+ModelSerializer pays a per-field, per-row cost (attribute lookups through
+related objects, get_attribute(), SkipField handling, OrderedDict
+building) that dominates list latency at large page sizes. The classes
+here produce the same output from values_list() tuples instead:
+
+- Only the columns the serializer needs are fetched, joined columns
+  included (e.g. client__full_name), and no model instances are built.
+- The per-field work is compiled once into a list of (name, position,
+  converter) accessors; converters reuse the DRF field's own
+  to_representation(), so formats (dates, files, choices) stay identical,
+  and are skipped for fields whose value is already in output form.
+
+SerializerMethodField values are computed from the columns declared in
+``method_sources``, through a ``get_<field>`` method on the fast class.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .renderers import use_native_dates, wants_native_dates
+from .streaming import StreamingJSONResponse, wants_stream
+
+# DRF fields whose to_representation() returns the database value unchanged
+IDENTITY_FIELD_TYPES = {
+    serializers.CharField: serializers.CharField.to_representation,
+    serializers.IntegerField: serializers.IntegerField.to_representation,
+    serializers.BooleanField: serializers.BooleanField.to_representation,
+}
+
+
+def _is_identity(field) -> bool:
+    """Return True if the field outputs database values as they are."""
+    for field_type, method in IDENTITY_FIELD_TYPES.items():
+        if isinstance(field, field_type):
+            return type(field).to_representation is method
+    return isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None
+
+
+def field_sources(name: str, field, method_sources: dict) -> list:
+    """
+    Return the values_list() columns a serializer field reads.
+
+    Args:
+        name: Field name in the serializer.
+        field: The bound serializer field.
+        method_sources: Columns of SerializerMethodFields, by field name.
+
+    Raises:
+        ImproperlyConfigured: If the field cannot be read from columns
+            (nested serializers, many-related fields, source='*', or a
+            method field missing from method_sources).
+    """
+    if isinstance(field, serializers.SerializerMethodField):
+        try:
+            return list(method_sources[name])
+        except KeyError:
+            raise ImproperlyConfigured(f'method_sources has no entry for "{name}".') from None
+    if field.source == '*' or isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+        raise ImproperlyConfigured(f'"{name}" cannot be read from a single column.')
+    return ['__'.join(field.source_attrs)]
+
+
+class FastListSerializer:
+    """
+    Read-only list serializer built from a ModelSerializer.
+
+    Subclasses set ``serializer_class``; for each SerializerMethodField
+    they declare the columns it needs in ``method_sources`` and implement
+    ``get_<field>(*values)``.
+
+    Usage:
+        fast = CaseListSerializer(context={'request': request})
+        data = fast.serialize(queryset.values_list(*fast.columns))
+    """
+
+    serializer_class = None
+    method_sources = {}
+
+    def __init__(self, context=None, fields=None, native_dates=False):
+        """
+        Compile the accessors for the serializer's readable fields.
+
+        Args:
+            context: Serializer context (the request, for absolute URLs).
+            fields: Names of the fields to output (default: all of them).
+                Columns and joins of the other fields are not fetched.
+            native_dates: Output dates and datetimes as Python objects
+                instead of strings (for MessagePackRenderer).
+        """
+        self.context = context or {}
+        self.serializer = self.serializer_class(context=self.context)
+        if native_dates:
+            use_native_dates(self.serializer)
+        self.fields = {
+            name: field for name, field in self.serializer.fields.items()
+            if not field.write_only and (fields is None or name in fields)
+        }
+        self.columns = []
+        for name, field in self.fields.items():
+            for column in field_sources(name, field, self.method_sources):
+                if column not in self.columns:
+                    self.columns.append(column)
+        if not self.columns:
+            # values_list() without arguments would fetch every column
+            self.columns.append('pk')
+        self.accessors = self._compile_accessors()
+
+    def _compile_accessors(self) -> list:
+        """Return (name, positions, converter, single) tuples, one per field."""
+        model = self.serializer.Meta.model
+        position = {column: index for index, column in enumerate(self.columns)}
+        accessors = []
+        for name, field in self.fields.items():
+            columns = field_sources(name, field, self.method_sources)
+            if isinstance(field, serializers.SerializerMethodField):
+                method = getattr(self, f'get_{name}')
+                accessors.append((name, tuple(position[c] for c in columns), method, False))
+                continue
+
+            column = columns[0]
+            if isinstance(field, serializers.FileField):
+                model_field = model._meta.get_field(column)
+                converter = self._file_converter(field, model_field)
+            elif isinstance(field, serializers.DateTimeField):
+                converter = self._datetime_converter(field)
+            elif _is_identity(field):
+                converter = None
+            else:
+                converter = field.to_representation
+            accessors.append((name, position[column], converter, True))
+        return accessors
+
+    @staticmethod
+    def _file_converter(field, model_field):
+        """Return a converter that turns a stored file name into the DRF representation."""
+        def convert(name):
+            return field.to_representation(FieldFile(None, model_field, name))
+        return convert
+
+    @staticmethod
+    def _datetime_converter(field):
+        """
+        Return a datetime converter with the field's timezone resolved once.
+
+        DateTimeField.to_representation() looks up the active timezone for
+        every value; for aware ISO 8601 output the same result is produced
+        with a single astimezone() call.
+        """
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if (
+            type(field).to_representation is not serializers.DateTimeField.to_representation
+            or type(field).enforce_timezone is not serializers.DateTimeField.enforce_timezone
+            or output_format is None
+            or output_format.lower() != ISO_8601
+            or field_timezone is None
+        ):
+            return field.to_representation
+
+        def convert(value):
+            if isinstance(value, str) or timezone.is_naive(value):
+                return field.to_representation(value)
+            text = value.astimezone(field_timezone).isoformat()
+            return text[:-6] + 'Z' if text.endswith('+00:00') else text
+        return convert
+
+    def serialize(self, rows) -> list:
+        """
+        Build the output dicts for values_list(*self.columns) rows.
+
+        Args:
+            rows: Iterable of tuples in the order of self.columns.
+
+        Returns:
+            list: One dict per row, equal to ModelSerializer(many=True).data.
+        """
+        accessors = self.accessors
+        data = []
+        append = data.append
+        for row in rows:
+            item = {}
+            for name, position, converter, single in accessors:
+                if single:
+                    value = row[position]
+                    item[name] = value if value is None or converter is None else converter(value)
+                else:
+                    item[name] = converter(*[row[index] for index in position])
+            append(item)
+        return data
+
+
+class FastListMixin:
+    """
+    ViewSet mixin that serves the list action through a FastListSerializer.
+
+    Filtering, ordering and pagination work unchanged: they are applied to
+    the values_list() queryset instead of the model queryset. With
+    ?stream=1 all matching rows are streamed as a JSON array instead of
+    paginated (api.streaming).
+    """
+
+    fast_list_serializer_class = None
+
+    def get_response_fields(self):
+        """Return the names of the fields to output, or None for all of them."""
+        return None
+
+    def get_fast_list_serializer(self):
+        """Return the fast serializer for the list action, or None."""
+        if self.fast_list_serializer_class is None:
+            return None
+        return self.fast_list_serializer_class(
+            context=self.get_serializer_context(),
+            fields=self.get_response_fields(),
+            native_dates=wants_native_dates(self.request),
+        )
+
+    def list(self, request, *args, **kwargs):
+        """List objects using the fast serializer when one is configured."""
+        fast = self.get_fast_list_serializer()
+        if fast is None:
+            if wants_stream(request):
+                queryset = self.filter_queryset(self.get_queryset())
+                return StreamingJSONResponse(
+                    queryset,
+                    lambda chunk: self.get_serializer(chunk, many=True).data,
+                    request.accepted_renderer
+                )
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values_list(*fast.columns)
+        if wants_stream(request):
+            return StreamingJSONResponse(rows, fast.serialize, request.accepted_renderer)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
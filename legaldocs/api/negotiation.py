@@ -0,0 +1,26 @@
+"""
+Content negotiation classes for the LegalDocs API.
+
+Provides a lenient negotiation class for endpoints that return raw file
+contents instead of rendered data.
+"""
+
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class FileDownloadContentNegotiation(DefaultContentNegotiation):
+    """
+    Content negotiation that never rejects a request with 406.
+
+    File download endpoints answer with the file's own content type, so an
+    Accept header such as 'application/pdf' must not fail negotiation.
+    Falls back to the first renderer, which is only used for error bodies.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        """Select a renderer, falling back to the first one."""
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            return (renderers[0], renderers[0].media_type)
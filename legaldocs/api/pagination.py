@@ -0,0 +1,481 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Page-number pagination runs a COUNT(*) for every page and reads deep pages
+with OFFSET, which scans and discards every earlier row. Keyset pagination
+instead remembers the ordering values of the last row of a page and asks
+for the rows after it:
+
+    WHERE (start_date, id) < (:start_date, :id) ORDER BY start_date DESC, id DESC
+
+With a composite index on the ordering columns, every page costs the same
+as the first one and no count query is needed.
+
+The cursor works over the current ordering of the queryset (the view's
+default ordering or ?ordering=), with the primary key appended as a
+tiebreak so that rows sharing a value are neither skipped nor repeated.
+Clients opt in to page-number pagination (with count) by sending ?page=.
+
+Page-number counts avoid a COUNT(*) per request as well: exact counts are
+cached per filter signature until a write to one of the counted tables
+starts a new generation (core.cache), and on PostgreSQL counts above
+PAGINATION_COUNT_ESTIMATE_THRESHOLD are planner estimates. Responses say
+which one they got in "count_exact".
+"""
+
+import base64
+import binascii
+import datetime
+import decimal
+import hashlib
+import json
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ValuesIterable, ValuesListIterable
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.cache import get_generations, tracked_tables
+
+
+def _encode_value(value):
+    """Return a JSON-serializable form of an ordering value (lossless)."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _resolve_field(model, name):
+    """
+    Return the model field an ordering name refers to.
+
+    Args:
+        model: Model class of the queryset.
+        name: Ordering name, possibly spanning relations ('client__full_name').
+
+    Raises:
+        FieldDoesNotExist: If the name does not lead to a concrete field.
+    """
+    parts = name.split(LOOKUP_SEP)
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+        if model is None:
+            raise FieldDoesNotExist(name)
+    if parts[-1] == 'pk':
+        return model._meta.pk
+    return model._meta.get_field(parts[-1])
+
+
+def estimate_count(queryset):
+    """
+    Return the query planner's estimate of the number of rows of a queryset.
+
+    Unfiltered querysets read the table statistics (pg_class.reltuples);
+    filtered ones the row estimate of EXPLAIN.
+
+    Returns:
+        int: The estimate, or None if the database cannot provide one.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            sql, params = queryset.order_by().values('pk').query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]['Plan']['Plan Rows']
+    # reltuples is -1 for tables that were never analyzed
+    return int(estimate) if estimate >= 0 else None
+
+
+def count_cache_key(queryset):
+    """
+    Return the cache key of the exact count of a queryset.
+
+    The key combines the SQL of the query with the write generations of the
+    counted tables, so any write to them makes it obsolete. Joined tables
+    that are not in CACHE_GENERATION_MODELS are not tracked.
+
+    Returns:
+        str: The key, or None if the queried model is not tracked.
+    """
+    tracked = tracked_tables()
+    table = queryset.model._meta.db_table
+    if table not in tracked:
+        return None
+    query = queryset.order_by().values('pk').query
+    tables = {table} | {join.table_name for join in query.alias_map.values()}
+    generations = sorted(get_generations(tables & tracked).items())
+    signature = repr((query.sql_with_params(), generations))
+    return 'count:' + hashlib.sha1(signature.encode()).hexdigest()
+
+
+def count_rows(queryset):
+    """
+    Count the rows of a queryset, from the cache or the planner when possible.
+
+    Returns:
+        tuple: (count, exact), where exact is False for planner estimates.
+    """
+    key = count_cache_key(queryset)
+    if key is not None:
+        count = cache.get(key)
+        if count is not None:
+            return count, True
+
+    estimate = estimate_count(queryset)
+    if estimate is not None and estimate >= settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+        return estimate, False
+
+    count = queryset.count()
+    if key is not None:
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count, True
+
+
+class CountingPaginator(Paginator):
+    """Paginator whose count comes from count_rows() (cached or estimated)."""
+
+    count_exact = True
+
+    @cached_property
+    def count(self):
+        """Return the (possibly estimated) number of objects."""
+        count, self.count_exact = count_rows(self.object_list)
+        return count
+
+
+class CountedPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination with cached or estimated counts.
+
+    Adds "count_exact" to the response: False when "count" is a planner
+    estimate, in which case the last pages may turn out shorter or empty.
+    """
+
+    django_paginator_class = CountingPaginator
+
+    def get_paginated_response(self, data):
+        """Return the page with count, count_exact and links."""
+        paginator = self.page.paginator
+        return Response(OrderedDict([
+            ('count', paginator.count),
+            ('count_exact', paginator.count_exact),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        """Describe count_exact in the OpenAPI schema."""
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_exact'] = {'type': 'boolean', 'example': True}
+        return response_schema
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over the queryset's ordering plus an id tiebreak.
+
+    Responses have the shape {"next": url, "previous": url, "results": [...]}.
+    Works with model querysets and with the values_list() querysets of the
+    fast list path (api.fast_serializers). Orderings that cannot be keyed
+    (expressions, random order) and requests with ?page= are served by
+    page_number_class instead.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    page_number_class = CountedPageNumberPagination
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def __init__(self):
+        self.fallback = None
+
+    # -------------------------------------------------------------------------
+    # Ordering
+    # -------------------------------------------------------------------------
+
+    def get_ordering(self, queryset):
+        """
+        Return the keyset ordering of a queryset.
+
+        Args:
+            queryset: The filtered and ordered queryset.
+
+        Returns:
+            list: (name, descending) pairs ending with the primary key, or
+            None if the ordering cannot be used as a key.
+        """
+        query = queryset.query
+        order_by = list(query.order_by) or list(query.get_meta().ordering)
+        pk_name = queryset.model._meta.pk.name
+        ordering = []
+        for item in order_by:
+            if not isinstance(item, str) or item == '?':
+                return None
+            descending = item.startswith('-')
+            name = item.lstrip('-')
+            if name == 'pk':
+                name = pk_name
+            try:
+                _resolve_field(queryset.model, name)
+            except FieldDoesNotExist:
+                return None
+            ordering.append((name, descending))
+            if name == pk_name:
+                # Rows are unique from here on, later columns never decide
+                return ordering
+        ordering.append((pk_name, ordering[0][1] if ordering else False))
+        return ordering
+
+    # -------------------------------------------------------------------------
+    # Cursors
+    # -------------------------------------------------------------------------
+
+    def encode_cursor(self, values, reverse: bool) -> str:
+        """Return the opaque cursor for the given ordering values."""
+        payload = {'v': [_encode_value(value) for value in values]}
+        if reverse:
+            payload['r'] = 1
+        data = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    def decode_cursor(self, request, model, ordering):
+        """
+        Read the cursor of the request.
+
+        Returns:
+            tuple: (values, reverse), or (None, False) without a cursor.
+
+        Raises:
+            NotFound: If the cursor is malformed or does not fit the ordering.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            raw_values = payload['v']
+            if len(raw_values) != len(ordering):
+                raise ValueError
+            values = [
+                _resolve_field(model, name).to_python(value)
+                for (name, _), value in zip(ordering, raw_values)
+            ]
+            if any(value is None for value in values):
+                raise ValueError
+            return values, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def build_filter(self, ordering, values, reverse: bool) -> Q:
+        """
+        Return the condition selecting rows after (or before) the cursor.
+
+        (a, b, id) > (x, y, z) is expanded into
+        a >= x AND (a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z)),
+        with each comparison flipped for descending columns. The redundant
+        bound on the leading column lets the database seek the index to the
+        cursor and read on in order, instead of sorting every row the OR
+        chain matches.
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(ordering, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        (name, descending), value = ordering[0], values[0]
+        return Q(**{f'{name}__{"lte" if descending != reverse else "gte"}': value}) & condition
+
+    # -------------------------------------------------------------------------
+    # Pagination
+    # -------------------------------------------------------------------------
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of rows, keyed on the ordering of the queryset."""
+        self.fallback = None
+        ordering = None
+        keyable_rows = not queryset._fields or queryset._iterable_class in (ValuesIterable, ValuesListIterable)
+        if self.page_query_param not in request.query_params and keyable_rows:
+            ordering = self.get_ordering(queryset)
+        if ordering is None:
+            self.fallback = self.page_number_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        values, reverse = self.decode_cursor(request, queryset.model, ordering)
+        names = [name for name, _ in ordering]
+        queryset, read_key, width = self._with_key_columns(queryset, names)
+
+        if values is not None:
+            queryset = queryset.filter(self.build_filter(ordering, values, reverse))
+        queryset = queryset.order_by(*[
+            f'-{name}' if descending != reverse else name for name, descending in ordering
+        ])
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Going backwards, the rows after this page are the ones we came from
+        self.next_values = self.previous_values = None
+        if rows:
+            more_after, more_before = (True, has_more) if reverse else (has_more, values is not None)
+            if more_after:
+                self.next_values = read_key(rows[-1])
+            if more_before:
+                self.previous_values = read_key(rows[0])
+        if width is not None:
+            rows = [row[:width] for row in rows]
+        return rows
+
+    def _with_key_columns(self, queryset, names):
+        """
+        Make sure the rows carry the ordering values.
+
+        Returns:
+            tuple: (queryset, read_key, width) where read_key(row) returns the
+            ordering values of a row and width, if not None, is the row length
+            the caller asked for (extra key columns are cut off again).
+        """
+        fields = queryset._fields
+        if fields:
+            missing = [name for name in names if name not in fields]
+            if queryset._iterable_class is ValuesIterable:
+                if missing:
+                    queryset = queryset.values(*fields, *missing)
+                return queryset, lambda row: [row[name] for name in names], None
+            columns = list(fields) + missing
+            if missing:
+                queryset = queryset.values_list(*columns)
+            positions = [columns.index(name) for name in names]
+            return queryset, lambda row: [row[index] for index in positions], \
+                len(fields) if missing else None
+
+        loaded, deferred = queryset.query.deferred_loading
+        if loaded and not deferred:
+            # only(): load the ordering columns as well, avoiding a query per row
+            queryset = queryset.only(*loaded, *names)
+        attributes = [name.split(LOOKUP_SEP) for name in names]
+
+        def read_key(instance):
+            key = []
+            for path in attributes:
+                value = instance
+                for attribute in path:
+                    value = getattr(value, attribute)
+                key.append(value)
+            return key
+        return queryset, read_key, None
+
+    def get_next_link(self):
+        """Return the URL of the next page, or None."""
+        if self.fallback is not None:
+            return self.fallback.get_next_link()
+        if self.next_values is None:
+            return None
+        return self._link(self.next_values, reverse=False)
+
+    def get_previous_link(self):
+        """Return the URL of the previous page, or None."""
+        if self.fallback is not None:
+            return self.fallback.get_previous_link()
+        if self.previous_values is None:
+            return None
+        return self._link(self.previous_values, reverse=True)
+
+    def _link(self, values, reverse: bool) -> str:
+        """Return the current URL with the cursor for the given values."""
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values, reverse))
+
+    def get_paginated_response(self, data):
+        """Return the page with next and previous links (and count in page mode)."""
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the cursor response in the OpenAPI schema."""
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {
+                    'type': 'integer',
+                    'description': 'Solo con paginación por número de página (?page=).',
+                    'example': 123,
+                },
+                'count_exact': {
+                    'type': 'boolean',
+                    'description': 'Falso si count es una estimación del planificador.',
+                    'example': True,
+                },
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'example': 'http://api.example.org/accounts/?cursor=eyJ2IjpbMjBdfQ',
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'example': 'http://api.example.org/accounts/?cursor=eyJ2IjpbMjFdLCJyIjoxfQ',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        """Document the cursor and page query parameters."""
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor de paginación (enlaces next/previous).',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Número de página; activa la paginación por páginas con count.',
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -0,0 +1,72 @@
+"""
+Parsers for the LegalDocs API.
+
+FastJSONParser parses request bodies with orjson, falling back to DRF's
+JSONParser when orjson is not installed or the body is not UTF-8.
+MessagePackParser reads the binary format of MessagePackRenderer.
+"""
+
+import codecs
+import struct
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import DATE_EXT_TYPE, unpack_date
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson.
+
+    Like the standard parser, NaN and Infinity are rejected (orjson never
+    accepts them).
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming bytestream as JSON and return the resulting data."""
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parser for MessagePack request bodies.
+
+    Timestamps are decoded as aware UTC datetimes and DATE_EXT_TYPE values
+    as dates (see api.renderers), which serializer fields accept as is.
+    """
+
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming bytestream as MessagePack and return the resulting data."""
+        assert msgpack is not None, 'MessagePackParser requires msgpack to be installed'
+        try:
+            return msgpack.unpackb(stream.read(), timestamp=3, ext_hook=self.ext_hook, strict_map_key=False)
+        except (ValueError, TypeError, struct.error, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
+
+    @staticmethod
+    def ext_hook(code: int, data: bytes):
+        """Decode the application extension types."""
+        if code == DATE_EXT_TYPE:
+            return unpack_date(data)
+        return msgpack.ExtType(code, data)
@@ -32,3 +32,28 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return obj.uploaded_by == request.user or request.user.is_staff
 
         return True
+
+
+def can_access_document_file(user, document) -> bool:
+    """
+    Return True if the user may access the file of a document.
+
+    Files of confidential documents are only available to the uploader,
+    the lawyer assigned to the document's case, and staff users.
+    """
+    if not document.is_confidential or user.is_staff:
+        return True
+    return user.pk in (document.uploaded_by_id, document.case.assigned_to_id)
+
+
+class CanAccessDocumentFile(permissions.BasePermission):
+    """
+    Permission for endpoints that deliver document file contents.
+
+    Non-confidential files are available to any authenticated user;
+    confidential ones follow can_access_document_file().
+    """
+
+    def has_object_permission(self, request, view, obj):
+        """Check if the user may access the document's file."""
+        return can_access_document_file(request.user, obj)
@@ -0,0 +1,249 @@
+"""
+Renderers for the LegalDocs API.
+
+FastJSONRenderer produces the same JSON as DRF's JSONRenderer but encodes
+it with orjson (a C extension), which is several times faster on large
+list responses. Without orjson installed, or for values orjson cannot
+encode, it falls back to the standard renderer.
+
+MessagePackRenderer is an opt-in binary format (Accept: application/msgpack
+or ?format=msgpack). Dates and datetimes are sent as native values in
+compact extension types instead of ISO 8601 strings:
+
+- datetime: the standard MessagePack timestamp extension (type -1).
+- date: extension type 1 (DATE_EXT_TYPE), days since 1970-01-01 as a
+  big-endian signed 32-bit integer.
+
+Views opt in to native dates with NativeDatesMixin; elsewhere dates stay
+the strings their serializers produce.
+"""
+
+import datetime
+import decimal
+import functools
+import struct
+import uuid
+
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework import ISO_8601, serializers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+DATE_EXT_TYPE = 1
+EPOCH_DATE = datetime.date(1970, 1, 1)
+
+
+def _format_datetime(value: datetime.datetime) -> str:
+    """Format a datetime like DRF: DATETIME_FORMAT, or its ISO 8601 encoding."""
+    output_format = api_settings.DATETIME_FORMAT
+    if output_format is None or output_format.lower() == ISO_8601:
+        representation = value.isoformat()
+        if representation.endswith('+00:00'):
+            representation = representation[:-6] + 'Z'
+        return representation
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.strftime(output_format)
+
+
+def _format_date(value: datetime.date) -> str:
+    """Format a date like DRF: DATE_FORMAT, or ISO 8601."""
+    output_format = api_settings.DATE_FORMAT
+    if output_format is None or output_format.lower() == ISO_8601:
+        return value.isoformat()
+    return value.strftime(output_format)
+
+
+def default(obj):
+    """
+    Encode the values orjson does not handle natively (or is told to pass through).
+
+    Mirrors rest_framework.utils.encoders.JSONEncoder, except that dates and
+    datetimes follow DRF's DATE_FORMAT and DATETIME_FORMAT.
+    """
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, datetime.datetime):
+        return _format_datetime(obj)
+    if isinstance(obj, datetime.date):
+        return _format_date(obj)
+    if isinstance(obj, datetime.time):
+        if timezone.is_aware(obj):
+            raise ValueError("JSON can't represent timezone-aware times.")
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, decimal.Decimal):
+        # Serializers coerce decimals to strings by default
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, QuerySet):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__getitem__'):
+        try:
+            return dict(obj)
+        except Exception:
+            pass
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """Standard library encoder formatting dates and datetimes like default()."""
+
+    def default(self, obj):
+        """Encode dates and datetimes with DRF's formats, anything else as DRF does."""
+        if isinstance(obj, datetime.datetime):
+            return _format_datetime(obj)
+        if isinstance(obj, datetime.date):
+            return _format_date(obj)
+        return super().default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson.
+
+    Dates and datetimes follow REST_FRAMEWORK['DATE_FORMAT'] and
+    ['DATETIME_FORMAT'] like serializer fields do; Decimal, UUID, lazy
+    strings and querysets are encoded as DRF's encoder does. Indented or
+    ASCII-only output (e.g. for the browsable API, or UNICODE_JSON off)
+    uses the standard renderer. Unlike it, NaN and infinite floats are
+    rendered as null instead of raising an error.
+    """
+
+    encoder_class = JSONEncoder
+
+    def get_orjson_options(self) -> int:
+        """
+        Return the orjson options matching DRF's date and datetime output.
+
+        With ISO 8601 formats orjson writes dates and datetimes natively,
+        exactly as JSONEncoder does; custom formats go through default().
+        """
+        options = orjson.OPT_NON_STR_KEYS
+        formats = (api_settings.DATETIME_FORMAT, api_settings.DATE_FORMAT)
+        if all(output_format is None or output_format.lower() == ISO_8601 for output_format in formats):
+            return options | orjson.OPT_UTC_Z
+        return options | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON bytes."""
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if orjson is None or self.ensure_ascii or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=default, option=self.get_orjson_options())
+        except TypeError:
+            # orjson.JSONEncodeError, e.g. integers above 64 bits: let the
+            # standard renderer decide
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape line and paragraph separators, as JSONRenderer does
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+# Lists repeat the same few dates (start dates, deadlines): cache both ways
+@functools.lru_cache(maxsize=4096)
+def pack_date(value: datetime.date):
+    """Return the MessagePack extension value of a date."""
+    return msgpack.ExtType(DATE_EXT_TYPE, struct.pack('>i', (value - EPOCH_DATE).days))
+
+
+@functools.lru_cache(maxsize=4096)
+def unpack_date(data: bytes) -> datetime.date:
+    """Return the date of a DATE_EXT_TYPE extension payload."""
+    return EPOCH_DATE + datetime.timedelta(days=struct.unpack('>i', data)[0])
+
+
+def msgpack_default(obj):
+    """Encode the values MessagePack does not handle natively."""
+    if type(obj) is datetime.date:
+        return pack_date(obj)
+    if isinstance(obj, datetime.datetime):
+        # Aware datetimes are packed as timestamps by msgpack itself
+        return msgpack.Timestamp.from_datetime(timezone.make_aware(obj))
+    if isinstance(obj, datetime.date):
+        return pack_date(obj)
+    return default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer producing MessagePack.
+
+    Values are encoded like FastJSONRenderer encodes them, except that
+    datetimes and dates use the compact extension types described above.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    native_dates = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into MessagePack bytes."""
+        assert msgpack is not None, 'MessagePackRenderer requires msgpack to be installed'
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=msgpack_default, datetime=True)
+
+
+def wants_native_dates(request) -> bool:
+    """Return whether the accepted renderer encodes dates natively."""
+    renderer = getattr(request, 'accepted_renderer', None)
+    return getattr(renderer, 'native_dates', False)
+
+
+def use_native_dates(serializer) -> None:
+    """
+    Make the date and datetime fields of a serializer output Python objects.
+
+    Sets format=None on every DateField and DateTimeField, nested
+    serializers included, which DRF fields return unformatted.
+    """
+    serializer = getattr(serializer, 'child', serializer)
+    for field in serializer.fields.values():
+        if isinstance(field, (serializers.DateField, serializers.DateTimeField)):
+            field.format = None
+        elif isinstance(field, serializers.BaseSerializer):
+            use_native_dates(field)
+
+
+class NativeDatesMixin:
+    """
+    ViewSet mixin giving renderers with native_dates date objects, not strings.
+
+    Serializers format dates for JSON; for MessagePack they are left as
+    dates and datetimes, which the renderer packs into compact extension
+    types.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        """Return the serializer, with native dates if the renderer wants them."""
+        serializer = super().get_serializer(*args, **kwargs)
+        if wants_native_dates(self.request):
+            use_native_dates(serializer)
+        return serializer
@@ -0,0 +1,149 @@
+"""
+Sparse fieldsets for read endpoints.
+
+Clients choose the fields of list and detail responses with query
+parameters:
+
+    GET /api/v1/cases/?fields=id,case_number,title,status
+    GET /api/v1/cases/?omit=description
+
+The selection trims the database work as well as the output: the
+queryset loads only the needed columns (only()), keeps only the
+select_related() joins that a selected field goes through and drops
+prefetches; the fast list path (api.fast_serializers) fetches only the
+selected columns.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ValidationError
+
+from .fast_serializers import field_sources
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+# Actions whose responses can be trimmed
+SPARSE_ACTIONS = {'list', 'retrieve'}
+
+
+def parse_field_names(value: str) -> list:
+    """Split a comma-separated list of field names."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def prune_queryset(queryset, serializer, names, method_sources: dict):
+    """
+    Restrict a queryset to the columns and joins the given fields read.
+
+    Args:
+        queryset: The model queryset of the view.
+        serializer: Serializer instance whose fields are selected.
+        names: Names of the selected fields.
+        method_sources: Columns of SerializerMethodFields, by field name.
+
+    Returns:
+        QuerySet: The pruned queryset, or the original one if a selected
+        field cannot be mapped to columns (e.g. a nested serializer).
+    """
+    paths, joins = set(), set()
+    for name in names:
+        try:
+            sources = field_sources(name, serializer.fields[name], method_sources)
+        except ImproperlyConfigured:
+            return queryset
+        for source in sources:
+            parts = source.split('__')
+            for depth in range(1, len(parts)):
+                joins.add('__'.join(parts[:depth]))
+            paths.add(source)
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    return queryset.only(*paths, *joins)
+
+
+class SparseFieldsMixin:
+    """
+    ViewSet mixin implementing ?fields= and ?omit= for list and retrieve.
+
+    Unknown field names are rejected with 400 Bad Request.
+    """
+
+    def _readable_serializer(self):
+        """Return an unbound instance of the serializer of the current action."""
+        if not hasattr(self, '_sparse_serializer'):
+            self._sparse_serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        return self._sparse_serializer
+
+    def get_response_fields(self):
+        """
+        Return the names of the fields requested by the client.
+
+        Returns:
+            list: Selected field names in serializer order, or None when the
+            request does not ask for a sparse fieldset.
+
+        Raises:
+            ValidationError: If a requested field does not exist.
+        """
+        if hasattr(self, '_response_fields'):
+            return self._response_fields
+
+        self._response_fields = None
+        request = self.request
+        if request is None or request.method != 'GET' or self.action not in SPARSE_ACTIONS:
+            return None
+        requested = request.query_params.get(FIELDS_PARAM)
+        omitted = request.query_params.get(OMIT_PARAM)
+        if requested is None and omitted is None:
+            return None
+
+        available = [
+            name for name, field in self._readable_serializer().fields.items()
+            if not field.write_only
+        ]
+        selected = set(available)
+        errors = {}
+        for param, value in ((FIELDS_PARAM, requested), (OMIT_PARAM, omitted)):
+            if value is None:
+                continue
+            names = parse_field_names(value)
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                errors[param] = [f'Campos desconocidos: {", ".join(unknown)}.']
+            elif param == FIELDS_PARAM:
+                selected &= set(names)
+            else:
+                selected -= set(names)
+        if errors:
+            raise ValidationError(errors)
+
+        self._response_fields = [name for name in available if name in selected]
+        return self._response_fields
+
+    def get_method_sources(self) -> dict:
+        """Return the columns read by the method fields of the current serializer."""
+        fast = getattr(self, 'fast_list_serializer_class', None)
+        if fast is not None and fast.serializer_class is self.get_serializer_class():
+            return fast.method_sources
+        return {}
+
+    def get_queryset(self):
+        """Return the queryset restricted to the requested fields."""
+        queryset = super().get_queryset()
+        fields = self.get_response_fields()
+        if fields is None:
+            return queryset
+        return prune_queryset(queryset, self._readable_serializer(), fields, self.get_method_sources())
+
+    def get_serializer(self, *args, **kwargs):
+        """Return the serializer without the fields the client left out."""
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_response_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    target.fields.pop(name)
+        return serializer
@@ -0,0 +1,81 @@
+"""
+Streaming JSON responses for large unpaginated lists.
+
+A list serialized with many=True is built in memory as a whole (rows,
+serializer output and rendered bytes) before the first byte is sent.
+StreamingJSONResponse instead iterates the queryset with
+.iterator(chunk_size=...) and writes the JSON array one chunk of elements
+at a time, so memory use stays flat whatever the number of rows.
+
+List endpoints stream with ?stream=1 (all matching rows, no pagination):
+
+    GET /api/v1/cases/?stream=1&client=12
+"""
+
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+STREAM_PARAM = 'stream'
+
+
+def wants_stream(request) -> bool:
+    """
+    Return whether the request asks for, and can get, a streamed JSON list.
+
+    Only JSON is streamed; other formats (e.g. the browsable API) get a
+    regular response.
+    """
+    value = request.query_params.get(STREAM_PARAM, '')
+    if value.lower() not in ('1', 'true'):
+        return False
+    return getattr(request, 'accepted_renderer', None) is not None and request.accepted_renderer.format == 'json'
+
+
+def iter_json_array(rows, serialize, renderer, chunk_size: int):
+    """
+    Yield a JSON array of serialized rows in chunks of bytes.
+
+    Args:
+        rows: Iterable of rows (instances or values_list() tuples).
+        serialize: Function turning a list of rows into a list of dicts.
+        renderer: JSON renderer used for each chunk of elements.
+        chunk_size: Number of rows serialized and rendered at a time.
+
+    Yields:
+        bytes: '[', then the elements chunk by chunk, then ']'.
+    """
+    iterator = iter(rows)
+    yield b'['
+    separator = b''
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        rendered = renderer.render(serialize(chunk))
+        # Strip the brackets of the rendered chunk: '[a,b]' -> 'a,b'
+        yield separator + rendered[1:-1]
+        separator = b','
+    yield b']'
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    StreamingHttpResponse writing a queryset as a JSON array.
+
+    Args:
+        queryset: Queryset (model or values_list()) to stream.
+        serialize: Function turning a list of rows into a list of dicts.
+        renderer: JSON renderer for the elements (the request's accepted one).
+        chunk_size: Rows fetched and rendered at a time
+            (default: settings.API_STREAM_CHUNK_SIZE).
+    """
+
+    def __init__(self, queryset, serialize, renderer, chunk_size=None, **kwargs):
+        chunk_size = chunk_size or settings.API_STREAM_CHUNK_SIZE
+        kwargs.setdefault('content_type', renderer.media_type)
+        super().__init__(
+            iter_json_array(queryset.iterator(chunk_size=chunk_size), serialize, renderer, chunk_size),
+            **kwargs
+        )
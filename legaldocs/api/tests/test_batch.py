@@ -0,0 +1,137 @@
+"""
+Tests for the batch endpoint.
+
+Tests that POST /api/v1/batch/ returns the same status and data as the
+individual requests, authenticates once and isolates failing sub-requests.
+"""
+
+import io
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api.parsers import MessagePackParser
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.models import Document
+
+
+class BatchTests(APITestCase):
+    """Tests for POST /api/v1/batch/."""
+
+    def setUp(self):
+        """Create a client with a case and a document, and authenticate."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='batcher', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client_obj = Client.objects.create(
+            full_name='Cliente Lote',
+            identification_number='BATCH001',
+            email='batch@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=self.client_obj,
+            title='Caso Lote',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.document = Document.objects.create(
+            case=self.case,
+            title='Contrato',
+            document_type='contrato',
+            file=SimpleUploadedFile('contrato.pdf', b'%PDF-1.4 contrato', 'application/pdf'),
+            uploaded_by=self.user
+        )
+
+    def batch(self, paths, **extra):
+        """POST a batch of GET paths and return the response."""
+        return self.client.post(
+            '/api/v1/batch/', {'requests': [{'path': path} for path in paths]}, format='json', **extra
+        )
+
+    def test_results_match_individual_requests(self):
+        """Test that each result has the status and data of the request made on its own."""
+        paths = [
+            f'/api/v1/cases/{self.case.id}/',
+            f'/api/v1/clients/{self.client_obj.id}/',
+            f'/api/v1/documents/?case={self.case.id}',
+            '/api/v1/cases/statistics/',
+            '/api/v1/profile/',
+        ]
+        response = self.batch(paths)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['responses']
+        self.assertEqual(len(results), len(paths))
+        for path, result in zip(paths, results):
+            with self.subTest(path=path):
+                single = self.client.get(path)
+                self.assertEqual(result['status'], single.status_code)
+                self.assertEqual(result['body'], single.json())
+
+    def test_streamed_response(self):
+        """Test that streamed JSON responses (client cases) are embedded."""
+        response = self.batch([f'/api/v1/clients/{self.client_obj.id}/cases/'])
+        result = response.json()['responses'][0]
+        self.assertEqual(result['status'], status.HTTP_200_OK)
+        self.assertEqual([case['id'] for case in result['body']], [self.case.id])
+
+    def test_authenticates_once(self):
+        """Test that the token is looked up once for the whole batch."""
+        paths = [f'/api/v1/cases/{self.case.id}/', '/api/v1/profile/', '/api/v1/auth/me/']
+        with CaptureQueriesContext(connection) as context:
+            self.batch(paths)
+        token_queries = [q for q in context.captured_queries if 'authtoken_token' in q['sql']]
+        self.assertEqual(len(token_queries), 1)
+
+    def test_failures_are_isolated(self):
+        """Test that invalid, unknown and unsupported sub-requests fail on their own."""
+        response = self.client.post('/api/v1/batch/', {'requests': [
+            {'path': '/api/v1/cases/999999/'},
+            {'path': '/api/v1/nothing/'},
+            {'path': '/admin/'},
+            {'path': '/api/v1/cases/', 'method': 'DELETE'},
+            {'path': '/api/v1/batch/'},
+            {'path': f'/api/v1/documents/{self.document.id}/download/'},
+            {'method': 'GET'},
+            {'path': '/api/v1/auth/me/'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = [result['status'] for result in response.json()['responses']]
+        self.assertEqual(statuses, [404, 404, 400, 405, 400, 406, 400, 200])
+
+    def test_sub_request_etags(self):
+        """Test that the batch request's If-None-Match does not apply to sub-requests."""
+        etag = self.client.get(f'/api/v1/cases/{self.case.id}/')['ETag']
+        response = self.batch([f'/api/v1/cases/{self.case.id}/'], HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()['responses'][0]['status'], status.HTTP_200_OK)
+
+    def test_msgpack(self):
+        """Test that a MessagePack batch carries native dates from the sub-requests."""
+        response = self.batch([f'/api/v1/cases/{self.case.id}/'], HTTP_ACCEPT='application/msgpack')
+        data = MessagePackParser().parse(io.BytesIO(response.content), 'application/msgpack')
+        self.assertEqual(data['responses'][0]['body']['start_date'], self.case.start_date)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_invalid_batches(self):
+        """Test that empty, malformed and oversized batches are rejected."""
+        for body in [{}, {'requests': []}, {'requests': 'x'}, {'requests': [{'path': '/api/v1/cases/'}] * 3}]:
+            with self.subTest(body=body):
+                response = self.client.post('/api/v1/batch/', body, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        """Test that the batch request itself must be authenticated."""
+        self.client.credentials()
+        response = self.batch(['/api/v1/auth/me/'])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,165 @@
+"""
+Tests for conditional GET.
+
+Tests the ETags of list, detail and dashboard responses, 304 Not Modified
+answers to a matching If-None-Match and their invalidation by writes.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.models import Document
+
+
+class ConditionalGetTests(APITestCase):
+    """Tests for ETag / If-None-Match on the API endpoints."""
+
+    def setUp(self):
+        """Create a client with a case and a document, and authenticate."""
+        use_temporary_media_root(self)
+        cache.clear()
+        self.user = User.objects.create_user(username='poller', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client_obj = Client.objects.create(
+            full_name='Cliente Sondeado',
+            identification_number='ETAG001',
+            email='etag@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=self.client_obj,
+            title='Caso Sondeado',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.document = Document.objects.create(
+            case=self.case,
+            title='Contrato',
+            document_type='contrato',
+            file=SimpleUploadedFile('contrato.pdf', b'%PDF-1.4 contrato', 'application/pdf'),
+            uploaded_by=self.user
+        )
+
+    def assert_not_modified(self, url, etag, if_none_match=None):
+        """Assert that the URL answers 304 to the ETag, and return the queries it ran."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=if_none_match or etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        return queries
+
+    def assert_modified(self, url, etag):
+        """Assert that the URL answers 200 with a new ETag."""
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_list_not_modified_without_querying_rows(self):
+        """Test that a list answers 304 from the write generations alone."""
+        url = '/api/v1/cases/?status=en_proceso'
+        etag = self.client.get(url)['ETag']
+        queries = self.assert_not_modified(url, etag)
+        self.assertFalse([q for q in queries.captured_queries if '"cases_case"' in q['sql']])
+
+    def test_list_etag_depends_on_query_and_format(self):
+        """Test that filters, pages and formats have their own ETags."""
+        etags = {
+            self.client.get(url, HTTP_ACCEPT=accept)['ETag']
+            for url, accept in [
+                ('/api/v1/cases/', 'application/json'),
+                ('/api/v1/cases/?status=en_proceso', 'application/json'),
+                ('/api/v1/cases/?fields=id', 'application/json'),
+                ('/api/v1/cases/', 'application/msgpack'),
+            ]
+        }
+        self.assertEqual(len(etags), 4)
+
+    def test_list_invalidated_by_writes(self):
+        """Test that writes to the listed or nested tables change the list ETag."""
+        url = '/api/v1/cases/'
+        etag = self.client.get(url)['ETag']
+        self.case.title = 'Renombrado'
+        self.case.save()
+        etag = self.assert_modified(url, etag)
+        # The list shows the client's name
+        self.client_obj.full_name = 'Cliente Renombrado'
+        self.client_obj.save()
+        etag = self.assert_modified(url, etag)
+        Document.objects.all().delete()
+        self.assert_not_modified(url, etag)
+
+    def test_detail_versioned_by_updated_at(self):
+        """Test that a detail answers 304 until the row or its documents change."""
+        url = f'/api/v1/cases/{self.case.id}/'
+        etag = self.client.get(url)['ETag']
+        queries = self.assert_not_modified(url, etag)
+        # Only the version lookup runs: no join, no documents prefetch
+        case_queries = [q['sql'] for q in queries.captured_queries if '"cases_case"' in q['sql']]
+        self.assertEqual(len(case_queries), 1)
+        self.assertNotIn('"documents_document"', case_queries[0])
+
+        self.document.title = 'Contrato firmado'
+        self.document.save()
+        etag = self.assert_modified(url, etag)
+        Case.objects.filter(pk=self.case.pk).update(updated_at=timezone.now())
+        self.assert_modified(url, etag)
+
+    def test_detail_without_version_column(self):
+        """Test that document details are versioned by the documents table."""
+        url = f'/api/v1/documents/{self.document.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assert_not_modified(url, etag)
+        self.document.title = 'Otro título'
+        self.document.save()
+        self.assert_modified(url, etag)
+
+    def test_client_detail_counts_cases(self):
+        """Test that a new case changes the client detail ETag (case_count)."""
+        url = f'/api/v1/clients/{self.client_obj.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assert_not_modified(url, etag)
+        Case.objects.create(
+            client=self.client_obj, title='Otro', description='Test', case_type='penal',
+            start_date=timezone.now().date()
+        )
+        self.assert_modified(url, etag)
+
+    def test_weak_and_multiple_etags_match(self):
+        """Test weak comparison (compressed responses carry W/ ETags) and lists of ETags."""
+        url = f'/api/v1/cases/{self.case.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assert_not_modified(url, etag, f'"other", W/{etag}')
+
+    def test_not_found_detail(self):
+        """Test that unknown objects still answer 404."""
+        response = self.client.get('/api/v1/cases/999999/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_dashboard(self):
+        """Test that the dashboard answers 304 until a write and recomputes after it."""
+        url = '/api/v1/dashboard/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertEqual(response.data['total_clients'], 1)
+        self.assert_not_modified(url, etag)
+        Client.objects.create(
+            full_name='Nuevo', identification_number='ETAG002', email='n@example.com', phone='555-0001'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The cached statistics of the previous version are not reused
+        self.assertEqual(response.data['total_clients'], 2)
@@ -0,0 +1,201 @@
+"""
+Tests for the fast list serializers.
+
+Tests that CaseListSerializer, ClientListSerializer and
+DocumentListSerializer produce exactly the output of the ModelSerializers
+they replace, directly and through the list endpoints.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from api.fast_serializers import FastListSerializer
+from cases.models import Case
+from cases.serializers import CaseListSerializer, CaseSerializer
+from clients.models import Client
+from clients.serializers import ClientListSerializer, ClientSerializer
+from core.testing import use_temporary_media_root
+from documents.models import Document
+from documents.serializers import DocumentListSerializer, DocumentSerializer
+
+
+def create_sample_data(user):
+    """Create clients, cases and documents covering empty and related values."""
+    today = timezone.now().date()
+    active = Client.objects.create(
+        full_name='José Núñez',
+        identification_number='FAST001',
+        email='jose@example.com',
+        phone='555-0001',
+        address='Calle 1 # 2-3'
+    )
+    inactive = Client.objects.create(
+        full_name='Ana Ruiz',
+        identification_number='FAST002',
+        email='ana@example.com',
+        phone='555-0002',
+        is_active=False
+    )
+    open_case = Case.objects.create(
+        client=active,
+        title='Caso abierto',
+        description='Sin fecha límite',
+        case_type='civil',
+        start_date=today
+    )
+    Case.objects.create(
+        client=inactive,
+        title='Caso cerrado',
+        description='Con abogado asignado',
+        case_type='penal',
+        status='cerrado',
+        priority='alta',
+        start_date=today - timedelta(days=30),
+        deadline=today + timedelta(days=5),
+        closed_date=today,
+        assigned_to=user
+    )
+    Document.objects.create(
+        case=open_case,
+        title='Contrato',
+        document_type='contrato',
+        file=SimpleUploadedFile('contrato.pdf', b'%PDF-1.4 contrato', 'application/pdf'),
+        uploaded_by=user
+    )
+    document = Document.objects.create(
+        case=open_case,
+        title='Anexo confidencial',
+        document_type='otro',
+        file=SimpleUploadedFile('anexo.txt', b'Anexo', 'text/plain'),
+        is_confidential=True
+    )
+    Document.objects.filter(pk=document.pk).update(thumbnail='legal_documents/anexo.thumb.jpg')
+
+
+class FastListSerializerEquivalenceTests(TestCase):
+    """Tests that fast and ModelSerializer output are identical."""
+
+    def setUp(self):
+        """Create sample data and a request for absolute URLs."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='fastuser', password='testpass123')
+        create_sample_data(self.user)
+        self.request = Request(APIRequestFactory().get('/api/v1/'))
+
+    def assertEquivalent(self, fast_class, serializer_class, queryset, context):
+        """Assert that both serializers produce the same data for the queryset."""
+        fast = fast_class(context=context)
+        expected = serializer_class(queryset, many=True, context=context).data
+        actual = fast.serialize(queryset.values_list(*fast.columns))
+        self.assertEqual(actual, [dict(item) for item in expected])
+        self.assertEqual(list(actual[0]), list(expected[0]))
+
+    def test_case_list_serializer(self):
+        """Test CaseListSerializer against CaseSerializer."""
+        self.assertEquivalent(
+            CaseListSerializer, CaseSerializer,
+            Case.objects.order_by('id'), {'request': self.request}
+        )
+
+    def test_client_list_serializer(self):
+        """Test ClientListSerializer against ClientSerializer."""
+        self.assertEquivalent(
+            ClientListSerializer, ClientSerializer,
+            Client.objects.order_by('id'), {'request': self.request}
+        )
+
+    def test_document_list_serializer(self):
+        """Test DocumentListSerializer against DocumentSerializer, with and without request."""
+        queryset = Document.objects.order_by('id')
+        self.assertEquivalent(DocumentListSerializer, DocumentSerializer, queryset, {'request': self.request})
+        self.assertEquivalent(DocumentListSerializer, DocumentSerializer, queryset, {})
+
+    def test_datetimes_follow_active_timezone(self):
+        """Test that datetimes match DRF in UTC ('Z' suffix) and the local timezone."""
+        for zone in ['UTC', 'America/Bogota']:
+            with timezone.override(zone):
+                self.assertEquivalent(
+                    ClientListSerializer, ClientSerializer,
+                    Client.objects.order_by('id'), {'request': self.request}
+                )
+
+    def test_only_needed_columns_fetched(self):
+        """Test that joined values are fetched as columns, not related objects."""
+        fast = CaseListSerializer()
+        self.assertIn('client__full_name', fast.columns)
+        self.assertNotIn('client__email', fast.columns)
+
+    def test_missing_method_source_is_rejected(self):
+        """Test that a method field without declared columns is a configuration error."""
+        class IncompleteSerializer(FastListSerializer):
+            serializer_class = DocumentSerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            IncompleteSerializer()
+
+    def test_nested_serializer_is_rejected(self):
+        """Test that nested serializers cannot be served from single columns."""
+        class NestedCaseSerializer(serializers.ModelSerializer):
+            client = ClientSerializer(read_only=True)
+
+            class Meta:
+                model = Case
+                fields = ['id', 'client']
+
+        class NestedListSerializer(FastListSerializer):
+            serializer_class = NestedCaseSerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            NestedListSerializer()
+
+
+class FastListEndpointTests(APITestCase):
+    """Tests that the list endpoints return the ModelSerializer output."""
+
+    def setUp(self):
+        """Create sample data and authenticate."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='fastapi', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        create_sample_data(self.user)
+
+    def assertListMatches(self, url, serializer_class, queryset):
+        """Assert that the endpoint returns serializer_class output for queryset."""
+        response = self.client.get(url)
+        request = Request(response.wsgi_request)
+        expected = serializer_class(queryset, many=True, context={'request': request}).data
+        self.assertEqual(response.data['results'], [dict(item) for item in expected])
+
+    def test_cases_list(self):
+        """Test /cases/ output, including filters and ordering."""
+        self.assertListMatches('/api/v1/cases/', CaseSerializer, Case.objects.order_by('-start_date'))
+        self.assertListMatches(
+            '/api/v1/cases/?status=cerrado', CaseSerializer, Case.objects.filter(status='cerrado')
+        )
+
+    def test_clients_list(self):
+        """Test /clients/ output with search."""
+        self.assertListMatches(
+            '/api/v1/clients/?search=Ruiz', ClientSerializer, Client.objects.filter(full_name='Ana Ruiz')
+        )
+
+    def test_documents_list(self):
+        """Test /documents/ output, including absolute file and thumbnail URLs."""
+        self.assertListMatches(
+            '/api/v1/documents/', DocumentSerializer, Document.objects.order_by('-uploaded_at')
+        )
+
+    def test_list_queries(self):
+        """Test that a page is served with a single row query and no count query."""
+        with self.assertNumQueries(3):  # token with user, write generations (ETag), rows
+            self.client.get('/api/v1/documents/')
@@ -7,6 +7,8 @@ Tests complete workflows across multiple endpoints:
 - Global search functionality
 """
 
+import json
+
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
@@ -16,6 +18,7 @@ from rest_framework.test import APITestCase
 
 from cases.models import Case
 from clients.models import Client
+from core.testing import use_temporary_media_root
 from documents.models import Document
 
 
@@ -24,6 +27,7 @@ class ClientCaseDocumentWorkflowTests(APITestCase):
 
     def setUp(self):
         """Create test user and authenticate."""
+        use_temporary_media_root(self)
         self.user = User.objects.create_user(
             username='workflowuser',
             email='workflow@example.com',
@@ -76,8 +80,9 @@ class ClientCaseDocumentWorkflowTests(APITestCase):
         # Step 4: Verify client's cases endpoint shows the case
         response = self.client.get(f'/api/v1/clients/{client_id}/cases/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['id'], case_id)
+        cases = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(cases), 1)
+        self.assertEqual(cases[0]['id'], case_id)
 
         # Step 5: Verify case detail shows the document
         response = self.client.get(f'/api/v1/cases/{case_id}/')
@@ -163,6 +168,7 @@ class DashboardAccuracyTests(APITestCase):
 
     def setUp(self):
         """Create test user and authenticate."""
+        use_temporary_media_root(self)
         self.user = User.objects.create_user(
             username='dashboarduser',
             email='dashboard@example.com',
@@ -290,6 +296,7 @@ class SearchFunctionalityTests(APITestCase):
 
     def setUp(self):
         """Create test user, authenticate, and create test data."""
+        use_temporary_media_root(self)
         self.user = User.objects.create_user(
             username='searchuser',
             email='search@example.com',
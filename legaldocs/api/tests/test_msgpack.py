@@ -0,0 +1,176 @@
+"""
+Tests for the MessagePack format.
+
+Tests the compact date encoding of MessagePackRenderer and
+MessagePackParser, and content negotiation on the API endpoints.
+"""
+
+import datetime
+import decimal
+import io
+import json
+
+import msgpack
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APITestCase
+
+from api.parsers import MessagePackParser
+from api.renderers import MessagePackRenderer
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.models import Document
+
+MSGPACK = 'application/msgpack'
+
+
+def unpack(content: bytes):
+    """Decode a MessagePack body like MessagePackParser."""
+    return MessagePackParser().parse(io.BytesIO(content), MSGPACK)
+
+
+class MessagePackCodecTests(TestCase):
+    """Tests for the renderer and parser round trip."""
+
+    def test_round_trip(self):
+        """Test native dates, datetimes and the values JSON would also encode."""
+        aware = datetime.datetime(2026, 1, 15, 10, 30, 5, 123456, tzinfo=datetime.timezone.utc)
+        data = {
+            'aware': aware,
+            'local': timezone.localtime(aware),
+            'day': datetime.date(2026, 1, 15),
+            'old': datetime.date(1890, 7, 4),
+            'amount': decimal.Decimal('10.5'),
+            'text': 'Núñez',
+            'list': [1, None, True],
+            'empty': None,
+        }
+        result = unpack(MessagePackRenderer().render(data))
+        self.assertEqual(result['aware'], aware)
+        self.assertEqual(result['local'], aware)
+        self.assertEqual(result['day'], datetime.date(2026, 1, 15))
+        self.assertEqual(result['old'], datetime.date(1890, 7, 4))
+        self.assertEqual(result['amount'], 10.5)
+        self.assertEqual(result['text'], 'Núñez')
+        self.assertEqual(result['list'], [1, None, True])
+        self.assertIsNone(result['empty'])
+
+    def test_naive_datetimes_use_current_timezone(self):
+        """Test that naive datetimes are taken as local time."""
+        naive = datetime.datetime(2026, 1, 15, 10, 0)
+        result = unpack(MessagePackRenderer().render([naive]))
+        self.assertEqual(result[0], timezone.make_aware(naive))
+
+    def test_compact_encoding(self):
+        """Test that dates take 6 bytes and datetimes at most 10, against 12 and 29+ in JSON."""
+        self.assertEqual(len(MessagePackRenderer().render(datetime.date(2026, 1, 15))), 6)
+        value = datetime.datetime(2026, 1, 15, 10, 30, 5, 123456, tzinfo=datetime.timezone.utc)
+        self.assertEqual(len(MessagePackRenderer().render(value)), 10)
+
+    def test_invalid_body(self):
+        """Test that truncated and trailing data raise ParseError."""
+        body = msgpack.packb({'a': 1})
+        for invalid in [body[:-1], body + b'\x01']:
+            with self.assertRaises(ParseError):
+                unpack(invalid)
+
+
+class MessagePackEndpointTests(APITestCase):
+    """Tests for Accept: application/msgpack on the API endpoints."""
+
+    def setUp(self):
+        """Create a client, a case and a document, and authenticate."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='packer', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client_obj = Client.objects.create(
+            full_name='Packed Client',
+            identification_number='MSG001',
+            email='msg@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=self.client_obj,
+            title='Packed Case',
+            description='Test',
+            case_type='civil',
+            start_date=datetime.date(2026, 1, 15),
+            deadline=datetime.date(2026, 3, 1)
+        )
+        self.document = Document.objects.create(
+            case=self.case,
+            title='Contrato',
+            document_type='contrato',
+            file=SimpleUploadedFile('contrato.pdf', b'%PDF-1.4 contrato', 'application/pdf'),
+            uploaded_by=self.user
+        )
+
+    def get(self, url):
+        """GET a URL as MessagePack and return the response and decoded body."""
+        response = self.client.get(url, HTTP_ACCEPT=MSGPACK)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], MSGPACK)
+        return response, unpack(response.content)
+
+    def test_list_has_native_dates(self):
+        """Test that list results carry dates and datetimes, not strings."""
+        _, data = self.get('/api/v1/cases/')
+        case = data['results'][0]
+        self.assertEqual(case['start_date'], datetime.date(2026, 1, 15))
+        self.assertEqual(case['deadline'], datetime.date(2026, 3, 1))
+        self.assertIsNone(case['closed_date'])
+        self.assertEqual(case['created_at'], self.case.created_at)
+        self.assertEqual(case['case_number'], self.case.case_number)
+
+    def test_smaller_than_json(self):
+        """Test that the MessagePack list is smaller than the JSON one."""
+        response, _ = self.get('/api/v1/documents/')
+        json_response = self.client.get('/api/v1/documents/')
+        self.assertLess(len(response.content), len(json_response.content))
+        self.assertEqual(
+            len(unpack(response.content)['results']), len(json.loads(json_response.content)['results'])
+        )
+
+    def test_detail_nested_dates(self):
+        """Test native dates in nested serializers and sparse fieldsets."""
+        _, data = self.get(f'/api/v1/cases/{self.case.id}/')
+        self.assertEqual(data['documents'][0]['uploaded_at'], self.document.uploaded_at)
+        _, data = self.get(f'/api/v1/documents/{self.document.id}/?fields=id,uploaded_at')
+        self.assertEqual(data, {'id': self.document.id, 'uploaded_at': self.document.uploaded_at})
+
+    def test_format_suffix_and_client_cases(self):
+        """Test ?format=msgpack and the (non-streamed) client cases list."""
+        response = self.client.get(f'/api/v1/clients/{self.client_obj.id}/cases/?format=msgpack')
+        self.assertFalse(response.streaming)
+        self.assertEqual(unpack(response.content)[0]['start_date'], datetime.date(2026, 1, 15))
+
+    def test_json_unchanged(self):
+        """Test that JSON responses still carry date strings."""
+        response = self.client.get(f'/api/v1/cases/{self.case.id}/')
+        self.assertEqual(response.data['start_date'], '2026-01-15')
+
+    def test_msgpack_request_body(self):
+        """Test creating a case from a MessagePack body with a native date."""
+        body = MessagePackRenderer().render({
+            'client': self.client_obj.id,
+            'title': 'Caso binario',
+            'description': 'Creado con MessagePack',
+            'case_type': 'laboral',
+            'start_date': datetime.date(2026, 2, 1),
+        })
+        response = self.client.post('/api/v1/cases/', body, content_type=MSGPACK, HTTP_ACCEPT=MSGPACK)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(unpack(response.content)['start_date'], datetime.date(2026, 2, 1))
+        self.assertTrue(Case.objects.filter(title='Caso binario', start_date='2026-02-01').exists())
+
+    def test_invalid_body_returns_400(self):
+        """Test that a malformed MessagePack body is rejected."""
+        response = self.client.post('/api/v1/cases/', b'\xc1', content_type=MSGPACK)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,241 @@
+"""
+Tests for keyset (cursor) pagination.
+
+Tests that cursor pages cover every row exactly once in the endpoint's
+ordering, in both directions, without a count query, and that ?page=
+keeps the page-number format with cached or estimated counts.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api.pagination import KeysetPagination
+from cases.models import Case
+from clients.models import Client
+
+
+class KeysetPaginationTests(APITestCase):
+    """Tests for KeysetPagination on the list endpoints."""
+
+    def setUp(self):
+        """Create 45 cases with repeated start dates, and authenticate."""
+        self.user = User.objects.create_user(username='pager', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        self.client_obj = Client.objects.create(
+            full_name='Paged Client',
+            identification_number='PAG001',
+            email='pag@example.com',
+            phone='555-0000'
+        )
+        today = timezone.now().date()
+        for i in range(45):
+            Case.objects.create(
+                client=self.client_obj,
+                title=f'Caso {i:02d}',
+                description='Test',
+                case_type='civil',
+                start_date=today - timedelta(days=i // 4),
+            )
+        self.expected = list(Case.objects.order_by('-start_date', '-id').values_list('id', flat=True))
+
+    def walk(self, url, link='next'):
+        """Follow the given link until the end and return the ids of every page."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            pages.append([item['id'] for item in response.data['results']])
+            url = response.data[link]
+        return pages
+
+    def test_pages_cover_all_rows_in_order(self):
+        """Test that following next returns every case once, in order, with ties on start_date."""
+        pages = self.walk('/api/v1/cases/')
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_previous_links_walk_back(self):
+        """Test that previous links return the same pages in reverse."""
+        forward = self.walk('/api/v1/cases/')
+        response = self.client.get('/api/v1/cases/')
+        last_url = self.client.get(response.data['next']).data['next']
+        last_page = self.client.get(last_url)
+        self.assertIsNone(last_page.data['next'])
+
+        backward = self.walk(last_page.data['previous'], link='previous')
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_first_page_has_no_previous(self):
+        """Test the links of the first page."""
+        response = self.client.get('/api/v1/cases/')
+        self.assertIsNone(response.data['previous'])
+        self.assertIn('cursor=', response.data['next'])
+
+    def test_custom_ordering_and_filters(self):
+        """Test that cursors follow ?ordering= and keep the other query parameters."""
+        pages = self.walk('/api/v1/cases/?ordering=priority&case_type=civil')
+        expected = Case.objects.order_by('priority', 'id').values_list('id', flat=True)
+        self.assertEqual(sum(pages, []), list(expected))
+        response = self.client.get('/api/v1/cases/?ordering=priority&case_type=civil')
+        self.assertIn('case_type=civil', response.data['next'])
+
+    def test_sparse_fields_without_ordering_columns(self):
+        """Test paging when the selected fields leave out the ordering columns."""
+        response = self.client.get('/api/v1/cases/?fields=title')
+        self.assertEqual(list(response.data['results'][0]), ['title'])
+        next_page = self.client.get(response.data['next'])
+        titles = [item['title'] for item in response.data['results'] + next_page.data['results']]
+        self.assertEqual(titles, [Case.objects.get(pk=pk).title for pk in self.expected[:40]])
+
+    def test_deep_page_runs_no_count_or_offset(self):
+        """Test that a later page runs a single row query keyed on the cursor."""
+        url = self.client.get('/api/v1/cases/').data['next']
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        sql = [query['sql'] for query in context.captured_queries[1:] if 'cache_table' not in query['sql']]
+        self.assertEqual(len(sql), 1)
+        self.assertNotIn('COUNT(', sql[0])
+        self.assertNotIn('OFFSET', sql[0])
+
+    def test_page_number_opt_in(self):
+        """Test that ?page= returns the page-number format with count."""
+        response = self.client.get('/api/v1/cases/?page=2')
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual([item['id'] for item in response.data['results']], self.expected[20:40])
+        self.assertIn('page=3', response.data['next'])
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors return 404."""
+        for cursor in ['nope', 'eyJ2IjpbMV19', 'eyJ2IjpbIngiLDFdfQ']:
+            response = self.client.get(f'/api/v1/cases/?cursor={cursor}')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, cursor)
+
+    def test_cursor_round_trips_datetimes(self):
+        """Test that datetime cursors keep microseconds, so no row is skipped."""
+        for i in range(25):
+            Client.objects.create(
+                full_name=f'Client {i}',
+                identification_number=f'PAGC{i:03d}',
+                email=f'pagc{i}@example.com',
+                phone='555-0000'
+            )
+        pages = self.walk('/api/v1/clients/')
+        self.assertEqual(
+            sum(pages, []),
+            list(Client.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        )
+
+
+class KeysetOrderingTests(APITestCase):
+    """Tests for KeysetPagination.get_ordering."""
+
+    def test_appends_id_tiebreak(self):
+        """Test that the primary key follows the ordering in the first column's direction."""
+        paginator = KeysetPagination()
+        self.assertEqual(
+            paginator.get_ordering(Case.objects.order_by('-start_date')),
+            [('start_date', True), ('id', True)]
+        )
+        self.assertEqual(
+            paginator.get_ordering(Client.objects.all()),
+            [('created_at', True), ('id', True)]
+        )
+
+    def test_unkeyable_ordering(self):
+        """Test that random ordering cannot be keyed."""
+        self.assertIsNone(KeysetPagination().get_ordering(Case.objects.order_by('?')))
+
+
+class CountedPaginationTests(APITestCase):
+    """Tests for the counts of page-number pagination (?page=)."""
+
+    def setUp(self):
+        """Create three cases of two types, and authenticate."""
+        self.user = User.objects.create_user(username='counter', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client_obj = Client.objects.create(
+            full_name='Counted Client',
+            identification_number='CNT001',
+            email='cnt@example.com',
+            phone='555-0000'
+        )
+        for case_type in ['civil', 'civil', 'penal']:
+            self.add_case(case_type)
+
+    def add_case(self, case_type):
+        """Create a case of the given type."""
+        return Case.objects.create(
+            client=self.client_obj,
+            title='Counted Case',
+            description='Test',
+            case_type=case_type,
+            start_date=timezone.now().date()
+        )
+
+    def count_queries(self, url):
+        """Return the response and the number of COUNT queries it ran on cases."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, sum(
+            'COUNT(' in query['sql'] and 'cases_case' in query['sql']
+            for query in context.captured_queries
+        )
+
+    def test_exact_count_is_cached_per_filter(self):
+        """Test that a repeated request reuses the count of the same filter only."""
+        response, counts = self.count_queries('/api/v1/cases/?page=1&case_type=civil')
+        self.assertEqual((response.data['count'], response.data['count_exact']), (2, True))
+        self.assertEqual(counts, 1)
+
+        response, counts = self.count_queries('/api/v1/cases/?page=1&case_type=civil')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(counts, 0)
+
+        response, counts = self.count_queries('/api/v1/cases/?page=1&case_type=penal')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(counts, 1)
+
+    def test_writes_invalidate_cached_counts(self):
+        """Test that creating and deleting rows start a new count."""
+        self.client.get('/api/v1/cases/?page=1')
+        case = self.add_case('civil')
+        self.assertEqual(self.client.get('/api/v1/cases/?page=1').data['count'], 4)
+        case.delete()
+        self.assertEqual(self.client.get('/api/v1/cases/?page=1').data['count'], 3)
+
+    def test_joined_tables_invalidate_cached_counts(self):
+        """Test that writes to a joined table (search on client name) invalidate the count."""
+        url = '/api/v1/cases/?page=1&search=Renombrado'
+        self.assertEqual(self.client.get(url).data['count'], 0)
+        self.client_obj.full_name = 'Cliente Renombrado'
+        self.client_obj.save()
+        self.assertEqual(self.client.get(url).data['count'], 3)
+
+    @override_settings(PAGINATION_COUNT_ESTIMATE_THRESHOLD=1000)
+    def test_large_counts_are_estimated(self):
+        """Test that planner estimates above the threshold are returned as inexact."""
+        with mock.patch('api.pagination.estimate_count', return_value=250000):
+            response, counts = self.count_queries('/api/v1/cases/?page=1')
+        self.assertEqual(response.data['count'], 250000)
+        self.assertFalse(response.data['count_exact'])
+        self.assertEqual(counts, 0)
+
+    @override_settings(PAGINATION_COUNT_ESTIMATE_THRESHOLD=1000)
+    def test_small_estimates_are_counted(self):
+        """Test that below the threshold the exact count is used."""
+        with mock.patch('api.pagination.estimate_count', return_value=10):
+            response = self.client.get('/api/v1/cases/?page=1')
+        self.assertEqual((response.data['count'], response.data['count_exact']), (3, True))
@@ -0,0 +1,144 @@
+"""
+Query budget tests for every read endpoint.
+
+Each endpoint is requested twice: with a small data set and after adding
+more related rows (documents, cases, clients). The number of queries must
+stay the same, so no endpoint issues a query per row, and must not exceed
+the endpoint's budget. Requests run with an empty cache except for the
+write generations, which are long-lived (core.cache).
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.cache import get_generations, tracked_tables
+from core.testing import use_temporary_media_root
+from documents.models import Document
+
+# Maximum queries per endpoint, including the token lookup and, for ETags,
+# the write generations lookup and the row version query of details
+QUERY_BUDGETS = {
+    '/api/v1/clients/': 3,
+    '/api/v1/clients/{client}/': 4,
+    '/api/v1/clients/{client}/cases/': 3,
+    '/api/v1/cases/': 3,
+    '/api/v1/cases/{case}/': 5,
+    '/api/v1/cases/statistics/': 5,
+    '/api/v1/documents/': 3,
+    '/api/v1/documents/{document}/': 3,
+    '/api/v1/dashboard/': 14,  # 6 data queries, generations, the DatabaseCache miss and set
+    '/api/v1/search/?q=Budget': 4,
+    '/api/v1/profile/': 2,
+    '/api/v1/auth/me/': 1,
+}
+
+
+class QueryBudgetTests(APITestCase):
+    """Tests that read endpoints run a constant number of queries."""
+
+    def setUp(self):
+        """Create a user and the first client, case and document."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='budget', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.counter = 0
+        self.client_obj = self.add_client()
+        self.case = self.add_case(self.client_obj)
+        self.document = self.add_document(self.case, uploader=self.user)
+
+    def add_client(self):
+        """Create a client with a unique identification number."""
+        self.counter += 1
+        return Client.objects.create(
+            full_name=f'Budget Client {self.counter}',
+            identification_number=f'BUD{self.counter:04d}',
+            email=f'budget{self.counter}@example.com',
+            phone='555-0000'
+        )
+
+    def add_case(self, client_obj):
+        """Create a case for the client, assigned to the test user."""
+        return Case.objects.create(
+            client=client_obj,
+            title='Budget Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date(),
+            assigned_to=self.user
+        )
+
+    def add_document(self, case, uploader):
+        """Create a document in the case."""
+        self.counter += 1
+        return Document.objects.create(
+            case=case,
+            title='Budget Document',
+            document_type='contrato',
+            file=SimpleUploadedFile(f'doc{self.counter}.pdf', f'%PDF {self.counter}'.encode(), 'application/pdf'),
+            uploaded_by=uploader
+        )
+
+    def add_more_rows(self):
+        """Add related rows that an N+1 query pattern would have to load one by one."""
+        other_user = User.objects.create_user(username='budget2', password='testpass123')
+        for _ in range(3):
+            self.add_document(self.case, uploader=other_user)
+            self.add_document(self.case, uploader=None)
+            case = self.add_case(self.client_obj)
+            self.add_document(case, uploader=other_user)
+            self.add_case(self.add_client())
+
+    def count_queries(self, url):
+        """Return the number of queries of a GET request (with an empty cache but for generations)."""
+        cache.clear()
+        get_generations(tracked_tables())
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return len(context.captured_queries)
+
+    def test_query_counts_are_constant(self):
+        """Test that query counts do not grow with the data and stay within budget."""
+        urls = {
+            pattern: pattern.format(
+                client=self.client_obj.id, case=self.case.id, document=self.document.id
+            )
+            for pattern in QUERY_BUDGETS
+        }
+        before = {pattern: self.count_queries(url) for pattern, url in urls.items()}
+        self.add_more_rows()
+        after = {pattern: self.count_queries(url) for pattern, url in urls.items()}
+
+        for pattern, budget in QUERY_BUDGETS.items():
+            with self.subTest(endpoint=pattern):
+                self.assertEqual(after[pattern], before[pattern])
+                self.assertLessEqual(after[pattern], budget)
+
+    def test_case_detail_nests_documents_without_extra_queries(self):
+        """Test the prefetched documents carry case number and uploader."""
+        self.add_more_rows()
+        response = self.client.get(f'/api/v1/cases/{self.case.id}/')
+        documents = response.data['documents']
+        self.assertEqual(len(documents), 7)
+        self.assertEqual({doc['case_number'] for doc in documents}, {self.case.case_number})
+        self.assertEqual(
+            {doc['uploaded_by_username'] for doc in documents},
+            {'budget', 'budget2', None}
+        )
+
+    def test_client_detail_case_count(self):
+        """Test the annotated case_count."""
+        self.add_more_rows()
+        response = self.client.get(f'/api/v1/clients/{self.client_obj.id}/')
+        self.assertEqual(response.data['case_count'], 4)
@@ -0,0 +1,214 @@
+"""
+Query plan tests for the read endpoints.
+
+Seeds enough rows for the query planner to prefer indexes, collects the
+statements each endpoint runs and EXPLAINs them: none may read a large
+table with a sequential scan, and paginated lists must read their rows in
+index order instead of sorting every matching row, on the first page and
+on the pages read from a cursor. Queries that aggregate a whole table are
+listed in ALLOWED_SCANS.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.query_plans import explain, full_scans, sorts_rows
+from documents.models import Document
+
+CLIENTS = 200
+CASES_PER_CLIENT = 10
+DOCUMENTS_PER_CASE = 2
+
+# Tables that grow with the firm's activity
+LARGE_TABLES = {'clients_client', 'cases_case', 'documents_document', 'core_change'}
+
+# Paginated lists, whose page must be read in index order
+LISTS = [
+    '/api/v1/clients/',
+    '/api/v1/clients/?is_active=true',
+    '/api/v1/cases/',
+    '/api/v1/cases/?status=en_revision',
+    '/api/v1/cases/?client={client}',
+    '/api/v1/cases/?priority=urgente',
+    '/api/v1/cases/?ordering=-created_at',
+    '/api/v1/documents/',
+    '/api/v1/documents/?case={case}',
+    '/api/v1/documents/?document_type=poder',
+    '/api/v1/sync/?since={change}',
+]
+
+# Lists with more than one page: their next page, read from a cursor, must
+# seek the index and read on in order too
+CURSOR_LISTS = [
+    '/api/v1/clients/',
+    '/api/v1/clients/?is_active=true',
+    '/api/v1/cases/',
+    '/api/v1/cases/?status=en_revision',
+    '/api/v1/cases/?priority=urgente',
+    '/api/v1/cases/?ordering=-created_at',
+    '/api/v1/documents/',
+    '/api/v1/documents/?document_type=poder',
+]
+
+ENDPOINTS = LISTS + [
+    '/api/v1/clients/{client}/',
+    '/api/v1/clients/{client}/cases/',
+    '/api/v1/cases/{case}/',
+    '/api/v1/cases/statistics/',
+    '/api/v1/documents/{document}/',
+    '/api/v1/dashboard/',
+]
+
+# Endpoint -> tables it reads whole on purpose (aggregates over every row)
+ALLOWED_SCANS = {
+    '/api/v1/cases/statistics/': {'cases_case'},
+    '/api/v1/dashboard/': {'clients_client'},
+}
+
+
+class QueryPlanTests(APITestCase):
+    """Tests that the endpoints' queries on large tables use indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed clients, cases and documents in bulk and refresh the planner statistics."""
+        cls.user = User.objects.create_user(username='planner', password='testpass123')
+        cls.token = Token.objects.create(user=cls.user)
+        today = timezone.now().date()
+        statuses = [choice for choice, _ in Case.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Case.PRIORITY_CHOICES]
+        case_types = [choice for choice, _ in Case.CASE_TYPE_CHOICES]
+        document_types = [choice for choice, _ in Document.DOCUMENT_TYPE_CHOICES]
+
+        clients = Client.objects.bulk_create(
+            Client(
+                full_name=f'Cliente {index}',
+                identification_number=f'PLAN{index:05d}',
+                email=f'plan{index}@example.com',
+                phone='555-0000',
+                is_active=index % 10 != 0
+            )
+            for index in range(CLIENTS)
+        )
+        cases = Case.objects.bulk_create(
+            Case(
+                client=client,
+                case_number=f'CASE-PLAN-{index:05d}',
+                title=f'Caso {index}',
+                description='Test',
+                case_type=case_types[index % len(case_types)],
+                status=statuses[index % len(statuses)],
+                priority=priorities[index % len(priorities)],
+                start_date=today - datetime.timedelta(days=index),
+                deadline=today + datetime.timedelta(days=index % 365),
+                assigned_to=cls.user
+            )
+            for index, client in enumerate(
+                client for client in clients for _ in range(CASES_PER_CLIENT)
+            )
+        )
+        Document.objects.bulk_create(
+            Document(
+                case=case,
+                title=f'Documento {index}',
+                document_type=document_types[index % len(document_types)],
+                file=f'legal_documents/plan{index}.pdf',
+                file_size=1024,
+                uploaded_by=cls.user
+            )
+            for index, case in enumerate(
+                case for case in cases for _ in range(DOCUMENTS_PER_CASE)
+            )
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.client_obj = clients[0]
+        cls.case = cases[0]
+        cls.document = Document.objects.filter(case=cls.case).first()
+
+    def setUp(self):
+        """Authenticate with the seeded user's token."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def capture_statements(self, url):
+        """Return the (sql, params) of the SELECT statements of a GET request."""
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        cache.clear()
+        with connection.execute_wrapper(record):
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return statements
+
+    def endpoint_url(self, pattern):
+        """Return the URL of an endpoint pattern for the seeded rows."""
+        return pattern.format(
+            client=self.client_obj.id, case=self.case.id, document=self.document.id, change=0
+        )
+
+    def endpoint_statements(self, patterns):
+        """Yield (pattern, sql, params) for the statements of each endpoint."""
+        for pattern in patterns:
+            for sql, params in self.capture_statements(self.endpoint_url(pattern)):
+                yield pattern, sql, params
+
+    def cursor_page_statements(self, patterns):
+        """Yield (pattern, sql, params) for the statements of the second page of each list."""
+        for pattern in patterns:
+            next_url = self.client.get(self.endpoint_url(pattern)).data['next']
+            self.assertIn('cursor=', next_url, pattern)
+            for sql, params in self.capture_statements(next_url):
+                yield pattern, sql, params
+
+    def test_no_sequential_scans(self):
+        """Test that no endpoint reads a large table without an index."""
+        for pattern, sql, params in self.endpoint_statements(ENDPOINTS):
+            scans = set(full_scans(sql, params)) & LARGE_TABLES
+            with self.subTest(endpoint=pattern, sql=sql):
+                self.assertFalse(
+                    scans - ALLOWED_SCANS.get(pattern, set()), '\n'.join(explain(sql, params))
+                )
+
+    def test_lists_read_in_index_order(self):
+        """Test that paginated lists do not sort the matching rows."""
+        for pattern, sql, params in self.endpoint_statements(LISTS):
+            if not any(table in sql for table in LARGE_TABLES):
+                continue
+            with self.subTest(endpoint=pattern, sql=sql):
+                self.assertFalse(sorts_rows(sql, params), '\n'.join(explain(sql, params)))
+
+    def test_cursor_pages_seek_index(self):
+        """Test that the pages after the first use the index without scanning or sorting."""
+        for pattern, sql, params in self.cursor_page_statements(CURSOR_LISTS):
+            if not any(table in sql for table in LARGE_TABLES):
+                continue
+            with self.subTest(endpoint=pattern, sql=sql):
+                plan = '\n'.join(explain(sql, params))
+                self.assertFalse(set(full_scans(sql, params)) & LARGE_TABLES, plan)
+                self.assertFalse(sorts_rows(sql, params), plan)
+
+    def test_upcoming_deadlines_use_partial_index(self):
+        """Test that the dashboard's upcoming deadlines read the open cases' deadline index."""
+        statements = [
+            (sql, params) for _, sql, params in self.endpoint_statements(['/api/v1/dashboard/'])
+            if '"cases_case"."deadline" >=' in sql
+        ]
+        self.assertEqual(len(statements), 1)
+        plan = '\n'.join(explain(*statements[0]))
+        self.assertIn('case_open_deadline_idx', plan)
+        self.assertFalse(sorts_rows(*statements[0]), plan)
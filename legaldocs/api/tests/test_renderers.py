@@ -0,0 +1,152 @@
+"""
+Tests for the orjson-backed JSON renderer and parser.
+
+Tests that FastJSONRenderer produces the bytes of DRF's JSONRenderer for
+API payloads and raw Python values, and that FastJSONParser accepts and
+rejects the same bodies as JSONParser.
+"""
+
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from cases.models import Case
+from clients.models import Client
+
+
+class FastJSONRendererTests(TestCase):
+    """Tests that FastJSONRenderer matches JSONRenderer."""
+
+    def assertSameJSON(self, data, accepted_media_type=None):
+        """Assert both renderers produce identical bytes."""
+        expected = JSONRenderer().render(data, accepted_media_type)
+        self.assertEqual(FastJSONRenderer().render(data, accepted_media_type), expected)
+
+    def test_python_values(self):
+        """Test dates, datetimes, decimals, UUIDs, lazy strings and separators."""
+        self.assertSameJSON({
+            'aware': datetime.datetime(2026, 1, 15, 10, 30, 5, 123456, tzinfo=datetime.timezone.utc),
+            'local': timezone.localtime(datetime.datetime(2026, 1, 15, 10, 30, tzinfo=datetime.timezone.utc)),
+            'naive': datetime.datetime(2026, 1, 15, 10, 30),
+            'date': datetime.date(2026, 1, 15),
+            'time': datetime.time(8, 15),
+            'duration': datetime.timedelta(hours=1, seconds=3),
+            'amount': decimal.Decimal('1234.50'),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Caso'),
+            'text': 'Línea\u2028separada\u2029 – «ñ»',
+            'nested': [(1, 2), {3: 'int key'}, None, True, 1.5],
+        })
+
+    def test_empty_and_indented(self):
+        """Test None and the indented output used by the browsable API."""
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        self.assertSameJSON({'a': [1, 2]}, 'application/json; indent=4')
+
+    def test_big_integers_fall_back(self):
+        """Test that values orjson cannot encode go through the standard encoder."""
+        self.assertSameJSON({'big': 2 ** 70})
+
+    @override_settings(REST_FRAMEWORK={
+        **api_settings.user_settings, 'DATETIME_FORMAT': '%d/%m/%Y %H:%M:%S', 'DATE_FORMAT': '%d/%m/%Y'
+    })
+    def test_configured_formats(self):
+        """Test that raw dates and datetimes follow DATETIME_FORMAT and DATE_FORMAT."""
+        value = {
+            'when': datetime.datetime(2026, 1, 15, 15, 0, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2026, 1, 15),
+        }
+        expected = b'{"when":"15/01/2026 10:00:00","day":"15/01/2026"}'
+        self.assertEqual(FastJSONRenderer().render(value), expected)
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(value), expected)
+
+
+class FastJSONParserTests(TestCase):
+    """Tests that FastJSONParser matches JSONParser."""
+
+    def parse(self, parser, body, encoding='utf-8'):
+        """Parse a body with the given parser."""
+        return parser.parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def test_valid_body(self):
+        """Test that both parsers return the same data."""
+        body = '{"título": "Contrato", "monto": 1.5, "tags": [1, null, true]}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_invalid_bodies(self):
+        """Test that malformed JSON and NaN raise ParseError."""
+        for body in [b'{"a": ', b'{"a": NaN}', b'\xff']:
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
+
+    def test_other_encodings_fall_back(self):
+        """Test that non-UTF-8 bodies are decoded by the standard parser."""
+        body = '{"nombre": "Núñez"}'.encode('latin-1')
+        self.assertEqual(self.parse(FastJSONParser(), body, 'latin-1'), {'nombre': 'Núñez'})
+
+    def test_without_orjson(self):
+        """Test the fallback when orjson is not installed."""
+        with mock.patch.object(parsers, 'orjson', None):
+            self.assertEqual(self.parse(FastJSONParser(), b'{"a": 1}'), {'a': 1})
+
+
+class FastJSONEndpointTests(APITestCase):
+    """Tests that the API renders and parses with the fast classes."""
+
+    def setUp(self):
+        """Create a case and authenticate."""
+        user = User.objects.create_user(username='jsonuser', password='testpass123')
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        client_obj = Client.objects.create(
+            full_name='José Núñez',
+            identification_number='JSON001',
+            email='jose@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Caso «especial»',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+
+    def test_list_matches_standard_renderer(self):
+        """Test that a list response is byte-identical to JSONRenderer's output."""
+        response = self.client.get('/api/v1/cases/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_json_body_is_parsed(self):
+        """Test that JSON request bodies go through FastJSONParser."""
+        response = self.client.patch(
+            f'/api/v1/cases/{self.case.id}/', '{"title": "Título nuevo"}', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Título nuevo')
+
+    def test_malformed_body(self):
+        """Test that malformed JSON returns 400."""
+        response = self.client.patch(
+            f'/api/v1/cases/{self.case.id}/', '{"title": ', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,127 @@
+"""
+Tests for sparse fieldsets (?fields= and ?omit=).
+
+Tests that the selected fields trim both the response and the SQL
+(columns and joins) of list and detail endpoints.
+"""
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.models import Document
+
+
+class SparseFieldsTests(APITestCase):
+    """Tests for SparseFieldsMixin on the case, client and document viewsets."""
+
+    def setUp(self):
+        """Create a user, a client, a case and a document."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='sparse', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        client_obj = Client.objects.create(
+            full_name='Sparse Client',
+            identification_number='SPR001',
+            email='spr@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Sparse Case',
+            description='Descripción muy larga ' * 50,
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.document = Document.objects.create(
+            case=self.case,
+            title='Poder',
+            document_type='poder',
+            file=SimpleUploadedFile('poder.pdf', b'%PDF-1.4 poder', 'application/pdf'),
+            uploaded_by=self.user
+        )
+
+    def get_with_queries(self, url):
+        """Return the response and the SQL of the data queries (after authentication, no cache lookups)."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, [
+            query['sql'] for query in context.captured_queries[1:] if 'cache_table' not in query['sql']
+        ]
+
+    def test_case_list_fields(self):
+        """Test that ?fields= trims the output, the columns and the client join."""
+        response, queries = self.get_with_queries('/api/v1/cases/?fields=id,case_number,title,status')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['results'][0]), ['id', 'case_number', 'title', 'status'])
+        rows_sql = queries[-1]
+        self.assertNotIn('"description"', rows_sql)
+        self.assertNotIn('clients_client', rows_sql)
+
+    def test_case_list_omit(self):
+        """Test that ?omit= removes fields and their columns."""
+        response, queries = self.get_with_queries('/api/v1/cases/?omit=description,client_name')
+        result = response.data['results'][0]
+        self.assertNotIn('description', result)
+        self.assertNotIn('client_name', result)
+        self.assertIn('case_number', result)
+        self.assertNotIn('"description"', queries[-1])
+        self.assertNotIn('clients_client', queries[-1])
+
+    def test_joined_field_keeps_its_join(self):
+        """Test that a selected field read through a relation keeps that join only."""
+        response, queries = self.get_with_queries('/api/v1/cases/?fields=id,client_name')
+        self.assertEqual(response.data['results'][0]['client_name'], 'Sparse Client')
+        self.assertIn('clients_client', queries[-1])
+        self.assertNotIn('auth_user', queries[-1])
+
+    def test_document_detail_fields(self):
+        """Test that retrieve loads only the selected columns and needed joins."""
+        url = f'/api/v1/documents/{self.document.id}/?fields=id,title,uploaded_by_username'
+        response, queries = self.get_with_queries(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'id': self.document.id,
+            'title': 'Poder',
+            'uploaded_by_username': 'sparse',
+        })
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('cases_case', queries[0])
+        self.assertNotIn('"description"', queries[0])
+
+    def test_client_detail_fields(self):
+        """Test sparse fields on the client detail serializer."""
+        response = self.client.get(f'/api/v1/clients/{self.case.client_id}/?fields=id,full_name')
+        self.assertEqual(response.data, {'id': self.case.client_id, 'full_name': 'Sparse Client'})
+
+    def test_nested_field_kept_unpruned(self):
+        """Test that nested fields can be selected and are still fully loaded."""
+        response = self.client.get(f'/api/v1/cases/{self.case.id}/?fields=id,documents')
+        self.assertEqual(list(response.data), ['id', 'documents'])
+        self.assertEqual(response.data['documents'][0]['title'], 'Poder')
+
+    def test_unknown_field_rejected(self):
+        """Test that unknown field names return 400."""
+        response = self.client.get('/api/v1/cases/?fields=id,secreto')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('secreto', str(response.data))
+
+    def test_fields_ignored_on_writes(self):
+        """Test that the selection does not affect write responses."""
+        response = self.client.patch(
+            f'/api/v1/cases/{self.case.id}/?fields=id',
+            {'title': 'Nuevo título'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('title', response.data)
@@ -0,0 +1,114 @@
+"""
+Tests for streamed JSON lists.
+
+Tests that ?stream=1 list requests and the client cases endpoint return
+every matching row as a JSON array written chunk by chunk.
+"""
+
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APITestCase
+
+from api.streaming import iter_json_array
+from cases.models import Case
+from cases.serializers import CaseSerializer
+from clients.models import Client
+
+
+class IterJSONArrayTests(TestCase):
+    """Tests for iter_json_array."""
+
+    def test_chunks_are_rendered_lazily(self):
+        """Test that rows are consumed one chunk at a time."""
+        consumed = []
+
+        def rows():
+            for i in range(5):
+                consumed.append(i)
+                yield i
+
+        chunks = iter_json_array(rows(), lambda chunk: [{'n': n} for n in chunk], JSONRenderer(), 2)
+        self.assertEqual(next(chunks), b'[')
+        self.assertEqual(next(chunks), b'{"n":0},{"n":1}')
+        self.assertEqual(consumed, [0, 1])
+        self.assertEqual(b''.join(chunks), b',{"n":2},{"n":3},{"n":4}]')
+
+    def test_empty(self):
+        """Test that no rows render an empty array."""
+        self.assertEqual(b''.join(iter_json_array([], list, JSONRenderer(), 10)), b'[]')
+
+
+class StreamedListTests(APITestCase):
+    """Tests for ?stream=1 and the client cases endpoint."""
+
+    def setUp(self):
+        """Create 30 cases for one client and 2 for another, and authenticate."""
+        self.user = User.objects.create_user(username='streamer', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.corporate = self.add_client('STR001')
+        other = self.add_client('STR002')
+        for i in range(32):
+            Case.objects.create(
+                client=self.corporate if i < 30 else other,
+                title=f'Caso {i}',
+                description='Test',
+                case_type='penal' if i % 3 else 'civil',
+                start_date=timezone.now().date()
+            )
+
+    def add_client(self, identification_number):
+        """Create a client."""
+        return Client.objects.create(
+            full_name=f'Cliente {identification_number}',
+            identification_number=identification_number,
+            email=f'{identification_number.lower()}@example.com',
+            phone='555-0000'
+        )
+
+    def get_streamed(self, url, **extra):
+        """Return the streamed response and its decoded JSON."""
+        response = self.client.get(url, **extra)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response, json.loads(b''.join(response.streaming_content))
+
+    def expected(self, response, queryset):
+        """Return the CaseSerializer output for the queryset."""
+        request = Request(response.wsgi_request)
+        return [dict(item) for item in CaseSerializer(queryset, many=True, context={'request': request}).data]
+
+    @override_settings(API_STREAM_CHUNK_SIZE=7)
+    def test_stream_returns_all_rows_unpaginated(self):
+        """Test that ?stream=1 returns every row, in order, across several chunks."""
+        response, data = self.get_streamed('/api/v1/cases/?stream=1&ordering=-created_at')
+        self.assertEqual(data, self.expected(response, Case.objects.order_by('-created_at')))
+        self.assertEqual(len(data), 32)
+
+    def test_stream_applies_filters_and_fields(self):
+        """Test that filters, ordering and sparse fieldsets apply to streamed lists."""
+        _, data = self.get_streamed('/api/v1/cases/?stream=1&case_type=civil&ordering=created_at&fields=id')
+        expected = Case.objects.filter(case_type='civil').order_by('created_at').values_list('id', flat=True)
+        self.assertEqual(data, [{'id': pk} for pk in expected])
+
+    def test_browsable_api_is_not_streamed(self):
+        """Test that non-JSON formats get a regular paginated response."""
+        response = self.client.get('/api/v1/cases/?stream=1', HTTP_ACCEPT='text/html')
+        self.assertFalse(response.streaming)
+
+    def test_client_cases_streamed(self):
+        """Test that the client cases endpoint streams all the client's cases."""
+        response, data = self.get_streamed(f'/api/v1/clients/{self.corporate.id}/cases/')
+        self.assertEqual(data, self.expected(response, self.corporate.cases.all()))
+        self.assertEqual(len(data), 30)
+
+    def test_client_cases_not_found(self):
+        """Test that an unknown client still returns 404 before streaming."""
+        response = self.client.get('/api/v1/clients/999999/cases/')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,216 @@
+"""
+Tests for the delta sync endpoint.
+
+Tests the change log written by the save and delete signals and the
+upserts and tombstones returned by /api/v1/sync/.
+"""
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from cases.models import Case
+from cases.serializers import CaseSerializer
+from clients.models import Client
+from core.models import Change
+from core.signals import rows_updated
+from core.testing import use_temporary_media_root
+from documents.models import Document
+
+
+class SyncTests(APITestCase):
+    """Tests for GET /api/v1/sync/."""
+
+    def setUp(self):
+        """Create a client with a case and a document, and authenticate."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='syncer', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_obj = Client.objects.create(
+                full_name='Cliente Sincronizado',
+                identification_number='SYNC001',
+                email='sync@example.com',
+                phone='555-0000'
+            )
+            self.case = Case.objects.create(
+                client=self.client_obj,
+                title='Caso Sincronizado',
+                description='Test',
+                case_type='civil',
+                start_date=timezone.now().date()
+            )
+            self.document = Document.objects.create(
+                case=self.case,
+                title='Contrato',
+                document_type='contrato',
+                file=SimpleUploadedFile('contrato.pdf', b'%PDF-1.4 contrato', 'application/pdf'),
+                uploaded_by=self.user
+            )
+
+    def sync(self, since=None, **params):
+        """GET the sync endpoint and return the response data."""
+        if since is not None:
+            params['since'] = since
+        response = self.client.get('/api/v1/sync/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def summary(self, data):
+        """Return the (type, op, id) of each change."""
+        return [(change['type'], change['op'], change['id']) for change in data['changes']]
+
+    def test_full_sync(self):
+        """Test that a first sync returns every object as an upsert, in commit order."""
+        data = self.sync()
+        self.assertEqual(self.summary(data), [
+            ('client', 'upsert', self.client_obj.id),
+            ('case', 'upsert', self.case.id),
+            ('document', 'upsert', self.document.id),
+        ])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(data['cursor'], Change.objects.last().id)
+        self.assertEqual(data['changes'][0]['data']['full_name'], 'Cliente Sincronizado')
+        self.assertEqual(dict(data['changes'][2]['data'])['title'], 'Contrato')
+        seqs = [change['seq'] for change in data['changes']]
+        self.assertEqual(seqs, sorted(seqs))
+
+    def test_incremental_sync(self):
+        """Test that only changes after the cursor are returned, latest per object."""
+        cursor = self.sync()['cursor']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.title = 'Primer cambio'
+            self.case.save()
+            self.case.title = 'Segundo cambio'
+            self.case.save()
+        data = self.sync(cursor)
+        self.assertEqual(self.summary(data), [('case', 'upsert', self.case.id)])
+        case = Case.objects.select_related('client').get(pk=self.case.pk)
+        request = self.client.get('/api/v1/sync/').wsgi_request
+        self.assertEqual(data['changes'][0]['data']['title'], 'Segundo cambio')
+        self.assertEqual(
+            data['changes'][0]['data'], CaseSerializer(case, context={'request': request}).data
+        )
+        self.assertEqual(self.sync(data['cursor'])['changes'], [])
+
+    def test_tombstones(self):
+        """Test that deletes, cascades included, are returned as tombstones."""
+        cursor = self.sync()['cursor']
+        case_id, document_id = self.case.id, self.document.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.delete()
+        data = self.sync(cursor)
+        self.assertEqual(
+            sorted(self.summary(data)), [('case', 'delete', case_id), ('document', 'delete', document_id)]
+        )
+        self.assertNotIn('data', data['changes'][0])
+
+    def test_upsert_of_deleted_object_is_left_to_tombstone(self):
+        """Test that an object deleted after its upsert is not sent with stale data."""
+        document_id = self.document.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.document.delete()
+        data = self.sync(limit=3)
+        self.assertEqual(self.summary(data), [
+            ('client', 'upsert', self.client_obj.id),
+            ('case', 'upsert', self.case.id),
+        ])
+        self.assertTrue(data['has_more'])
+        data = self.sync(data['cursor'])
+        self.assertEqual(self.summary(data), [('document', 'delete', document_id)])
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_pages(self):
+        """Test that limit is capped by SYNC_PAGE_SIZE and has_more pages through the log."""
+        data = self.sync(limit=100)
+        self.assertEqual(len(data['changes']), 2)
+        self.assertTrue(data['has_more'])
+        data = self.sync(data['cursor'])
+        self.assertEqual(self.summary(data), [('document', 'upsert', self.document.id)])
+        self.assertFalse(data['has_more'])
+
+    def test_changes_logged_after_commit(self):
+        """Test that entries are only written when the transaction commits."""
+        count = Change.objects.count()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client_obj.save()
+            self.assertEqual(Change.objects.count(), count)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(Change.objects.count(), count + 1)
+
+    def test_unsynced_models_not_logged(self):
+        """Test that writes to other models add no entries."""
+        count = Change.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='other')
+        self.assertEqual(Change.objects.count(), count)
+
+    def test_rows_updated(self):
+        """Test that writes through QuerySet.update() can be logged with rows_updated()."""
+        cursor = self.sync()['cursor']
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.filter(pk=self.client_obj.pk).update(is_active=False)
+            rows_updated(Client, [self.client_obj.pk])
+        data = self.sync(cursor)
+        self.assertEqual(self.summary(data), [('client', 'upsert', self.client_obj.id)])
+        self.assertFalse(data['changes'][0]['data']['is_active'])
+
+    def test_invalid_parameters(self):
+        """Test that malformed cursors and limits are rejected."""
+        for params in [{'since': 'abc'}, {'since': '-1'}, {'limit': '0'}]:
+            with self.subTest(params=params):
+                response = self.client.get('/api/v1/sync/', params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        """Test that the endpoint requires a token."""
+        self.client.credentials()
+        response = self.client.get('/api/v1/sync/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ChangeLogBackfillTests(TransactionTestCase):
+    """Tests for the migration that logs the rows written before the change log existed."""
+
+    def migrate(self, target):
+        """Migrate the core app to the target migration."""
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([('core', target)])
+
+    def test_existing_rows_returned_by_first_sync(self):
+        """Test that rows created before the change log are returned as upserts."""
+        self.migrate('0002_change')
+        client_obj = Client.objects.create(
+            full_name='Cliente Previo',
+            identification_number='PREV001',
+            email='prev@example.com',
+            phone='555-0000'
+        )
+        case = Case.objects.create(
+            client=client_obj,
+            title='Caso Previo',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        # As if they had been written before the change log was added
+        Change.objects.all().delete()
+        self.migrate('0003_backfill_changes')
+
+        token = Token.objects.create(user=User.objects.create_user(username='syncer'))
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = api.get('/api/v1/sync/')
+        self.assertEqual(
+            [(change['type'], change['op'], change['id']) for change in response.data['changes']],
+            [('client', 'upsert', client_obj.id), ('case', 'upsert', case.id)]
+        )
@@ -4,7 +4,7 @@ URL configuration for LegalDocs Manager API v1.
 This module defines the URL patterns for the REST API, including:
 - ViewSet registration via DRF router
 - Authentication endpoints (login, logout, register, me)
-- Dashboard, search, and profile endpoints
+- Dashboard, search, sync, batch, and profile endpoints
 - API documentation endpoints (schema and Swagger UI)
 """
 
@@ -17,9 +17,10 @@ from rest_framework.routers import DefaultRouter
 
 from cases.views import CaseViewSet
 from clients.views import ClientViewSet
-from documents.views import DocumentViewSet
+from documents.views import DocumentViewSet, UploadSessionViewSet
 
 from .views import (
+    BatchView,
     DashboardView,
     LoginView,
     LogoutView,
@@ -27,12 +28,15 @@ from .views import (
     ProfileView,
     RegisterView,
     SearchView,
+    SyncView,
 )
 
 # Create router for ViewSet registration
 router = DefaultRouter()
 router.register(r'clients', ClientViewSet)
 router.register(r'cases', CaseViewSet)
+# Must precede 'documents' so 'uploads' is not taken as a document id
+router.register(r'documents/uploads', UploadSessionViewSet, basename='upload-session')
 router.register(r'documents', DocumentViewSet)
 
 urlpatterns = [
@@ -51,6 +55,12 @@ urlpatterns = [
     # Search endpoint
     path('search/', SearchView.as_view(), name='search'),
 
+    # Delta sync endpoint
+    path('sync/', SyncView.as_view(), name='sync'),
+
+    # Batch endpoint (name used by api.batch to refuse nested batches)
+    path('batch/', BatchView.as_view(), name='batch'),
+
     # Profile endpoint
     path('profile/', ProfileView.as_view(), name='profile'),
 
@@ -8,9 +8,13 @@ Provides:
 - MeView: Get current user info
 - DashboardView: Aggregated statistics
 - SearchView: Global search across models
+- SyncView: Changes since a cursor, for incremental client sync
+- BatchView: Several GET requests in one round trip
 - ProfileView: User profile management
 """
 
+from django.apps import apps
+from django.conf import settings
 from django.db.models import Count, Q
 from django.utils import timezone
 from rest_framework import status
@@ -20,6 +24,14 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from cases.serializers import CaseListSerializer
+from clients.serializers import ClientListSerializer
+from core.models import Change
+from documents.serializers import DocumentListSerializer
+
+from .batch import run_subrequest
+from .conditional import etag_matches, generations_of, make_etag, not_modified, representation_key
+from .renderers import wants_native_dates
 from .serializers import ProfileSerializer, RegisterSerializer, UserInfoSerializer
 from .throttling import LoginRateThrottle, RegisterRateThrottle
 
@@ -115,6 +127,10 @@ class MeView(APIView):
         return Response(serializer.data)
 
 
+# Models aggregated by the dashboard; their writes change its ETag
+DASHBOARD_MODELS = ['clients.Client', 'cases.Case', 'documents.Document']
+
+
 class DashboardView(APIView):
     """
     Get dashboard statistics with aggregated data.
@@ -130,7 +146,11 @@ class DashboardView(APIView):
         "upcoming_deadlines": [...]
     }
 
-    Statistics are cached for 5 minutes to improve performance.
+    Statistics are cached for 5 minutes to improve performance. The ETag
+    is derived from the write generations of the aggregated tables and the
+    date, so a matching If-None-Match is answered with 304 Not Modified
+    without reading the cached statistics; a write to those tables also
+    makes the cached statistics obsolete.
     """
 
     permission_classes = [IsAuthenticated]
@@ -149,12 +169,22 @@ class DashboardView(APIView):
         from clients.models import Client
         from documents.models import Document
 
+        today = timezone.now().date()
+
+        # Upcoming deadlines and days remaining depend on the date
+        generations = generations_of(DASHBOARD_MODELS)
+        etag = None
+        if generations is not None:
+            etag = make_etag('dashboard', generations, today, representation_key(request))
+            if etag_matches(request.headers.get('If-None-Match', ''), etag):
+                return not_modified(etag)
+
         # Try to get cached stats
-        cached_stats = get_dashboard_stats()
+        version = etag.strip('"') if etag else ''
+        cached_stats = get_dashboard_stats(version)
         if cached_stats is not None:
-            return Response(cached_stats)
+            return Response(cached_stats, headers={'ETag': etag} if etag else None)
 
-        today = timezone.now().date()
         seven_days_later = today + timedelta(days=7)
 
         # Client counts - single aggregate query
@@ -233,9 +263,9 @@ class DashboardView(APIView):
         }
 
         # Cache the stats
-        set_dashboard_stats(stats, DASHBOARD_CACHE_TIMEOUT)
+        set_dashboard_stats(stats, DASHBOARD_CACHE_TIMEOUT, version)
 
-        return Response(stats)
+        return Response(stats, headers={'ETag': etag} if etag else None)
 
 
 class SearchView(APIView):
@@ -333,6 +363,139 @@ class SearchView(APIView):
         })
 
 
+class SyncView(APIView):
+    """
+    Changes to clients, cases and documents since a cursor.
+
+    GET /api/v1/sync/?since=<cursor>&limit=<n>
+    Response: {
+        "cursor": 1234,
+        "has_more": false,
+        "changes": [
+            {"seq": 1201, "type": "case", "op": "upsert", "id": 5, "data": {...}},
+            {"seq": 1234, "type": "document", "op": "delete", "id": 9}
+        ]
+    }
+
+    Changes are read from the change log (core.changes) in commit order.
+    Only the latest change of each object in the response is included;
+    upserts carry the object's current list representation and objects
+    deleted in the meantime are left to their tombstone. Clients pass the
+    returned cursor as the next ``since`` (omit it for a first, full sync)
+    and repeat while has_more is true.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Return the changes after the ``since`` cursor."""
+        serializer_classes = {
+            'client': ClientListSerializer,
+            'case': CaseListSerializer,
+            'document': DocumentListSerializer,
+        }
+
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', settings.SYNC_PAGE_SIZE))
+            if since < 0 or limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': "Los parámetros 'since' y 'limit' deben ser enteros positivos."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(limit, settings.SYNC_PAGE_SIZE)
+
+        entries = list(
+            Change.objects.filter(id__gt=since)
+            .order_by('id')
+            .values_list('id', 'object_type', 'object_id', 'operation')[:limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+
+        # Latest change of each object, in sequence order
+        latest = {}
+        for seq, object_type, object_id, operation in entries:
+            latest.pop((object_type, object_id), None)
+            latest[(object_type, object_id)] = (seq, operation)
+
+        # Current data of the upserted objects, one query per type
+        context = {'request': request, 'view': self}
+        data = {}
+        for object_type, serializer_class in serializer_classes.items():
+            ids = [
+                object_id for (kind, object_id), (_, operation) in latest.items()
+                if kind == object_type and operation == Change.UPSERT
+            ]
+            if not ids:
+                continue
+            model = apps.get_model(settings.SYNC_MODELS[object_type])
+            fast = serializer_class(context=context, native_dates=wants_native_dates(request))
+            rows = model.objects.filter(pk__in=ids).values_list(*fast.columns)
+            for item in fast.serialize(rows):
+                data[(object_type, item['id'])] = item
+
+        changes = []
+        for (object_type, object_id), (seq, operation) in latest.items():
+            change = {'seq': seq, 'type': object_type, 'op': operation, 'id': object_id}
+            if operation == Change.UPSERT:
+                if (object_type, object_id) not in data:
+                    # Deleted since: its tombstone comes later in the log
+                    continue
+                change['data'] = data[(object_type, object_id)]
+            changes.append(change)
+
+        return Response({
+            'cursor': entries[-1][0] if entries else since,
+            'has_more': has_more,
+            'changes': changes,
+        })
+
+
+class BatchView(APIView):
+    """
+    Run several GET requests of the API in one round trip.
+
+    POST /api/v1/batch/
+    Request: {
+        "requests": [
+            {"path": "/api/v1/cases/5/"},
+            {"path": "/api/v1/documents/?case=5"}
+        ]
+    }
+    Response: {
+        "responses": [
+            {"status": 200, "body": {...}},
+            {"status": 200, "body": {"next": null, "previous": null, "results": [...]}}
+        ]
+    }
+
+    Sub-requests run in order, in process, with the authentication of the
+    batch request (api.batch). Each one succeeds or fails on its own; its
+    status and body are those the endpoint would have returned.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Run the sub-requests and return their results in order."""
+        requests = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(requests, list) or not requests:
+            return Response(
+                {'error': "Se requiere una lista 'requests' con al menos una petición."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(requests) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'error': f'Un lote admite como máximo {settings.BATCH_MAX_REQUESTS} peticiones.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({'responses': [run_subrequest(request, spec) for spec in requests]})
+
+
 class ProfileView(APIView):
     """
     User profile management.
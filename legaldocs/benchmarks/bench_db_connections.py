@@ -0,0 +1,147 @@
+"""
+Benchmark of per-request latency with new, persistent and pooled connections.
+
+Sends REQUESTS authenticated GET /api/v1/auth/me/ requests to the WSGI
+handler, as a server would (the test client keeps connections open), so
+request_started and request_finished close or keep the connection as in
+production. Each connection mode is measured:
+
+- new: CONN_MAX_AGE = 0, a connection is opened and closed per request
+- persistent: CONN_MAX_AGE = 60 with health checks (a SELECT 1 per request)
+- pool: core.db.postgresql_pool, connections borrowed from a shared pool
+  (PostgreSQL only)
+
+and prints the mean, median and 95th percentile latency and the number of
+connections opened (distinct driver connections: a pooled connection is
+announced by connection_created every time it is borrowed). The difference between modes is the cost of
+connecting, which grows with the network distance to the database and
+with TLS and password authentication.
+
+Runs against a throwaway test database created on the configured backend,
+or an on-disk SQLite database with --sqlite.
+
+Usage (from the legaldocs/ directory):
+    python -m benchmarks.bench_db_connections [--sqlite]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legaldocs.settings')
+
+from django.conf import settings  # noqa: E402
+
+if '--sqlite' in sys.argv:
+    settings.DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.mkdtemp(), 'bench.sqlite3'),
+        'TEST': {'NAME': os.path.join(tempfile.mkdtemp(), 'bench_test.sqlite3')},
+    }
+settings.ALLOWED_HOSTS = ['*']
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from core.db.postgresql_pool.base import DatabaseWrapper as PooledDatabaseWrapper  # noqa: E402
+from core.db.postgresql_pool.base import close_pools  # noqa: E402
+
+REQUESTS = 500
+URL = '/api/v1/auth/me/'
+
+
+def connection_modes(settings_dict: dict) -> list:
+    """Return (label, settings_dict, wrapper_class) for each mode the backend supports."""
+    base = {**settings_dict, 'CONN_HEALTH_CHECKS': False}
+    modes = [
+        ('new', {**base, 'CONN_MAX_AGE': 0}, None),
+        ('persistent', {**base, 'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True}, None),
+    ]
+    if connection.vendor == 'postgresql':
+        pooled = {
+            **base,
+            'ENGINE': 'core.db.postgresql_pool',
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {**base.get('OPTIONS', {}), 'pool': {'max_size': 4}},
+        }
+        modes.append(('pool', pooled, PooledDatabaseWrapper))
+    return modes
+
+
+def request(handler: WSGIHandler, token: str) -> str:
+    """Send one request to the WSGI handler and return its status line."""
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': URL,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'HTTP_AUTHORIZATION': f'Token {token}',
+        'wsgi.input': BytesIO(),
+        'wsgi.url_scheme': 'http',
+    }
+    statuses = []
+    response = handler(environ, lambda status, headers: statuses.append(status))
+    b''.join(response)
+    # Fires request_finished, which closes or keeps the connection
+    response.close()
+    return statuses[0]
+
+
+def measure(handler: WSGIHandler, token: str) -> list:
+    """Return the latency in milliseconds of each request."""
+    request(handler, token)
+    timings = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        status = request(handler, token)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert status.startswith('200'), status
+    return timings
+
+
+def main():
+    """Run the benchmark and print a table of results."""
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        user = User.objects.create_user(username='bench')
+        token = Token.objects.create(user=user).key
+        handler = WSGIHandler()
+        settings_dict = dict(connection.settings_dict)
+        default_class = type(connections['default'])
+        # Keep the driver connections alive so that their ids stay unique
+        opened = []
+        connection_created.connect(
+            lambda connection, **kwargs: opened.append(connection.connection), weak=False
+        )
+
+        print(f'{connection.vendor}: {REQUESTS} x GET {URL}')
+        print(f'{"mode":<12}{"mean ms":>9}{"p50 ms":>9}{"p95 ms":>9}{"connects":>10}')
+        for label, mode_settings, wrapper_class in connection_modes(settings_dict):
+            connections['default'].close()
+            connections['default'] = (wrapper_class or default_class)(mode_settings, 'default')
+            opened.clear()
+            timings = measure(handler, token)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(f'{label:<12}{statistics.mean(timings):>9.3f}{statistics.median(timings):>9.3f}'
+                  f'{p95:>9.3f}{len({id(raw) for raw in opened}):>10}')
+        connections['default'].close()
+        close_pools()
+        connections['default'] = default_class(settings_dict, 'default')
+    finally:
+        connections['default'].creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark of the list serializers.
+
+Compares ModelSerializer(many=True) over a select_related() queryset with
+the fast values_list() path (api.fast_serializers) for pages of cases,
+clients and documents. Both fetch and serialize a page per iteration.
+
+Runs against a throwaway test database created on the configured backend,
+or an in-memory SQLite database with --sqlite.
+
+Usage (from the legaldocs/ directory):
+    python -m benchmarks.bench_list_serializers [--sqlite]
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legaldocs.settings')
+
+from django.conf import settings  # noqa: E402
+
+if '--sqlite' in sys.argv:
+    settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from cases.models import Case  # noqa: E402
+from cases.serializers import CaseListSerializer, CaseSerializer  # noqa: E402
+from clients.models import Client  # noqa: E402
+from clients.serializers import ClientListSerializer, ClientSerializer  # noqa: E402
+from documents.models import Document  # noqa: E402
+from documents.serializers import DocumentListSerializer, DocumentSerializer  # noqa: E402
+
+ROWS = 500
+PAGE_SIZES = [20, 100, 500]
+ITERATIONS = 50
+
+
+def create_rows():
+    """Insert ROWS clients, cases and documents with bulk_create."""
+    user = User.objects.create_user(username='bench')
+    today = timezone.now().date()
+    clients = Client.objects.bulk_create(
+        Client(
+            full_name=f'Cliente {i}',
+            identification_number=f'BENCH{i:05d}',
+            email=f'cliente{i}@example.com',
+            phone='555-0000',
+            address='Calle 1 # 2-3',
+        )
+        for i in range(ROWS)
+    )
+    cases = Case.objects.bulk_create(
+        Case(
+            case_number=f'BENCH-{i:05d}',
+            client=clients[i],
+            title=f'Caso {i}',
+            description='Descripción del caso',
+            case_type='civil',
+            start_date=today - timedelta(days=i),
+            deadline=today + timedelta(days=i) if i % 2 else None,
+            assigned_to=user if i % 3 else None,
+        )
+        for i in range(ROWS)
+    )
+    Document.objects.bulk_create(
+        Document(
+            case=cases[i],
+            title=f'Documento {i}',
+            document_type='contrato',
+            file=f'legal_documents/{i:064x}.pdf',
+            file_size=1024,
+            content_hash=f'{i:064x}',
+            uploaded_by=user if i % 2 else None,
+        )
+        for i in range(ROWS)
+    )
+
+
+def measure(function) -> float:
+    """Return milliseconds per call."""
+    function()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function()
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+def main():
+    """Run the benchmark and print a table of results."""
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        create_rows()
+        context = {'request': Request(APIRequestFactory().get('/api/v1/', HTTP_HOST='localhost'))}
+        targets = [
+            ('cases', Case.objects.select_related('client', 'assigned_to').order_by('id'),
+             CaseSerializer, CaseListSerializer),
+            ('clients', Client.objects.order_by('id'), ClientSerializer, ClientListSerializer),
+            ('documents', Document.objects.select_related('case', 'uploaded_by').order_by('id'),
+             DocumentSerializer, DocumentListSerializer),
+        ]
+
+        print(f'{"endpoint":<12}{"rows":>6}{"model ms":>11}{"fast ms":>10}{"speedup":>10}')
+        for name, queryset, serializer_class, fast_class in targets:
+            for size in PAGE_SIZES:
+                def model():
+                    return serializer_class(queryset[:size], many=True, context=context).data
+
+                def fast():
+                    serializer = fast_class(context=context)
+                    return serializer.serialize(queryset.values_list(*serializer.columns)[:size])
+
+                model_ms, fast_ms = measure(model), measure(fast)
+                print(f'{name:<12}{size:>6}{model_ms:>11.2f}{fast_ms:>10.2f}{model_ms / fast_ms:>9.1f}x')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the MessagePack format against JSON.
+
+Serializes the same pages of cases and documents for JSON (date strings;
+DRF's stdlib classes and the orjson-backed ones) and for MessagePack
+(native dates, MessagePackRenderer), then compares payload size, encode
+time and decode time. Decoding uses the API parsers, so MessagePack dates
+come back as date and datetime objects while JSON dates stay strings.
+
+Runs against a throwaway test database created on the configured backend,
+or an in-memory SQLite database with --sqlite.
+
+Usage (from the legaldocs/ directory):
+    python -m benchmarks.bench_msgpack [--sqlite]
+"""
+
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legaldocs.settings')
+
+from django.conf import settings  # noqa: E402
+
+if '--sqlite' in sys.argv:
+    settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api.parsers import FastJSONParser, MessagePackParser  # noqa: E402
+from api.renderers import FastJSONRenderer, MessagePackRenderer  # noqa: E402
+from benchmarks.bench_list_serializers import create_rows  # noqa: E402
+from cases.models import Case  # noqa: E402
+from cases.serializers import CaseListSerializer  # noqa: E402
+from documents.models import Document  # noqa: E402
+from documents.serializers import DocumentListSerializer  # noqa: E402
+
+PAGE_SIZES = [20, 100, 500]
+ITERATIONS = 100
+
+
+def measure(function) -> float:
+    """Return milliseconds per call."""
+    function()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function()
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+def main():
+    """Run the benchmark and print a table of results."""
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        create_rows()
+        context = {'request': Request(APIRequestFactory().get('/api/v1/', HTTP_HOST='localhost'))}
+        targets = [
+            ('cases', Case.objects.order_by('id'), CaseListSerializer),
+            ('documents', Document.objects.order_by('id'), DocumentListSerializer),
+        ]
+        formats = [
+            ('json', JSONRenderer(), JSONParser(), False),
+            ('orjson', FastJSONRenderer(), FastJSONParser(), False),
+            ('msgpack', MessagePackRenderer(), MessagePackParser(), True),
+        ]
+
+        print(f'{"payload":<12}{"rows":>6}{"format":>9}{"KB":>9}{"encode ms":>11}{"decode ms":>11}')
+        for name, queryset, fast_class in targets:
+            for size in PAGE_SIZES:
+                for label, renderer, parser, native_dates in formats:
+                    fast = fast_class(context=context, native_dates=native_dates)
+                    payload = {
+                        'next': None, 'previous': None,
+                        'results': fast.serialize(queryset.values_list(*fast.columns)[:size]),
+                    }
+                    body = renderer.render(payload)
+                    parser_context = {'encoding': 'utf-8'}
+                    encode_ms = measure(lambda: renderer.render(payload))
+                    decode_ms = measure(lambda: parser.parse(io.BytesIO(body), None, parser_context))
+                    print(f'{name:<12}{size:>6}{label:>9}{len(body) / 1024:>9.1f}'
+                          f'{encode_ms:>11.3f}{decode_ms:>11.3f}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
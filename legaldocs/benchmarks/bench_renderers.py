@@ -0,0 +1,117 @@
+"""
+Benchmark of the JSON renderers and parsers.
+
+Compares DRF's JSONRenderer and JSONParser with the orjson-backed
+FastJSONRenderer and FastJSONParser (api.renderers, api.parsers) on
+realistic payloads: pages of serialized cases and documents, and the
+same lists with raw date, datetime and Decimal values as views that build
+dicts by hand return them.
+
+Runs against a throwaway test database created on the configured backend,
+or an in-memory SQLite database with --sqlite.
+
+Usage (from the legaldocs/ directory):
+    python -m benchmarks.bench_renderers [--sqlite]
+"""
+
+import decimal
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legaldocs.settings')
+
+from django.conf import settings  # noqa: E402
+
+if '--sqlite' in sys.argv:
+    settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api.parsers import FastJSONParser  # noqa: E402
+from api.renderers import FastJSONRenderer, orjson  # noqa: E402
+from benchmarks.bench_list_serializers import create_rows  # noqa: E402
+from cases.models import Case  # noqa: E402
+from cases.serializers import CaseSerializer  # noqa: E402
+from documents.models import Document  # noqa: E402
+from documents.serializers import DocumentSerializer  # noqa: E402
+
+PAGE_SIZES = [20, 100, 500]
+ITERATIONS = 100
+
+
+def measure(function) -> float:
+    """Return milliseconds per call."""
+    function()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function()
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+def build_payloads(size: int) -> dict:
+    """Return the payloads of a page of the given size."""
+    context = {'request': Request(APIRequestFactory().get('/api/v1/', HTTP_HOST='localhost'))}
+    cases = Case.objects.select_related('client', 'assigned_to').order_by('id')[:size]
+    documents = Document.objects.select_related('case', 'uploaded_by').order_by('id')[:size]
+    raw = [
+        {
+            'id': case.id,
+            'case_number': case.case_number,
+            'start_date': case.start_date,
+            'deadline': case.deadline,
+            'created_at': case.created_at,
+            'fee': decimal.Decimal('1500000.50'),
+        }
+        for case in cases
+    ]
+    return {
+        'cases': {'next': None, 'previous': None, 'results': CaseSerializer(cases, many=True, context=context).data},
+        'documents': {
+            'next': None, 'previous': None,
+            'results': DocumentSerializer(documents, many=True, context=context).data,
+        },
+        'raw values': {'results': raw},
+    }
+
+
+def main():
+    """Run the benchmark and print a table of results."""
+    if orjson is None:
+        print('orjson is not installed: the fast classes fall back to the standard library.')
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        create_rows()
+        standard_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        standard_parser, fast_parser = JSONParser(), FastJSONParser()
+        parser_context = {'encoding': 'utf-8'}
+
+        print(f'{"payload":<12}{"rows":>6}{"KB":>8}{"render ms":>11}{"fast":>8}'
+              f'{"speedup":>9}{"parse ms":>10}{"fast":>8}{"speedup":>9}')
+        for size in PAGE_SIZES:
+            for name, payload in build_payloads(size).items():
+                body = standard_renderer.render(payload)
+                assert fast_renderer.render(payload) == body
+
+                render_ms = measure(lambda: standard_renderer.render(payload))
+                fast_render_ms = measure(lambda: fast_renderer.render(payload))
+                parse_ms = measure(lambda: standard_parser.parse(io.BytesIO(body), None, parser_context))
+                fast_parse_ms = measure(lambda: fast_parser.parse(io.BytesIO(body), None, parser_context))
+                print(f'{name:<12}{size:>6}{len(body) / 1024:>8.1f}'
+                      f'{render_ms:>11.3f}{fast_render_ms:>8.3f}{render_ms / fast_render_ms:>8.1f}x'
+                      f'{parse_ms:>10.3f}{fast_parse_ms:>8.3f}{parse_ms / fast_parse_ms:>8.1f}x')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
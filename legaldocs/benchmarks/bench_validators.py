@@ -0,0 +1,103 @@
+"""
+Microbenchmark for document file type validation.
+
+Compares the previous detection path (python-magic's module-level
+handle plus rebuilding the allowed list on every call) with
+documents.validators, single-threaded and with concurrent threads.
+
+Usage (from the legaldocs/ directory):
+    python -m benchmarks.bench_validators
+"""
+
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'legaldocs.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import magic  # noqa: E402
+from django.conf import settings  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from documents.validators import detect_mime_type, get_allowed_types  # noqa: E402
+
+ITERATIONS = 2000
+THREADS = 8
+
+
+def build_samples() -> dict:
+    """Return the leading 2048 bytes of one sample file per allowed type."""
+    png, jpeg = io.BytesIO(), io.BytesIO()
+    Image.new('RGB', (64, 64)).save(png, 'PNG')
+    Image.new('RGB', (64, 64)).save(jpeg, 'JPEG')
+    docx = io.BytesIO()
+    with zipfile.ZipFile(docx, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', '<Types/>')
+        package.writestr('word/document.xml', '<w:document/>' * 50)
+    samples = {
+        'pdf': b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n<< /Type /Catalog >>\nendobj\n',
+        'png': png.getvalue(),
+        'jpeg': jpeg.getvalue(),
+        'docx': docx.getvalue(),
+        'txt': 'Contrato de prestación de servicios profesionales.\n'.encode() * 40,
+    }
+    return {name: data[:2048] for name, data in samples.items()}
+
+
+def legacy_check(data: bytes) -> bool:
+    """Detection as done before: module-level handle, list rebuilt per call."""
+    mime_type = magic.from_buffer(data, mime=True)
+    allowed = list(getattr(settings, 'ALLOWED_FILE_TYPES', []))
+    return mime_type in allowed
+
+
+def engine_check(data: bytes) -> bool:
+    """Detection through documents.validators."""
+    return detect_mime_type(data) in get_allowed_types()
+
+
+def run_serial(check, data: bytes) -> float:
+    """Return microseconds per call for a single thread."""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        check(data)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def run_threaded(check, samples: list) -> float:
+    """Return microseconds per call with THREADS concurrent threads."""
+    per_thread = ITERATIONS // THREADS
+
+    def work(data):
+        for _ in range(per_thread):
+            check(data)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(work, (samples[i % len(samples)] for i in range(THREADS))))
+    return (time.perf_counter() - start) / (per_thread * THREADS) * 1e6
+
+
+def main():
+    """Run the benchmark and print a table of results."""
+    samples = build_samples()
+    print(f'{"sample":<10}{"legacy µs":>12}{"engine µs":>12}{"speedup":>10}')
+    for name, data in samples.items():
+        legacy = run_serial(legacy_check, data)
+        engine = run_serial(engine_check, data)
+        print(f'{name:<10}{legacy:>12.2f}{engine:>12.2f}{legacy / engine:>9.1f}x')
+
+    values = list(samples.values())
+    legacy = run_threaded(legacy_check, values)
+    engine = run_threaded(engine_check, values)
+    print(f'{"threads":<10}{legacy:>12.2f}{engine:>12.2f}{legacy / engine:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
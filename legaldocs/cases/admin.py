@@ -1,9 +1,9 @@
 from django.contrib import admin
-from django.utils import timezone
 from django.utils.html import format_html
 
 from documents.models import Document
 
+from .bulk import bulk_update_cases
 from .models import Case
 
 
@@ -88,5 +88,5 @@ class CaseAdmin(admin.ModelAdmin):
     @admin.action(description="Marcar como Cerrado")
     def mark_as_closed(self, request, queryset):
         """Bulk action to mark selected cases as closed."""
-        updated = queryset.update(status='cerrado', closed_date=timezone.now().date())
+        updated = len(bulk_update_cases(queryset, {'status': 'cerrado'}))
         self.message_user(request, f"{updated} caso(s) marcado(s) como cerrado(s).")
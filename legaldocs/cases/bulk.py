@@ -0,0 +1,55 @@
+"""
+Set-based bulk updates of cases.
+
+bulk_update_cases() applies the same validated values to many cases with
+a single UPDATE statement inside a transaction, keeping the columns that
+save() and the close action would maintain (updated_at, closed_date) and
+the downstream caches: write generations (cached counts, ETags) and the
+sync change log, which QuerySet.update() does not notify by itself.
+"""
+
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Case as CaseExpression
+from django.db.models import F, When
+from django.utils import timezone
+
+from core.signals import rows_updated
+
+from .models import Case
+
+
+def bulk_update_cases(queryset, values: dict, max_rows: Optional[int] = None) -> list:
+    """
+    Update the cases of a queryset with the same values.
+
+    Setting status to 'cerrado' sets closed_date to today on the cases
+    that were not closed yet (closed cases keep their date); other
+    statuses leave closed_date unchanged, as a single update does.
+
+    Args:
+        queryset: The cases to update.
+        values: Validated field values (status, priority, assigned_to, deadline).
+        max_rows: Maximum number of cases; more raise ValueError (None: no limit).
+
+    Returns:
+        list: Primary keys of the updated cases.
+    """
+    update = dict(values, updated_at=timezone.now())
+    if values.get('status') == 'cerrado':
+        update['closed_date'] = CaseExpression(
+            When(status='cerrado', closed_date__isnull=False, then=F('closed_date')),
+            default=timezone.now().date(),
+        )
+
+    with transaction.atomic():
+        # Lock the rows so concurrent writes cannot interleave with the update
+        locked = queryset.order_by('pk').select_for_update().values_list('pk', flat=True)
+        pks = list(locked if max_rows is None else locked[:max_rows + 1])
+        if max_rows is not None and len(pks) > max_rows:
+            raise ValueError(f'More than {max_rows} cases selected')
+        if pks:
+            Case.objects.filter(pk__in=pks).update(**update)
+            rows_updated(Case, pks)
+    return pks
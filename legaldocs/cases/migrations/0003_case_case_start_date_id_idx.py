@@ -0,0 +1,20 @@
+# Generated by Django 5.0.11 on 2026-10-19 03:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0002_add_performance_indexes'),
+        ('clients', '0002_client_client_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['-start_date', '-id'], name='case_start_date_id_idx'),
+        ),
+    ]
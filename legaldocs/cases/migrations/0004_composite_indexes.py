@@ -0,0 +1,51 @@
+# Generated by Django 5.0.11 on 2026-10-19 04:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core.db.operations import AddIndexConcurrently, RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently on PostgreSQL, outside a transaction,
+    # so that the table stays writable during the build
+    atomic = False
+
+    dependencies = [
+        ('cases', '0003_case_case_start_date_id_idx'),
+        ('clients', '0002_client_client_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Create the composite indexes before dropping the ones they replace
+        AddIndexConcurrently(
+            model_name='case',
+            index=models.Index(fields=['status', '-start_date', '-id'], name='case_status_start_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='case',
+            index=models.Index(fields=['client', '-start_date', '-id'], name='case_client_start_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='case',
+            index=models.Index(fields=['-created_at', '-id'], name='case_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='case',
+            index=models.Index(condition=models.Q(('status', 'cerrado'), _negated=True), fields=['deadline'], name='case_open_deadline_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='case',
+            name='case_client_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='case',
+            name='case_status_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='case',
+            name='case_created_idx',
+        ),
+    ]
@@ -136,10 +136,21 @@ class Case(models.Model):
         verbose_name = "Caso"
         verbose_name_plural = "Casos"
         indexes = [
-            models.Index(fields=['client'], name='case_client_idx'),
-            models.Index(fields=['status'], name='case_status_idx'),
             models.Index(fields=['case_type'], name='case_type_idx'),
-            models.Index(fields=['-created_at'], name='case_created_idx'),
+            # Keyset pagination over the default ordering (start_date, id)
+            models.Index(fields=['-start_date', '-id'], name='case_start_date_id_idx'),
+            # List filtered by status or client, in the default ordering; the
+            # leading column also serves status counts and client lookups
+            models.Index(fields=['status', '-start_date', '-id'], name='case_status_start_idx'),
+            models.Index(fields=['client', '-start_date', '-id'], name='case_client_start_idx'),
+            # ?ordering=-created_at and the dashboard's recent cases
+            models.Index(fields=['-created_at', '-id'], name='case_created_id_idx'),
+            # Dashboard: open cases with a deadline in a date range, by deadline
+            models.Index(
+                fields=['deadline'],
+                name='case_open_deadline_idx',
+                condition=~models.Q(status='cerrado')
+            ),
         ]
 
     def __str__(self) -> str:
@@ -1,13 +1,17 @@
 """
 Serializers for the Case model.
 
-Provides two serializers:
+Provides:
 - CaseSerializer: For list views (includes client_name)
 - CaseDetailSerializer: For detail views (nested client data and documents list)
+- CaseListSerializer: Fast read-only equivalent of CaseSerializer for the list action
+- CaseBulkUpdateSerializer: Input of the bulk update action
 """
 
+from django.conf import settings
 from rest_framework import serializers
 
+from api.fast_serializers import FastListSerializer
 from clients.models import Client
 from clients.serializers import ClientSerializer
 from documents.serializers import DocumentSerializer
@@ -89,3 +93,59 @@ class CaseDetailSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['case_number', 'created_at', 'updated_at']
+
+
+class CaseListSerializer(FastListSerializer):
+    """Fast list representation, identical to CaseSerializer."""
+
+    serializer_class = CaseSerializer
+
+
+class CaseBulkValuesSerializer(serializers.ModelSerializer):
+    """Fields a bulk update may set, all optional."""
+
+    class Meta:
+        model = Case
+        fields = ['status', 'priority', 'assigned_to', 'deadline']
+        extra_kwargs = {field: {'required': False} for field in fields}
+
+
+class CaseBulkUpdateSerializer(serializers.Serializer):
+    """
+    Input of PATCH /cases/bulk/.
+
+    Selects the cases either by ID (ids) or with the list filters (filter),
+    and carries the values to set on all of them (data).
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        required=False
+    )
+    filter = serializers.DictField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        required=False
+    )
+    data = CaseBulkValuesSerializer()
+
+    def validate_ids(self, value):
+        """Reject more IDs than BULK_UPDATE_MAX_ROWS."""
+        if len(value) > settings.BULK_UPDATE_MAX_ROWS:
+            raise serializers.ValidationError(
+                f'Se admiten como máximo {settings.BULK_UPDATE_MAX_ROWS} casos.'
+            )
+        return list(dict.fromkeys(value))
+
+    def validate_data(self, value):
+        """Require at least one field to set."""
+        if not value:
+            raise serializers.ValidationError('Indique al menos un campo a actualizar.')
+        return value
+
+    def validate(self, attrs):
+        """Require exactly one of ids and filter."""
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Indique 'ids' o 'filter', pero no ambos.")
+        return attrs
@@ -0,0 +1,120 @@
+"""
+Tests for the case documents archive endpoint.
+
+Tests the streamed ZIP content, stored vs deflated entries and the
+exclusion of confidential documents.
+"""
+
+import io
+import zipfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.models import Document
+
+
+class CaseArchiveTests(APITestCase):
+    """Tests for CaseViewSet.archive."""
+
+    def setUp(self):
+        """Create a user, a case and documents of several types."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(username='archiver', password='testpass123')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.other = User.objects.create_user(username='uploader', password='testpass123')
+
+        client_obj = Client.objects.create(
+            full_name='Archive Client',
+            identification_number='ARC001',
+            email='arc@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Archive Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.files = {
+            'demanda.pdf': b'%PDF-1.4\n' + b'demanda ' * 200,
+            'notas.txt': b'notas del caso ' * 200,
+        }
+        for name, content in self.files.items():
+            Document.objects.create(
+                case=self.case,
+                title=name.split('.')[0],
+                document_type='otro',
+                file=SimpleUploadedFile(name, content),
+                uploaded_by=self.user
+            )
+        self.url = f'/api/v1/cases/{self.case.id}/documents/archive/'
+
+    def _archive(self):
+        """Download the archive and return it as an open ZipFile."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertTrue(response.streaming)
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_archive_contains_all_documents(self):
+        """Test that every document file is in the archive."""
+        archive = self._archive()
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.read('demanda.pdf'), self.files['demanda.pdf'])
+        self.assertEqual(archive.read('notas.txt'), self.files['notas.txt'])
+
+    def test_compressed_formats_are_stored(self):
+        """Test that PDFs are stored and text files deflated."""
+        archive = self._archive()
+        self.assertEqual(archive.getinfo('demanda.pdf').compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo('notas.txt').compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_duplicate_titles_get_unique_names(self):
+        """Test that documents with the same title do not overwrite each other."""
+        Document.objects.create(
+            case=self.case,
+            title='demanda',
+            document_type='demanda',
+            file=SimpleUploadedFile('otra.pdf', b'%PDF-1.4\notra'),
+        )
+        archive = self._archive()
+        self.assertIn('demanda-2.pdf', archive.namelist())
+
+    def test_unreadable_file_left_out(self):
+        """Test that a document whose file is missing is skipped and the archive stays valid."""
+        missing = Document.objects.get(title='notas')
+        missing.file.storage.delete(missing.file.name)
+        with self.assertLogs('documents.archive', level='ERROR'):
+            archive = self._archive()
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.namelist(), ['demanda.pdf'])
+
+    def test_confidential_documents_excluded(self):
+        """Test that confidential documents of other users are left out."""
+        Document.objects.create(
+            case=self.case,
+            title='secreto',
+            document_type='otro',
+            file=SimpleUploadedFile('secreto.pdf', b'%PDF-1.4\nsecreto'),
+            uploaded_by=self.other,
+            is_confidential=True
+        )
+        archive = self._archive()
+        self.assertNotIn('secreto.pdf', archive.namelist())
+
+    def test_archive_unauthenticated(self):
+        """Test that unauthenticated users cannot download the archive."""
+        self.client.credentials()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
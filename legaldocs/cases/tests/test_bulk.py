@@ -0,0 +1,195 @@
+"""
+Tests for the bulk update of cases.
+
+Tests PATCH /api/v1/cases/bulk/ by ID and by filter, the maintenance of
+closed_date and updated_at, and the invalidation of ETags and the change log.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.models import Change
+
+
+class CaseBulkUpdateTests(APITestCase):
+    """Tests for PATCH /api/v1/cases/bulk/."""
+
+    def setUp(self):
+        """Create a lawyer, a client with three cases, and authenticate."""
+        self.user = User.objects.create_user(username='bulkuser', password='testpass123')
+        self.lawyer = User.objects.create_user(username='abogado', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.client_obj = Client.objects.create(
+            full_name='Cliente Masivo',
+            identification_number='BULK001',
+            email='bulk@example.com',
+            phone='555-0000'
+        )
+        self.closed_on = datetime.date(2024, 1, 15)
+        self.open1 = self.create_case('Abierto 1', status='en_proceso')
+        self.open2 = self.create_case('Abierto 2', status='en_revision', case_type='penal')
+        self.closed = self.create_case('Cerrado', status='cerrado', closed_date=self.closed_on)
+
+    def create_case(self, title, **fields):
+        """Create a case of the test client."""
+        fields.setdefault('case_type', 'civil')
+        return Case.objects.create(
+            client=self.client_obj,
+            title=title,
+            description='Test',
+            start_date=timezone.now().date(),
+            **fields
+        )
+
+    def bulk(self, body):
+        """PATCH the bulk endpoint and return the response."""
+        return self.client.patch('/api/v1/cases/bulk/', body, format='json')
+
+    def test_update_by_ids(self):
+        """Test that the selected cases are updated, with a result per requested ID."""
+        response = self.bulk({
+            'ids': [self.open1.id, self.open2.id, 999999],
+            'data': {'assigned_to': self.lawyer.id, 'priority': 'urgente'},
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(response.data['results'], [
+            {'id': self.open1.id, 'result': 'updated'},
+            {'id': self.open2.id, 'result': 'updated'},
+            {'id': 999999, 'result': 'not_found'},
+        ])
+        for case in (self.open1, self.open2):
+            case.refresh_from_db()
+            self.assertEqual(case.assigned_to, self.lawyer)
+            self.assertEqual(case.priority, 'urgente')
+        self.closed.refresh_from_db()
+        self.assertIsNone(self.closed.assigned_to)
+
+    def test_update_by_filter(self):
+        """Test that a filter selects the cases like the list filters do."""
+        response = self.bulk({'filter': {'case_type': 'penal'}, 'data': {'priority': 'baja'}})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'id': self.open2.id, 'result': 'updated'}])
+        self.assertEqual(Case.objects.filter(priority='baja').get(), self.open2)
+
+    def test_close_keeps_existing_closed_date(self):
+        """Test that closing sets closed_date on newly closed cases only."""
+        ids = [self.open1.id, self.closed.id]
+        self.bulk({'ids': ids, 'data': {'status': 'cerrado'}})
+        self.open1.refresh_from_db()
+        self.closed.refresh_from_db()
+        self.assertEqual(self.open1.status, 'cerrado')
+        self.assertEqual(self.open1.closed_date, timezone.now().date())
+        self.assertEqual(self.closed.closed_date, self.closed_on)
+
+    def test_reopen_keeps_closed_date(self):
+        """Test that moving a closed case to another status keeps closed_date."""
+        self.bulk({'ids': [self.closed.id], 'data': {'status': 'en_revision'}})
+        self.closed.refresh_from_db()
+        self.assertEqual(self.closed.status, 'en_revision')
+        self.assertEqual(self.closed.closed_date, self.closed_on)
+
+    def test_single_reopen_keeps_closed_date(self):
+        """Test that a single PATCH to another status keeps closed_date, like the bulk update."""
+        response = self.client.patch(
+            f'/api/v1/cases/{self.closed.id}/', {'status': 'en_revision'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.closed.refresh_from_db()
+        self.assertEqual(self.closed.status, 'en_revision')
+        self.assertEqual(self.closed.closed_date, self.closed_on)
+
+    def test_updated_at(self):
+        """Test that updated_at is set on the updated cases only."""
+        before, other = self.open1.updated_at, self.open2.updated_at
+        self.bulk({'ids': [self.open1.id], 'data': {'priority': 'baja'}})
+        self.open1.refresh_from_db()
+        self.open2.refresh_from_db()
+        self.assertGreater(self.open1.updated_at, before)
+        self.assertEqual(self.open2.updated_at, other)
+
+    def test_invalidates_etags(self):
+        """Test that list and detail ETags change after a bulk update."""
+        list_etag = self.client.get('/api/v1/cases/')['ETag']
+        detail_etag = self.client.get(f'/api/v1/cases/{self.open1.id}/')['ETag']
+        self.bulk({'ids': [self.open1.id], 'data': {'priority': 'baja'}})
+        response = self.client.get('/api/v1/cases/', HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(f'/api/v1/cases/{self.open1.id}/', HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['priority'], 'baja')
+
+    def test_logs_changes(self):
+        """Test that each updated case is logged for delta sync."""
+        count = Change.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bulk({'ids': [self.open1.id, self.open2.id], 'data': {'priority': 'baja'}})
+        changes = Change.objects.order_by('id')[count:]
+        self.assertEqual(
+            sorted(change.object_id for change in changes), sorted([self.open1.id, self.open2.id])
+        )
+
+    def test_constant_queries(self):
+        """Test that the number of queries does not grow with the number of cases."""
+        body = {'filter': {'client': str(self.client_obj.id)}, 'data': {'priority': 'baja'}}
+        self.bulk(body)
+        with CaptureQueriesContext(connection) as few:
+            self.bulk(body)
+        for index in range(10):
+            self.create_case(f'Extra {index}')
+        with CaptureQueriesContext(connection) as many:
+            response = self.bulk(body)
+        self.assertEqual(response.data['updated'], 13)
+        self.assertEqual(len(many), len(few))
+
+    @override_settings(BULK_UPDATE_MAX_ROWS=2)
+    def test_max_rows(self):
+        """Test that selections over BULK_UPDATE_MAX_ROWS are rejected without changes."""
+        response = self.bulk({'filter': {'client': str(self.client_obj.id)}, 'data': {'priority': 'baja'}})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+        response = self.bulk({'ids': [1, 2, 3], 'data': {'priority': 'baja'}})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Case.objects.filter(priority='baja').exists())
+
+    def test_invalid_input(self):
+        """Test that malformed selections and values are rejected."""
+        bodies = [
+            {'data': {'priority': 'baja'}},
+            {'ids': [self.open1.id], 'filter': {'status': 'cerrado'}, 'data': {'priority': 'baja'}},
+            {'ids': [], 'data': {'priority': 'baja'}},
+            {'ids': [self.open1.id]},
+            {'ids': [self.open1.id], 'data': {}},
+            {'ids': [self.open1.id], 'data': {'priority': 'inexistente'}},
+            {'ids': [self.open1.id], 'data': {'assigned_to': 999999}},
+            {'filter': {'title': 'Abierto 1'}, 'data': {'priority': 'baja'}},
+            {'filter': {'status': 'inexistente'}, 'data': {'priority': 'baja'}},
+        ]
+        for body in bodies:
+            with self.subTest(body=body):
+                response = self.bulk(body)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Case.objects.filter(priority='baja').exists())
+
+    def test_read_only_fields_ignored(self):
+        """Test that fields outside the bulk fields are not written."""
+        self.bulk({'ids': [self.open1.id], 'data': {'priority': 'baja', 'title': 'Otro'}})
+        self.open1.refresh_from_db()
+        self.assertEqual(self.open1.title, 'Abierto 1')
+
+    def test_requires_authentication(self):
+        """Test that the endpoint requires a token."""
+        self.client.credentials()
+        response = self.bulk({'ids': [self.open1.id], 'data': {'priority': 'baja'}})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
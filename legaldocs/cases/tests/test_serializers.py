@@ -10,6 +10,7 @@ from django.utils import timezone
 from cases.models import Case
 from cases.serializers import CaseDetailSerializer, CaseSerializer
 from clients.models import Client
+from core.testing import use_temporary_media_root
 
 
 class CaseSerializerTests(TestCase):
@@ -17,6 +18,7 @@ class CaseSerializerTests(TestCase):
 
     def setUp(self):
         """Create test client for case relationships."""
+        use_temporary_media_root(self)
         self.client_obj = Client.objects.create(
             full_name='Serializer Test Client',
             identification_number='SERTC001',
@@ -110,6 +112,7 @@ class CaseDetailSerializerTests(TestCase):
 
     def setUp(self):
         """Create test client for case relationships."""
+        use_temporary_media_root(self)
         self.client_obj = Client.objects.create(
             full_name='Detail Serializer Client',
             identification_number='DETSRC001',
@@ -57,7 +57,7 @@ class CaseViewSetTests(APITestCase):
         """Test listing all cases."""
         response = self.client.get('/api/v1/cases/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_create_case(self):
         """Test creating a new case."""
@@ -114,39 +114,39 @@ class CaseViewSetTests(APITestCase):
         """Test filtering cases by status."""
         response = self.client.get('/api/v1/cases/?status=en_proceso')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['title'], 'Civil Case')
 
     def test_filter_by_case_type(self):
         """Test filtering cases by case_type."""
         response = self.client.get('/api/v1/cases/?case_type=penal')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['title'], 'Penal Case')
 
     def test_filter_by_priority(self):
         """Test filtering cases by priority."""
         response = self.client.get('/api/v1/cases/?priority=alta')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_filter_by_client(self):
         """Test filtering cases by client ID."""
         response = self.client.get(f'/api/v1/cases/?client={self.client_obj.id}')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_search_by_title(self):
         """Test searching cases by title."""
         response = self.client.get('/api/v1/cases/?search=Civil')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_search_by_case_number(self):
         """Test searching cases by case_number."""
         response = self.client.get(f'/api/v1/cases/?search={self.case1.case_number}')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_close_case_action(self):
         """Test the close custom action."""
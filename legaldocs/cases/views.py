@@ -6,22 +6,40 @@ Provides CaseViewSet with:
 - Filtering by status, case_type, priority, client
 - Search by case_number, title, client__full_name
 - Ordering by start_date, priority, created_at
-- Custom actions: close (mark case as closed), statistics (aggregate counts)
+- Custom actions: close (mark case as closed), statistics (aggregate counts),
+  documents/archive (streaming ZIP of the case's documents), bulk (update
+  many cases at once)
 """
 
-from django.db.models import Count
+from django.conf import settings
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.http import content_disposition_header
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
+from api.conditional import ConditionalGetMixin
+from api.fast_serializers import FastListMixin
+from api.negotiation import FileDownloadContentNegotiation
+from api.permissions import can_access_document_file
+from api.renderers import NativeDatesMixin
+from api.sparse_fields import SparseFieldsMixin
+from documents.archive import stream_documents_zip
+from documents.models import Document
+
+from .bulk import bulk_update_cases
 from .models import Case
-from .serializers import CaseDetailSerializer, CaseSerializer
+from .serializers import CaseBulkUpdateSerializer, CaseDetailSerializer, CaseListSerializer, CaseSerializer
 
 
-class CaseViewSet(viewsets.ModelViewSet):
+class CaseViewSet(
+    ConditionalGetMixin, NativeDatesMixin, SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for Case CRUD operations.
 
@@ -39,24 +57,86 @@ class CaseViewSet(viewsets.ModelViewSet):
     Ordering:
         - start_date, priority, created_at (default: -start_date)
 
+    The list action is served by CaseListSerializer (values_list() rows,
+    same output as CaseSerializer).
+
+    Sparse fieldsets:
+        - ?fields=a,b / ?omit=c on list and retrieve trim the response and
+          the columns and joins that are queried
+
+    MessagePack:
+        - Accept: application/msgpack sends dates and datetimes as native
+          MessagePack values (NativeDatesMixin)
+
+    Conditional GET:
+        - list and retrieve send an ETag and answer 304 Not Modified to a
+          matching If-None-Match (ConditionalGetMixin)
+
     Custom Actions:
         - close: POST /cases/{id}/close/ - Marks the case as closed
         - statistics: GET /cases/statistics/ - Returns aggregate case statistics
+        - bulk: PATCH /cases/bulk/ - Sets the same values on the cases selected
+          by ID or by filter, in one UPDATE statement
+        - archive: GET /cases/{id}/documents/archive/ - Streams a ZIP with all
+          documents of the case the user may access
     """
 
     queryset = Case.objects.select_related('client', 'assigned_to')
+    fast_list_serializer_class = CaseListSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'case_type', 'priority', 'client']
     search_fields = ['case_number', 'title', 'client__full_name']
     ordering_fields = ['start_date', 'priority', 'created_at']
     ordering = ['-start_date']
 
+    def get_queryset(self):
+        """
+        Return the queryset for the current action.
+
+        The detail serializer nests every document with its uploader, so
+        retrieve prefetches them in one query (the documents' case is the
+        case being retrieved and needs no query).
+        """
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            fields = self.get_response_fields()
+            if fields is None or 'documents' in fields:
+                queryset = queryset.prefetch_related(
+                    Prefetch('documents', queryset=Document.objects.select_related('uploaded_by'))
+                )
+        return queryset
+
+    def get_etag_models(self):
+        """Return the related models read by the current action (retrieve nests documents)."""
+        if self.action == 'retrieve':
+            return ['clients.Client', 'documents.Document', 'auth.User']
+        return ['clients.Client']
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'retrieve':
             return CaseDetailSerializer
+        if self.action == 'bulk_update':
+            return CaseBulkUpdateSerializer
         return CaseSerializer
 
+    def get_bulk_queryset(self, filters: dict):
+        """
+        Return the cases matching the filters of a bulk update.
+
+        The filters are the list action's filterset fields; unknown fields
+        are rejected rather than ignored, so a typo cannot select every case.
+        """
+        unknown = sorted(set(filters) - set(self.filterset_fields))
+        if unknown:
+            raise ValidationError({'filter': f"Filtros no admitidos: {', '.join(unknown)}."})
+        queryset = Case.objects.all()
+        filterset_class = DjangoFilterBackend().get_filterset_class(self, queryset)
+        filterset = filterset_class(data=filters, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise ValidationError({'filter': filterset.errors})
+        return filterset.qs
+
     @action(detail=True, methods=['post'])
     def close(self, request, pk=None):
         """
@@ -81,6 +161,47 @@ class CaseViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(case)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk_update(self, request):
+        """
+        Update many cases with the same values.
+
+        Body: {"ids": [1, 2]} or {"filter": {"status": "en_proceso"}}, plus
+        {"data": {...}} with any of status, priority, assigned_to and
+        deadline. All cases are updated in one transaction; closed_date and
+        updated_at are maintained as by save() and the close action.
+
+        Returns:
+            - 200 OK with the number of updated cases and a result per ID
+              ("updated", or "not_found" for requested IDs that do not exist)
+            - 400 Bad Request if the input is invalid or selects more than
+              BULK_UPDATE_MAX_ROWS cases
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.get('ids')
+        if ids is not None:
+            queryset = Case.objects.filter(pk__in=ids)
+        else:
+            queryset = self.get_bulk_queryset(serializer.validated_data['filter'])
+
+        try:
+            updated = bulk_update_cases(
+                queryset, serializer.validated_data['data'], settings.BULK_UPDATE_MAX_ROWS
+            )
+        except ValueError:
+            return Response(
+                {'error': f'La selección supera el máximo de {settings.BULK_UPDATE_MAX_ROWS} casos.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        found = set(updated)
+        results = [
+            {'id': pk, 'result': 'updated' if pk in found else 'not_found'}
+            for pk in (ids if ids is not None else updated)
+        ]
+        return Response({'updated': len(updated), 'results': results})
+
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
@@ -102,3 +223,37 @@ class CaseViewSet(viewsets.ModelViewSet):
             'by_priority': {item['priority']: item['count'] for item in priority_counts},
             'total': Case.objects.count(),
         })
+
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='documents/archive',
+        content_negotiation_class=FileDownloadContentNegotiation,
+    )
+    def archive(self, request, pk=None):
+        """
+        Stream a ZIP archive with the files of all documents of the case.
+
+        The archive is generated while it is sent, so the download starts
+        immediately and memory use stays constant. Confidential documents
+        the user may not access are left out.
+        """
+        case = self.get_object()
+        documents = (
+            case.documents.select_related('case')
+            .order_by('uploaded_at', 'id')
+            .iterator(chunk_size=100)
+        )
+        allowed = (
+            document for document in documents
+            if can_access_document_file(request.user, document)
+        )
+
+        response = StreamingHttpResponse(
+            stream_documents_zip(allowed),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = content_disposition_header(
+            True, f'{case.case_number}.zip'
+        )
+        return response
@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.utils import timezone
+
+from core.signals import rows_updated
 
 from .models import Client
 
@@ -46,11 +49,16 @@ class ClientAdmin(admin.ModelAdmin):
     @admin.action(description="Activar clientes seleccionados")
     def activate_clients(self, request, queryset):
         """Bulk action to activate selected clients."""
-        updated = queryset.update(is_active=True)
+        pks = list(queryset.values_list('pk', flat=True))
+        updated = Client.objects.filter(pk__in=pks).update(is_active=True, updated_at=timezone.now())
+        # update() sends no signals: invalidate cached counts and ETags, log the changes
+        rows_updated(Client, pks)
         self.message_user(request, f"{updated} cliente(s) activado(s).")
 
     @admin.action(description="Desactivar clientes seleccionados")
     def deactivate_clients(self, request, queryset):
         """Bulk action to deactivate selected clients."""
-        updated = queryset.update(is_active=False)
+        pks = list(queryset.values_list('pk', flat=True))
+        updated = Client.objects.filter(pk__in=pks).update(is_active=False, updated_at=timezone.now())
+        rows_updated(Client, pks)
         self.message_user(request, f"{updated} cliente(s) desactivado(s).")
@@ -51,6 +51,10 @@ class Client(models.Model):
         ordering = ['-created_at']
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
+        indexes = [
+            # Keyset pagination over the default ordering (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='client_created_id_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"{self.full_name} ({self.identification_number})"
@@ -1,13 +1,16 @@
 """
 Serializers for the Client model.
 
-Provides two serializers:
+Provides three serializers:
 - ClientSerializer: For list views (excludes notes field for performance)
 - ClientDetailSerializer: For detail views (includes notes and computed case_count)
+- ClientListSerializer: Fast read-only equivalent of ClientSerializer for the list action
 """
 
 from rest_framework import serializers
 
+from api.fast_serializers import FastListSerializer
+
 from .models import Client
 
 
@@ -63,5 +66,17 @@ class ClientDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
     def get_case_count(self, obj):
-        """Return the number of cases associated with this client."""
-        return obj.cases.count()
+        """
+        Return the number of cases associated with this client.
+
+        Uses the case_count annotation added by ClientViewSet when present,
+        and counts with a query otherwise.
+        """
+        case_count = getattr(obj, 'case_count', None)
+        return obj.cases.count() if case_count is None else case_count
+
+
+class ClientListSerializer(FastListSerializer):
+    """Fast list representation, identical to ClientSerializer."""
+
+    serializer_class = ClientSerializer
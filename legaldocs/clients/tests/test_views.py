@@ -4,6 +4,8 @@ Tests for ClientViewSet.
 Tests CRUD operations, filtering, search, and custom actions.
 """
 
+import json
+
 from django.contrib.auth.models import User
 from django.utils import timezone
 from rest_framework import status
@@ -46,7 +48,7 @@ class ClientViewSetTests(APITestCase):
         """Test listing all clients."""
         response = self.client.get('/api/v1/clients/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_create_client(self):
         """Test creating a new client."""
@@ -99,33 +101,33 @@ class ClientViewSetTests(APITestCase):
         """Test filtering clients by is_active status."""
         response = self.client.get('/api/v1/clients/?is_active=true')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['full_name'], 'Juan García')
 
         response = self.client.get('/api/v1/clients/?is_active=false')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['full_name'], 'María López')
 
     def test_search_by_full_name(self):
         """Test searching clients by full_name."""
         response = self.client.get('/api/v1/clients/?search=García')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['full_name'], 'Juan García')
 
     def test_search_by_email(self):
         """Test searching clients by email."""
         response = self.client.get('/api/v1/clients/?search=maria@')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['full_name'], 'María López')
 
     def test_search_by_identification_number(self):
         """Test searching clients by identification_number."""
         response = self.client.get('/api/v1/clients/?search=JG001')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_ordering_by_full_name(self):
         """Test ordering clients by full_name."""
@@ -146,8 +148,9 @@ class ClientViewSetTests(APITestCase):
         )
         response = self.client.get(f'/api/v1/clients/{self.client1.id}/cases/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Test Case')
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['title'], 'Test Case')
 
 
 class ClientViewSetUnauthenticatedTests(APITestCase):
@@ -9,17 +9,26 @@ Provides ClientViewSet with:
 - Custom action to retrieve a client's cases
 """
 
+from django.db.models import Count
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
+from api.conditional import ConditionalGetMixin
+from api.fast_serializers import FastListMixin
+from api.renderers import NativeDatesMixin, wants_native_dates
+from api.sparse_fields import SparseFieldsMixin
+from api.streaming import StreamingJSONResponse
+
 from .models import Client
-from .serializers import ClientDetailSerializer, ClientSerializer
+from .serializers import ClientDetailSerializer, ClientListSerializer, ClientSerializer
 
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(
+    ConditionalGetMixin, NativeDatesMixin, SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for Client CRUD operations.
 
@@ -34,17 +43,48 @@ class ClientViewSet(viewsets.ModelViewSet):
     Ordering:
         - full_name, created_at (default: -created_at)
 
+    The list action is served by ClientListSerializer (values_list() rows,
+    same output as ClientSerializer).
+
+    Sparse fieldsets:
+        - ?fields=a,b / ?omit=c on list and retrieve trim the response and
+          the columns and joins that are queried
+
+    MessagePack:
+        - Accept: application/msgpack sends dates and datetimes as native
+          MessagePack values (NativeDatesMixin)
+
+    Conditional GET:
+        - list and retrieve send an ETag and answer 304 Not Modified to a
+          matching If-None-Match (ConditionalGetMixin)
+
     Custom Actions:
-        - cases: GET /clients/{id}/cases/ - Returns all cases for the client
+        - cases: GET /clients/{id}/cases/ - Streams all cases for the client
     """
 
     queryset = Client.objects.all()
+    fast_list_serializer_class = ClientListSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active']
     search_fields = ['full_name', 'email', 'identification_number']
     ordering_fields = ['full_name', 'created_at']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        """Return the queryset for the current action (retrieve annotates case_count)."""
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            fields = self.get_response_fields()
+            if fields is None or 'case_count' in fields:
+                queryset = queryset.annotate(case_count=Count('cases'))
+        return queryset
+
+    def get_etag_models(self):
+        """Return the related models read by the current action (retrieve counts cases)."""
+        if self.action == 'retrieve':
+            return ['cases.Case']
+        return []
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'retrieve':
@@ -56,11 +96,18 @@ class ClientViewSet(viewsets.ModelViewSet):
         """
         Get all cases for a specific client.
 
-        Returns a list of cases associated with this client.
+        Returns a list of cases associated with this client, with the
+        fields of CaseSerializer. JSON responses are streamed in chunks,
+        so clients with thousands of cases do not build the whole list in
+        memory.
         """
-        from cases.serializers import CaseSerializer
+        from cases.serializers import CaseListSerializer
 
         client = self.get_object()
-        cases = client.cases.all()
-        serializer = CaseSerializer(cases, many=True)
-        return Response(serializer.data)
+        fast = CaseListSerializer(
+            context=self.get_serializer_context(), native_dates=wants_native_dates(request)
+        )
+        rows = client.cases.values_list(*fast.columns)
+        if request.accepted_renderer.format == 'json':
+            return StreamingJSONResponse(rows, fast.serialize, request.accepted_renderer)
+        return Response(fast.serialize(rows))
@@ -1,2 +1,49 @@
+from django.contrib import admin
+from django.utils import timezone
 
-# Register your models here.
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin configuration for the background job queue."""
+
+    list_display = [
+        'id',
+        'task',
+        'status',
+        'priority',
+        'attempts',
+        'run_at',
+        'created_at',
+        'finished_at',
+    ]
+    list_filter = [
+        'status',
+        'task',
+    ]
+    search_fields = [
+        'task',
+        'locked_by',
+    ]
+    readonly_fields = [
+        'attempts',
+        'locked_at',
+        'locked_by',
+        'last_error',
+        'created_at',
+        'finished_at',
+    ]
+    ordering = ['-created_at']
+    actions = ['retry_jobs']
+
+    @admin.action(description="Reintentar tareas seleccionadas")
+    def retry_jobs(self, request, queryset):
+        """Put failed jobs back in the queue with a fresh set of attempts."""
+        updated = queryset.filter(status='failed').update(
+            status='pending',
+            attempts=0,
+            run_at=timezone.now(),
+            finished_at=None,
+        )
+        self.message_user(request, f"{updated} tarea(s) reencolada(s).")
@@ -1,6 +1,21 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        """Connect the signal handlers to the models they track."""
+        from . import signals
+
+        for label in getattr(settings, 'CACHE_GENERATION_MODELS', ()):
+            model = apps.get_model(label)
+            post_save.connect(signals.bump_write_generation, sender=model)
+            post_delete.connect(signals.bump_write_generation, sender=model)
+        for label in getattr(settings, 'SYNC_MODELS', {}).values():
+            model = apps.get_model(label)
+            post_save.connect(signals.log_sync_change, sender=model)
+            post_delete.connect(signals.log_sync_change, sender=model)
@@ -2,14 +2,20 @@
 Cache utilities for the LegalDocs application.
 
 Provides helper functions for caching dashboard statistics
-and other frequently accessed data.
+and other frequently accessed data, and per-table write generations for
+cache invalidation.
 """
 
+import time
 from functools import wraps
 from typing import Any, Callable, Optional
 
+from django.apps import apps
+from django.conf import settings
 from django.core.cache import cache
 
+from .db.routers import reads_replica, use_primary
+
 
 # Default cache timeout: 5 minutes (300 seconds)
 DASHBOARD_CACHE_TIMEOUT = 300
@@ -18,34 +24,47 @@ DASHBOARD_CACHE_TIMEOUT = 300
 DASHBOARD_CACHE_KEY = 'dashboard_stats'
 
 
-def get_dashboard_stats() -> Optional[dict]:
+def _dashboard_cache_key(version: str) -> str:
+    """Return the cache key of the dashboard statistics for a data version."""
+    return f'{DASHBOARD_CACHE_KEY}:{version}' if version else DASHBOARD_CACHE_KEY
+
+
+def get_dashboard_stats(version: str = '') -> Optional[dict]:
     """
     Retrieve cached dashboard statistics.
 
+    Args:
+        version: Version of the underlying data (e.g. the dashboard ETag);
+            stats cached for another version are not returned.
+
     Returns:
         dict: Cached dashboard stats, or None if not cached.
     """
-    return cache.get(DASHBOARD_CACHE_KEY)
+    return cache.get(_dashboard_cache_key(version))
 
 
-def set_dashboard_stats(stats: dict, timeout: int = DASHBOARD_CACHE_TIMEOUT) -> None:
+def set_dashboard_stats(stats: dict, timeout: int = DASHBOARD_CACHE_TIMEOUT, version: str = '') -> None:
     """
     Cache dashboard statistics.
 
     Args:
         stats: Dictionary of dashboard statistics to cache.
         timeout: Cache timeout in seconds (default: 5 minutes).
+        version: Version of the underlying data the stats were computed from.
     """
-    cache.set(DASHBOARD_CACHE_KEY, stats, timeout)
+    cache.set(_dashboard_cache_key(version), stats, timeout)
 
 
-def invalidate_dashboard_stats() -> None:
+def invalidate_dashboard_stats(version: str = '') -> None:
     """
     Invalidate cached dashboard statistics.
 
     Call this when data changes that would affect dashboard stats.
+
+    Args:
+        version: Version of the cached stats to invalidate.
     """
-    cache.delete(DASHBOARD_CACHE_KEY)
+    cache.delete(_dashboard_cache_key(version))
 
 
 def cached_view(cache_key: str, timeout: int = 300) -> Callable:
@@ -76,3 +95,75 @@ def cached_view(cache_key: str, timeout: int = 300) -> Callable:
             return response
         return wrapper
     return decorator
+
+
+# =============================================================================
+# Write generations
+# =============================================================================
+
+GENERATION_KEY = 'generation:{table}'
+
+# Set for REPLICA_PIN_SECONDS after each new generation of a table, while
+# read replicas may not have replayed the write yet (core.db.routers)
+RECENT_WRITE_KEY = 'generation:recent_write:{table}'
+
+
+def tracked_tables() -> set:
+    """Return the database tables of the models in CACHE_GENERATION_MODELS."""
+    return {
+        apps.get_model(label)._meta.db_table
+        for label in getattr(settings, 'CACHE_GENERATION_MODELS', ())
+    }
+
+
+def get_generations(tables) -> dict:
+    """
+    Return the current write generation of each table.
+
+    A generation changes whenever a row of the table is saved or deleted
+    through the ORM (see core.signals), so cache keys that include the
+    generations of the tables they read are invalidated by any write.
+    Missing generations are created from the clock, never restarted at a
+    value an evicted key may have had.
+
+    In a request reading from a read replica, if one of the tables was
+    written within REPLICA_PIN_SECONDS the rest of the request reads from
+    the primary: data read from a replica that has not replayed the write
+    must not be cached or tagged under the new generation.
+
+    Args:
+        tables: Database table names.
+
+    Returns:
+        dict: Generation by table name.
+    """
+    keys = {GENERATION_KEY.format(table=table): table for table in tables}
+    recent_keys = [RECENT_WRITE_KEY.format(table=table) for table in tables] if reads_replica() else []
+    found = cache.get_many([*keys, *recent_keys])
+    if any(key in found for key in recent_keys):
+        use_primary()
+    generations = {keys[key]: value for key, value in found.items() if key in keys}
+    for key, table in keys.items():
+        if table not in generations:
+            value = time.time_ns()
+            generations[table] = value if cache.add(key, value, None) else cache.get(key)
+    return generations
+
+
+def bump_generation(table: str) -> None:
+    """
+    Start a new write generation for a table.
+
+    The new generation is taken from the clock rather than incremented:
+    cache.incr() reads and writes separately on most backends, so two
+    concurrent writers could both store the same next value, while each
+    reads its own clock.
+
+    Args:
+        table: Database table name of the written model.
+    """
+    key = GENERATION_KEY.format(table=table)
+    current = cache.get(key) or 0
+    cache.set(key, max(current + 1, time.time_ns()), None)
+    if getattr(settings, 'REPLICA_DATABASES', None):
+        cache.set(RECENT_WRITE_KEY.format(table=table), 1, getattr(settings, 'REPLICA_PIN_SECONDS', 15))
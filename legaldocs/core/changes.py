@@ -0,0 +1,68 @@
+"""
+Change log of the synced models.
+
+Every save and delete of a model in settings.SYNC_MODELS appends a Change
+row (an upsert or a tombstone) that /api/v1/sync/ serves to clients in
+sequence order, so they only fetch what changed since their last sync.
+
+Entries are written once the write commits, one transaction at a time
+(on PostgreSQL under an advisory lock), so sequence numbers are assigned
+and become visible in commit order. Writes that bypass signals
+(QuerySet.update(), bulk_create()) must call record_changes() themselves.
+Rows that existed before the change log was added are logged as upserts by
+migration core 0003, so a first sync returns them.
+"""
+
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+
+# pg_advisory_xact_lock() key serializing change log inserts
+CHANGE_LOG_LOCK = 0x5C4A4E47
+
+
+def sync_type(model) -> Optional[str]:
+    """Return the sync type name of a model (e.g. 'case'), or None if it is not synced."""
+    label = model._meta.label
+    for name, synced_label in getattr(settings, 'SYNC_MODELS', {}).items():
+        if synced_label == label:
+            return name
+    return None
+
+
+def _insert_changes(object_type: str, pks, operation: str, using: str) -> None:
+    """Insert change log entries in their own transaction, serialized with other inserts."""
+    from .models import Change
+
+    with transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == 'postgresql':
+            # Sequence numbers are drawn and committed while holding the lock
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CHANGE_LOG_LOCK])
+        Change.objects.using(using).bulk_create([
+            Change(object_type=object_type, object_id=pk, operation=operation)
+            for pk in pks
+        ])
+
+
+def record_changes(model, pks, operation: str, using: str = 'default') -> None:
+    """
+    Record writes to rows of a synced model.
+
+    Args:
+        model: The written model class (ignored if it is not synced).
+        pks: Primary keys of the written rows.
+        operation: Change.UPSERT or Change.DELETE.
+        using: Database alias of the write.
+    """
+    object_type = sync_type(model)
+    pks = list(pks)
+    if object_type is None or not pks:
+        return
+    # Runs immediately outside atomic blocks, otherwise after the commit; a
+    # failure is logged rather than failing a request whose write committed
+    transaction.on_commit(
+        lambda: _insert_changes(object_type, pks, operation, using), using=using, robust=True
+    )
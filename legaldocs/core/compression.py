@@ -0,0 +1,194 @@
+"""
+Content codings for response compression.
+
+Provides gzip (standard library), brotli and zstd (optional packages
+``brotli`` and ``zstandard``) behind a common interface, Accept-Encoding
+negotiation, and a size-bounded LRU of compressed bodies so that a hot
+response (e.g. the cached dashboard) is compressed once, not on every hit.
+"""
+
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional coding
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional coding
+    zstandard = None
+
+
+class GzipCodec:
+    """gzip coding (zlib with a gzip header)."""
+
+    name = 'gzip'
+    available = True
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def _compressobj(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a whole body."""
+        compressor = self._compressobj()
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks):
+        """Compress an iterable of chunks, flushing after each one."""
+        compressor = self._compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class BrotliCodec:
+    """brotli coding (requires the brotli package)."""
+
+    name = 'br'
+    available = brotli is not None
+
+    def __init__(self, level: int = 5):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a whole body."""
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self, chunks):
+        """Compress an iterable of chunks, flushing after each one."""
+        compressor = brotli.Compressor(quality=self.level)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class ZstdCodec:
+    """zstd coding (requires the zstandard package)."""
+
+    name = 'zstd'
+    available = zstandard is not None
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a whole body."""
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self, chunks):
+        """Compress an iterable of chunks, flushing after each one."""
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+CODECS = {codec.name: codec for codec in (GzipCodec, BrotliCodec, ZstdCodec)}
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """
+    Parse an Accept-Encoding header.
+
+    Returns:
+        dict: Quality value by coding name (lowercase), '*' included.
+    """
+    qualities = {}
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def negotiate_encoding(header: str, preference) -> str:
+    """
+    Choose the content coding for a response.
+
+    Args:
+        header: The request's Accept-Encoding header.
+        preference: Available coding names, preferred first.
+
+    Returns:
+        str: The coding with the highest quality (ties go to the server's
+        preference), or None to send the body uncompressed.
+    """
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for name in preference:
+        quality = qualities.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressedCache:
+    """
+    Thread-safe LRU of compressed bodies, bounded by their total size.
+
+    Keys are the coding and a digest of the uncompressed body, so any
+    response whose content repeats byte for byte is served from here.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(encoding: str, body: bytes):
+        """Return the cache key of a body in a coding."""
+        return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key):
+        """Return the cached compressed body, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value: bytes) -> None:
+        """Store a compressed body, evicting the least recently used ones."""
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
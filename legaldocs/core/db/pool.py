@@ -0,0 +1,136 @@
+"""
+In-process database connection pool.
+
+A process keeps up to max_size open connections per database and hands
+them to whichever thread needs one: a request borrows a connection when
+it runs its first query and gives it back when Django closes the
+connection at the end of the request. Unlike persistent connections
+(CONN_MAX_AGE), which stay tied to the thread that opened them, pooled
+connections are shared by all threads, so a threaded or ASGI server needs
+fewer of them and no request pays for connecting once the pool is warm.
+
+The pool does not depend on the database driver: the backend supplies how
+to open, check and reset a connection (core.db.postgresql_pool).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool's timeout."""
+
+
+class ConnectionPool:
+    """
+    A bounded LIFO pool of open connections.
+
+    Idle connections are reused most recently returned first, so the
+    least used ones reach max_idle and are closed when traffic drops.
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_idle: float = 600.0,
+        check: Optional[Callable] = None,
+        reset: Optional[Callable] = None,
+    ):
+        """
+        Args:
+            connect: Opens a new connection.
+            max_size: Maximum connections open at once, idle or borrowed.
+            timeout: Seconds getconn() waits for a connection when all are borrowed.
+            max_idle: Seconds after which an idle connection is closed instead of reused.
+            check: Returns whether an idle connection still works (health check
+                on checkout); None to skip the check.
+            reset: Returns a connection to a clean state before it goes back to
+                the pool; returns False if it must be discarded instead.
+        """
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check = check
+        self.reset = reset
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        """
+        Borrow a connection, reusing an idle one or opening a new one.
+
+        Raises:
+            PoolTimeout: If max_size connections stay borrowed for timeout seconds.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f'No database connection available after {self.timeout}s')
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    connection, returned_at = self._idle.pop()
+                if time.monotonic() - returned_at > self.max_idle:
+                    self._discard(connection)
+                elif self.check is None or self.check(connection):
+                    return connection
+                else:
+                    self._discard(connection)
+            return self.connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection, discard: bool = False) -> None:
+        """
+        Give a borrowed connection back.
+
+        Args:
+            connection: The connection returned by getconn().
+            discard: Close the connection instead of keeping it.
+        """
+        try:
+            if discard or (self.reset is not None and not self.reset(connection)):
+                self._discard(connection)
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+        self._close_expired()
+
+    def idle_count(self) -> int:
+        """Return the number of idle connections."""
+        with self._lock:
+            return len(self._idle)
+
+    def _close_expired(self) -> None:
+        """Close the connections idle for longer than max_idle (the oldest, at the left)."""
+        deadline = time.monotonic() - self.max_idle
+        expired = []
+        with self._lock:
+            while self._idle and self._idle[0][1] < deadline:
+                expired.append(self._idle.popleft()[0])
+        for connection in expired:
+            self._discard(connection)
+
+    def closeall(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection) -> None:
+        """Close a connection, ignoring errors of an already broken one."""
+        try:
+            connection.close()
+        except Exception:
+            pass
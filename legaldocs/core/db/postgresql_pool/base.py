@@ -0,0 +1,121 @@
+"""
+PostgreSQL backend with an in-process connection pool.
+
+Same as django.db.backends.postgresql (psycopg2), except that connections are
+borrowed from a process-wide core.db.pool.ConnectionPool and given back
+to it when Django closes them, at the end of every request. Meant for
+threaded and ASGI servers, where persistent connections (CONN_MAX_AGE)
+stay tied to one thread each.
+
+    DATABASES['default'] = {
+        'ENGINE': 'core.db.postgresql_pool',
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {'pool': {'max_size': 10, 'timeout': 30, 'max_idle': 600}},
+        ...
+    }
+
+With CONN_HEALTH_CHECKS, idle connections are checked with SELECT 1 when
+they are borrowed, so a connection dropped by the server while idle is
+replaced instead of failing the request.
+"""
+
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from core.db.pool import ConnectionPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _check(connection) -> bool:
+    """Return whether a connection still answers queries."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except base.Database.Error:
+        return False
+    return True
+
+
+def _reset(connection) -> bool:
+    """Roll back an open transaction; return False if the connection is unusable."""
+    if connection.closed:
+        return False
+    try:
+        if connection.get_transaction_status() != base.Database.extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+    except base.Database.Error:
+        return False
+    return True
+
+
+def close_pools() -> None:
+    """Close the idle connections of every pool (e.g. before a fork)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.closeall()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL connections borrowed from a shared pool."""
+
+    def __init__(self, settings_dict, alias=DEFAULT_DB_ALIAS):
+        """Reject persistent connections, which would never go back to the pool."""
+        if settings_dict.get('CONN_MAX_AGE'):
+            raise ImproperlyConfigured('Pooled connections require CONN_MAX_AGE = 0.')
+        super().__init__(settings_dict, alias)
+
+    @property
+    def pool_options(self) -> dict:
+        """Return the pool settings of OPTIONS['pool']."""
+        options = self.settings_dict['OPTIONS'].get('pool', {})
+        return options if isinstance(options, dict) else {}
+
+    def get_connection_params(self):
+        """Return the psycopg2 connect() parameters, without the pool settings."""
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_pool(self, conn_params) -> ConnectionPool:
+        """Return the pool of this database, creating it on first use."""
+        # The test runner renames the database: keep one pool per name
+        key = (self.alias, self.settings_dict['NAME'])
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    connect=lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                    check=_check if self.settings_dict['CONN_HEALTH_CHECKS'] else None,
+                    reset=_reset,
+                    **self.pool_options
+                )
+        return pool
+
+    def get_new_connection(self, conn_params):
+        """Borrow a connection from the pool."""
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.getconn()
+        # The parent sets the isolation level only on connections it opens
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        self.isolation_level = (
+            IsolationLevel.READ_COMMITTED if isolation_level is None else IsolationLevel(isolation_level)
+        )
+        return connection
+
+    def _close(self):
+        """
+        Give the connection back to the pool instead of closing it.
+
+        Inside an atomic block Django keeps using the connection object
+        after closing it, so it is closed rather than shared.
+        """
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection, discard=self.in_atomic_block)
@@ -0,0 +1,213 @@
+"""
+Read-replica database routing.
+
+ReplicaRouter sends the reads of safe API requests (GET, HEAD, OPTIONS
+under /api/) to one of the REPLICA_DATABASES and everything else to the
+primary ('default'):
+
+- Only requests marked by core.middleware.ReplicaRoutingMiddleware read
+  from a replica; management commands, the job worker, the admin and
+  writes always use the primary.
+- Read-your-writes: once a request writes, its remaining reads go to the
+  primary, and the client (its Authorization header or session) is pinned
+  to the primary for REPLICA_PIN_SECONDS so that it sees its own writes
+  in the next requests too.
+- Generation-safe: ETags and cached counts pair the current write
+  generations (core.cache) with the data read. While the generation of a
+  table is younger than REPLICA_PIN_SECONDS, a replica may not have its
+  write yet, so requests reading that generation switch to the primary
+  (core.cache.get_generations() calls use_primary()). Requests that do
+  not read it keep reading from the replica.
+- Lag awareness: every REPLICA_LAG_CHECK_INTERVAL seconds each process
+  measures the replication lag of each replica; replicas more than
+  REPLICA_MAX_LAG seconds behind, or unreachable, are skipped until the
+  next check. Without a usable replica, reads go to the primary.
+- Models in REPLICA_PRIMARY_MODELS (the cache table, tokens, sessions,
+  jobs) are always read from the primary: they are written on almost
+  every request, and reading them stale would break authentication or
+  cache invalidation. Writing them does not pin the client.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PIN_CACHE_KEY = 'replica_pin'
+
+
+@dataclass
+class RoutingState:
+    """Replica routing of the current request."""
+
+    use_replica: bool
+    replica: Optional[str] = None
+    wrote: bool = False
+
+
+_state = ContextVar('replica_routing', default=None)
+
+_lag_checks = {}
+_lag_lock = threading.Lock()
+
+
+def replica_aliases() -> list:
+    """Return the configured replica database aliases."""
+    return list(getattr(settings, 'REPLICA_DATABASES', ()))
+
+
+def replica_lag(alias: str) -> Optional[float]:
+    """
+    Return how many seconds a replica is behind the primary.
+
+    On PostgreSQL the lag is the age of the last replayed transaction,
+    or 0 when the replica has replayed everything it received. Other
+    databases have no replication to measure and report 0.
+
+    Returns:
+        float: The lag in seconds, or None if the replica cannot be queried.
+    """
+    connection = connections[alias]
+    try:
+        if connection.vendor != 'postgresql':
+            connection.ensure_connection()
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT CASE WHEN NOT pg_is_in_recovery() '
+                'OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+                'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+            )
+            lag = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    return float(lag) if lag is not None else None
+
+
+def replica_is_usable(alias: str) -> bool:
+    """Return whether a replica is reachable and within REPLICA_MAX_LAG (rechecked periodically)."""
+    now = time.monotonic()
+    interval = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5)
+    with _lag_lock:
+        checked = _lag_checks.get(alias)
+    if checked is not None and now - checked[0] < interval:
+        return checked[1]
+    lag = replica_lag(alias)
+    usable = lag is not None and lag <= getattr(settings, 'REPLICA_MAX_LAG', 5)
+    with _lag_lock:
+        _lag_checks[alias] = (now, usable)
+    return usable
+
+
+def reset_lag_checks() -> None:
+    """Forget the measured replica lags, so that the next read measures them again."""
+    with _lag_lock:
+        _lag_checks.clear()
+
+
+def _pin_key(request) -> Optional[str]:
+    """Return the cache key pinning the request's client, or None for anonymous clients."""
+    credentials = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        return None
+    return f'{PIN_CACHE_KEY}:{hashlib.blake2b(credentials.encode(), digest_size=16).hexdigest()}'
+
+
+def is_pinned(request) -> bool:
+    """Return whether the request's client wrote recently and must read from the primary."""
+    key = _pin_key(request)
+    return key is not None and cache.get(key) is not None
+
+
+def pin(request) -> None:
+    """Pin the request's client to the primary for REPLICA_PIN_SECONDS."""
+    key = _pin_key(request)
+    if key is not None:
+        cache.set(key, 1, getattr(settings, 'REPLICA_PIN_SECONDS', 15))
+
+
+def start_request(request):
+    """
+    Set up the replica routing of a request.
+
+    Returns:
+        The context variable token for end_request(), or None if no
+        replicas are configured.
+    """
+    if not replica_aliases():
+        return None
+    use_replica = (
+        request.method in ('GET', 'HEAD', 'OPTIONS')
+        and request.path_info.startswith('/api/')
+        and not is_pinned(request)
+    )
+    return _state.set(RoutingState(use_replica=use_replica))
+
+
+def end_request(request, token) -> None:
+    """Pin the client if the request wrote, and end its replica routing."""
+    state = _state.get()
+    _state.reset(token)
+    if state is not None and state.wrote:
+        pin(request)
+
+
+def reads_replica() -> bool:
+    """Return whether the current request may still read from a replica."""
+    state = _state.get()
+    return state is not None and state.use_replica and not state.wrote
+
+
+def use_primary() -> None:
+    """Read from the primary for the rest of the current request."""
+    state = _state.get()
+    if state is not None:
+        state.use_replica = False
+
+
+def _is_primary_model(model) -> bool:
+    """Return whether a model is always read from the primary."""
+    # The database cache's stand-in model has no _meta.label
+    label = f'{model._meta.app_label}.{model._meta.object_name}'
+    return label in getattr(settings, 'REPLICA_PRIMARY_MODELS', ())
+
+
+class ReplicaRouter:
+    """Route safe API reads to replicas and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        """Return a usable replica for the reads of a marked request."""
+        # The primary is named explicitly: with None, Django would read related
+        # objects from the database of the instance they are accessed from
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote or _is_primary_model(model):
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            # One replica per request, so that its reads see one snapshot
+            usable = [alias for alias in replica_aliases() if replica_is_usable(alias)]
+            if not usable:
+                state.use_replica = False
+                return DEFAULT_DB_ALIAS
+            state.replica = random.choice(usable)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        """Write to the primary, and read from it for the rest of the request."""
+        state = _state.get()
+        if state is not None and not _is_primary_model(model):
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations between objects of the primary and its replicas."""
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
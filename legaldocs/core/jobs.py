@@ -0,0 +1,288 @@
+"""
+Durable background job queue backed by the database.
+
+Heavy work (thumbnails, text extraction, exports, reindexing) is enqueued
+as a Job row and executed by ``python manage.py run_worker``, so it runs
+off the request path without Redis or Celery.
+
+Usage:
+    from core.jobs import enqueue, task
+
+    @task('documents.generate_thumbnail')
+    def generate_thumbnail(document_id):
+        ...
+
+    enqueue('documents.generate_thumbnail', {'document_id': 42})
+
+Tasks are registered from the ``tasks`` module of each installed app.
+Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL), so
+any number of them can poll the same table without blocking each other;
+on SQLite the claim falls back to a conditional UPDATE. Failed jobs are
+retried with exponential backoff up to max_attempts.
+
+Workers refresh locked_at of the jobs they are running (heartbeat()), so
+only jobs of a worker that died go stale and are requeued, however long a
+job runs. Succeeded jobs are deleted after JOB_RETENTION.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+_discovered = False
+
+
+class UnknownTaskError(LookupError):
+    """Raised when a job refers to a task that is not registered."""
+
+
+def task(name: str) -> Callable:
+    """
+    Decorator that registers a function as a background task.
+
+    Args:
+        name: Unique task name used when enqueueing.
+
+    Returns:
+        Decorator that registers the function and returns it unchanged.
+    """
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name: str) -> Callable:
+    """
+    Return the function registered for a task name.
+
+    Raises:
+        UnknownTaskError: If no task with that name is registered.
+    """
+    global _discovered
+    if name not in _registry and not _discovered:
+        autodiscover_modules('tasks')
+        _discovered = True
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTaskError(name) from None
+
+
+def enqueue(
+    name: str,
+    payload: Optional[dict] = None,
+    priority: int = Job.PRIORITY_NORMAL,
+    delay: float = 0,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """
+    Add a job to the queue.
+
+    The row is written in the current transaction, so the job only becomes
+    visible to workers once the surrounding data is committed.
+
+    Args:
+        name: Registered task name.
+        payload: JSON-serializable keyword arguments for the task.
+        priority: Higher values run first (see Job.PRIORITY_*).
+        delay: Seconds to wait before the job may run.
+        max_attempts: Attempts before giving up (default: JOB_MAX_ATTEMPTS).
+
+    Returns:
+        Job: The created job.
+    """
+    return Job.objects.create(
+        task=name,
+        payload=payload or {},
+        priority=priority,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or getattr(settings, 'JOB_MAX_ATTEMPTS', 5),
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Return the backoff before retrying a job that failed attempts times."""
+    base = getattr(settings, 'JOB_RETRY_BACKOFF', 10)
+    limit = getattr(settings, 'JOB_RETRY_BACKOFF_MAX', 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), limit))
+
+
+def claim(worker_id: str) -> Optional[Job]:
+    """
+    Take the next runnable job and mark it as running.
+
+    Args:
+        worker_id: Identifier stored in Job.locked_by.
+
+    Returns:
+        Job: The claimed job, or None if the queue is empty.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='pending', run_at__lte=now)
+            .order_by('-priority', 'run_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        # Conditional update: on databases without SKIP LOCKED (SQLite) two
+        # workers can select the same row, but only one can flip its status
+        claimed = Job.objects.filter(pk=job.pk, status='pending').update(
+            status='running',
+            attempts=F('attempts') + 1,
+            locked_at=now,
+            locked_by=worker_id,
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job: Job) -> bool:
+    """
+    Execute a claimed job and record the outcome.
+
+    A failing job is rescheduled with exponential backoff until it reaches
+    max_attempts; jobs for unknown tasks fail immediately.
+
+    Args:
+        job: A job returned by claim().
+
+    Returns:
+        bool: True if the task succeeded.
+    """
+    try:
+        func = get_task(job.task)
+        func(**job.payload)
+    except Exception as exc:
+        now = timezone.now()
+        retry = not isinstance(exc, UnknownTaskError) and job.attempts < job.max_attempts
+        logger.warning(
+            'Job %s (%s) failed on attempt %s/%s%s',
+            job.pk, job.task, job.attempts, job.max_attempts,
+            '; retrying' if retry else '',
+            exc_info=True,
+        )
+        Job.objects.filter(pk=job.pk).update(
+            status='pending' if retry else 'failed',
+            run_at=now + retry_delay(job.attempts) if retry else job.run_at,
+            finished_at=None if retry else now,
+            locked_at=None,
+            locked_by='',
+            last_error=traceback.format_exc(),
+        )
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status='succeeded',
+        finished_at=timezone.now(),
+        locked_at=None,
+        locked_by='',
+    )
+    return True
+
+
+def heartbeat(worker_ids) -> int:
+    """
+    Mark the jobs run by live workers as still running.
+
+    Args:
+        worker_ids: Identifiers the workers claim jobs with (Job.locked_by).
+
+    Returns:
+        int: Number of running jobs refreshed.
+    """
+    return Job.objects.filter(status='running', locked_by__in=list(worker_ids)).update(
+        locked_at=timezone.now()
+    )
+
+
+def requeue_stale(timeout: Optional[int] = None) -> int:
+    """
+    Put back jobs whose worker died while running them.
+
+    A job is abandoned when its worker has not refreshed locked_at (see
+    heartbeat()) for timeout seconds. Jobs that already used all their
+    attempts are marked as failed instead.
+
+    Args:
+        timeout: Seconds after which a running job is considered abandoned
+            (default: JOB_LOCK_TIMEOUT).
+
+    Returns:
+        int: Number of jobs requeued.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'JOB_LOCK_TIMEOUT', 600)
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=timeout))
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed',
+        finished_at=now,
+        locked_at=None,
+        locked_by='',
+        last_error='Worker stopped while running the job',
+    )
+    return stale.update(
+        status='pending',
+        locked_at=None,
+        locked_by='',
+    )
+
+
+def delete_finished(retention: Optional[int] = None) -> int:
+    """
+    Delete succeeded jobs older than the retention period.
+
+    Failed jobs are kept, so they can be inspected and retried from the admin.
+
+    Args:
+        retention: Seconds to keep succeeded jobs after they finished
+            (default: JOB_RETENTION).
+
+    Returns:
+        int: Number of jobs deleted.
+    """
+    if retention is None:
+        retention = getattr(settings, 'JOB_RETENTION', 7 * 24 * 3600)
+    cutoff = timezone.now() - timedelta(seconds=retention)
+    deleted, _ = Job.objects.filter(status='succeeded', finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def run_pending(worker_id: str = 'inline', limit: Optional[int] = None) -> int:
+    """
+    Run runnable jobs one after another until the queue is empty.
+
+    Args:
+        worker_id: Identifier stored in Job.locked_by.
+        limit: Maximum number of jobs to run.
+
+    Returns:
+        int: Number of jobs executed.
+    """
+    executed = 0
+    while limit is None or executed < limit:
+        job = claim(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        executed += 1
+    return executed
@@ -0,0 +1,126 @@
+"""
+Management command to run background jobs from the database queue.
+
+Usage:
+    python manage.py run_worker                  # Run until stopped
+    python manage.py run_worker --concurrency 4  # Four worker threads
+    python manage.py run_worker --once           # Drain the queue and exit
+"""
+
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from core.jobs import claim, delete_finished, heartbeat, requeue_stale, run_job, run_pending
+
+
+class Command(BaseCommand):
+    """Execute queued background jobs."""
+
+    help = 'Run background jobs (thumbnails, exports, ...) from the job queue'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'JOB_WORKER_CONCURRENCY', 2),
+            help='Number of jobs executed in parallel',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=getattr(settings, 'JOB_POLL_INTERVAL', 1.0),
+            help='Seconds to wait when the queue is empty',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are ready now and exit',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        worker_name = f'{socket.gethostname()}:{os.getpid()}'
+        requeued = requeue_stale()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} abandoned job(s).'))
+        delete_finished()
+
+        # Refresh running jobs well within JOB_LOCK_TIMEOUT, so that other
+        # workers do not take them for abandoned
+        lock_timeout = getattr(settings, 'JOB_LOCK_TIMEOUT', 600)
+        heartbeat_interval = lock_timeout / 3
+
+        if options['once']:
+            stop = threading.Event()
+            keep_alive = threading.Thread(
+                target=self._keep_alive,
+                args=([worker_name], stop, heartbeat_interval),
+                name='job-heartbeat',
+            )
+            keep_alive.start()
+            try:
+                executed = run_pending(worker_name)
+            finally:
+                stop.set()
+                keep_alive.join()
+            self.stdout.write(self.style.SUCCESS(f'Executed {executed} job(s).'))
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+
+        worker_ids = [f'{worker_name}-{number}' for number in range(max(1, options['concurrency']))]
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(worker_id, stop, options['poll_interval']),
+                name=f'job-worker-{number}',
+            )
+            for number, worker_id in enumerate(worker_ids)
+        ]
+        self.stdout.write(f'Worker {worker_name} started with {len(threads)} thread(s).')
+        for thread in threads:
+            thread.start()
+
+        # Wake up periodically to keep our jobs alive, recover jobs abandoned
+        # by crashed workers and delete old succeeded jobs
+        while not stop.wait(heartbeat_interval):
+            heartbeat(worker_ids)
+            requeue_stale(lock_timeout)
+            delete_finished()
+            close_old_connections()
+
+        self.stdout.write('Stopping; waiting for running jobs to finish...')
+        for thread in threads:
+            thread.join()
+        self.stdout.write(self.style.SUCCESS('Worker stopped.'))
+
+    def _keep_alive(self, worker_ids: list, stop: threading.Event, interval: float) -> None:
+        """Refresh the jobs of worker_ids every interval seconds until stop is set."""
+        try:
+            while not stop.wait(interval):
+                close_old_connections()
+                heartbeat(worker_ids)
+        finally:
+            connection.close()
+
+    def _work(self, worker_id: str, stop: threading.Event, poll_interval: float) -> None:
+        """Claim and run jobs until stop is set (one thread, one DB connection)."""
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                job = claim(worker_id)
+                if job is None:
+                    stop.wait(poll_interval)
+                    continue
+                run_job(job)
+        finally:
+            connection.close()
@@ -0,0 +1,116 @@
+"""
+Middleware for the LegalDocs application.
+
+CompressionMiddleware compresses API responses with the best coding the
+client accepts (zstd, brotli or gzip, see core.compression), for
+deployments where no reverse proxy compresses them, such as
+service-to-service calls straight to gunicorn.
+
+ReplicaRoutingMiddleware marks the requests whose reads may go to a read
+replica (see core.db.routers) and pins clients that write to the primary.
+"""
+
+from django.conf import settings
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import CODECS, CompressedCache, negotiate_encoding
+from .db.routers import end_request, start_request
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses according to the request's Accept-Encoding.
+
+    - Bodies smaller than COMPRESSION_MIN_SIZE are sent as they are, as are
+      bodies that would not get smaller.
+    - Only COMPRESSION_CONTENT_TYPES are compressed. File downloads
+      (FileResponse, Content-Disposition), partial content and responses
+      that already have a Content-Encoding are left alone.
+    - Streaming responses are compressed chunk by chunk, flushing after
+      each chunk so the client still receives data as it is produced.
+    - Compressed bodies are kept in an in-memory LRU keyed by a digest of
+      the body (COMPRESSION_CACHE_SIZE bytes per process): hot responses
+      such as the cached dashboard are compressed once.
+    - Strong ETags are made weak, since the bytes sent differ from the
+      uncompressed representation.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        levels = getattr(settings, 'COMPRESSION_LEVELS', {})
+        self.codecs = {}
+        for name in getattr(settings, 'COMPRESSION_ENCODINGS', ['gzip']):
+            codec_class = CODECS[name]
+            if codec_class.available:
+                self.codecs[name] = codec_class(**({'level': levels[name]} if name in levels else {}))
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.content_types = set(getattr(settings, 'COMPRESSION_CONTENT_TYPES', ['application/json']))
+        self.cache = CompressedCache(getattr(settings, 'COMPRESSION_CACHE_SIZE', 0))
+
+    def should_compress(self, response) -> bool:
+        """Return whether the response is eligible for compression."""
+        if response.has_header('Content-Encoding') or response.has_header('Content-Disposition'):
+            return False
+        if isinstance(response, FileResponse) or response.status_code == 206:
+            return False
+        if response.streaming and response.is_async:
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type in self.content_types
+
+    def process_response(self, request, response):
+        """Compress the response body if the client accepts a coding."""
+        if not self.codecs or not self.should_compress(response):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.codecs)
+        if encoding is None:
+            return response
+        codec = self.codecs[encoding]
+
+        if response.streaming:
+            response.streaming_content = codec.stream(response.streaming_content)
+            # Length of the compressed stream is unknown
+            del response.headers['Content-Length']
+        else:
+            body = response.content
+            key = self.cache.key(encoding, body)
+            compressed = self.cache.get(key)
+            if compressed is None:
+                compressed = codec.compress(body)
+                self.cache.set(key, compressed)
+            if len(compressed) >= len(body):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Route the reads of safe API requests to REPLICA_DATABASES.
+
+    Does nothing without replicas. The routing ends with the response:
+    the body of a streaming response is read from the primary.
+    """
+
+    def process_request(self, request):
+        """Decide whether the request may read from a replica."""
+        request._replica_token = start_request(request)
+
+    def process_response(self, request, response):
+        """End the request's routing, pinning its client if it wrote."""
+        token = getattr(request, '_replica_token', None)
+        if token is not None:
+            end_request(request, token)
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.11 on 2026-10-19 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=20, verbose_name='Tipo de objeto')),
+                ('object_id', models.BigIntegerField(verbose_name='ID del objeto')),
+                ('operation', models.CharField(choices=[('upsert', 'Creación o modificación'), ('delete', 'Eliminación')], max_length=10, verbose_name='Operación')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+            ],
+            options={
+                'verbose_name': 'Cambio sincronizable',
+                'verbose_name_plural': 'Cambios sincronizables',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Sync type and model of the synced models when the change log was added
+SYNCED_MODELS = [
+    ('client', 'clients', 'Client'),
+    ('case', 'cases', 'Case'),
+    ('document', 'documents', 'Document'),
+]
+
+
+def backfill_changes(apps, schema_editor):
+    """Log an upsert for every existing synced row that has no change yet, so a first sync returns it."""
+    Change = apps.get_model('core', 'Change')
+    using = schema_editor.connection.alias
+    for object_type, app_label, model_name in SYNCED_MODELS:
+        model = apps.get_model(app_label, model_name)
+        logged = Change.objects.using(using).filter(object_type=object_type).values('object_id')
+        pks = list(
+            model.objects.using(using).exclude(pk__in=logged).order_by('pk').values_list('pk', flat=True)
+        )
+        Change.objects.using(using).bulk_create(
+            [Change(object_type=object_type, object_id=pk, operation='upsert') for pk in pks],
+            batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_change'),
+        ('clients', '0001_initial'),
+        ('cases', '0001_initial'),
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
@@ -1,2 +1,139 @@
+from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Job(models.Model):
+    """
+    A unit of background work stored in the database.
+
+    Jobs are created with core.jobs.enqueue() and executed by the
+    run_worker management command. Because the row is written in the same
+    transaction as the data it refers to, a job is only visible to workers
+    once that data is committed, and is lost if the transaction rolls back.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('running', 'En ejecución'),
+        ('succeeded', 'Completado'),
+        ('failed', 'Fallido'),
+    ]
+
+    PRIORITY_LOW = -10
+    PRIORITY_NORMAL = 0
+    PRIORITY_HIGH = 10
+
+    task = models.CharField(
+        max_length=100,
+        verbose_name="Tarea"
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Parámetros"
+    )
+    priority = models.SmallIntegerField(
+        default=PRIORITY_NORMAL,
+        verbose_name="Prioridad"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name="Estado"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Intentos"
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5,
+        verbose_name="Intentos máximos"
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Ejecutar a partir de"
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Tomado en"
+    )
+    locked_by = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Tomado por"
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Último error"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Fecha de creación"
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fecha de finalización"
+    )
+
+    class Meta:
+        verbose_name = "Tarea en segundo plano"
+        verbose_name_plural = "Tareas en segundo plano"
+        ordering = ['-priority', 'run_at', 'id']
+        indexes = [
+            # Dequeue: WHERE status = 'pending' AND run_at <= now ORDER BY priority, run_at
+            models.Index(
+                fields=['status', '-priority', 'run_at'],
+                name='core_job_dequeue_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class Change(models.Model):
+    """
+    One write to a synced model, recorded for /api/v1/sync/.
+
+    Entries are appended by core.changes after the write commits, so the
+    sequence number (the primary key) follows commit order: a client that
+    has read every entry up to a sequence number never misses one that is
+    committed later with a smaller number.
+    """
+
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    OPERATION_CHOICES = [
+        (UPSERT, 'Creación o modificación'),
+        (DELETE, 'Eliminación'),
+    ]
+
+    object_type = models.CharField(
+        max_length=20,
+        verbose_name="Tipo de objeto"
+    )
+    object_id = models.BigIntegerField(
+        verbose_name="ID del objeto"
+    )
+    operation = models.CharField(
+        max_length=10,
+        choices=OPERATION_CHOICES,
+        verbose_name="Operación"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Fecha"
+    )
+
+    class Meta:
+        verbose_name = "Cambio sincronizable"
+        verbose_name_plural = "Cambios sincronizables"
+        # The primary key is the sequence number: WHERE id > since ORDER BY id
+        # is a range scan of the primary key index
+        ordering = ['id']
+
+    def __str__(self) -> str:
+        return f"#{self.pk} {self.operation} {self.object_type} {self.object_id}"
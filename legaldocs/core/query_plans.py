@@ -0,0 +1,104 @@
+"""
+Query plan inspection.
+
+full_scans() asks the database how it would run a query and returns the
+tables it would read with a sequential scan, i.e. without an index, and
+sorts_rows() whether it would sort the rows instead of reading them in
+index order. They are used by the query plan tests to check that the
+queries of the endpoints are served by the indexes designed for them.
+
+Supported databases: SQLite (EXPLAIN QUERY PLAN) and PostgreSQL (EXPLAIN
+(FORMAT JSON)).
+"""
+
+import json
+
+from django.db import connections
+
+
+def _postgresql_nodes(plan) -> list:
+    """Return every node of a JSON plan."""
+    nodes = [plan[0]['Plan']]
+    for node in nodes:
+        nodes.extend(node.get('Plans', ()))
+    return nodes
+
+
+def _plan(sql: str, params, using: str):
+    """
+    Return the vendor and the raw plan of a query.
+
+    The plan is the parsed JSON plan on PostgreSQL and the rows of
+    EXPLAIN QUERY PLAN on SQLite.
+
+    Raises:
+        NotImplementedError: If the database is not SQLite or PostgreSQL.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            return connection.vendor, json.loads(plan) if isinstance(plan, str) else plan
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return connection.vendor, [row[-1] for row in cursor.fetchall()]
+    raise NotImplementedError(f'Query plans are not supported on {connection.vendor}')
+
+
+def explain(sql: str, params=(), using: str = 'default') -> list:
+    """
+    Return the plan of a query as text lines.
+
+    Args:
+        sql: The query, with placeholders.
+        params: The query parameters.
+        using: Database alias.
+
+    Returns:
+        list: The lines of the plan.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(sql: str, params=(), using: str = 'default') -> list:
+    """
+    Return the tables a query would read with a sequential scan.
+
+    Args:
+        sql: The query, with placeholders.
+        params: The query parameters.
+        using: Database alias.
+
+    Returns:
+        list: Names of the sequentially scanned tables.
+    """
+    vendor, plan = _plan(sql, params, using)
+    if vendor == 'postgresql':
+        return [node['Relation Name'] for node in _postgresql_nodes(plan) if node['Node Type'] == 'Seq Scan']
+    # "SCAN t" reads the table; "SCAN t USING [COVERING] INDEX i" walks an index
+    return [
+        detail.split()[1] for detail in plan
+        if detail.startswith('SCAN ') and ' USING ' not in detail
+    ]
+
+
+def sorts_rows(sql: str, params=(), using: str = 'default') -> bool:
+    """
+    Return whether a query would sort its rows rather than read them in order.
+
+    Args:
+        sql: The query, with placeholders.
+        params: The query parameters.
+        using: Database alias.
+    """
+    vendor, plan = _plan(sql, params, using)
+    if vendor == 'postgresql':
+        return any(node['Node Type'] == 'Sort' for node in _postgresql_nodes(plan))
+    return any(detail.startswith('USE TEMP B-TREE FOR ORDER BY') for detail in plan)
@@ -0,0 +1,60 @@
+"""
+Signal handlers for the core app.
+
+Saving or deleting a row of a model listed in CACHE_GENERATION_MODELS
+starts a new write generation for its table (core.cache), which
+invalidates the cached data derived from that table, such as page counts;
+saves limited to CACHE_GENERATION_IGNORED_FIELDS do not.
+Saving or deleting a row of a model listed in SYNC_MODELS appends an
+upsert or a tombstone to the change log (core.changes).
+
+The handlers are connected to those models only, by CoreConfig.ready(): a
+post_delete receiver without a sender would disable fast deletes, and
+cascades would load every row into Python.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete
+
+from .cache import bump_generation
+from .changes import record_changes
+from .models import Change
+
+
+def bump_write_generation(sender, using=None, update_fields=None, **kwargs):
+    """Bump the generation of the written table, again once the transaction commits."""
+    label = sender._meta.label
+    # Saves of columns no cached representation reads (e.g. last_login on login)
+    ignored = getattr(settings, 'CACHE_GENERATION_IGNORED_FIELDS', {}).get(label, ())
+    if update_fields and ignored and set(update_fields) <= set(ignored):
+        return
+    _bump_written_table(sender._meta.db_table, using)
+
+
+def _bump_written_table(table: str, using=None) -> None:
+    """Bump a table's generation now and, inside a transaction, after the commit."""
+    bump_generation(table)
+    if transaction.get_connection(using).in_atomic_block:
+        # A reader may cache data from before the commit under the new generation
+        transaction.on_commit(lambda: bump_generation(table), using=using)
+
+
+def rows_updated(model, pks, using: str = 'default') -> None:
+    """
+    Do for rows written with QuerySet.update() what the save signals do.
+
+    Args:
+        model: The updated model class.
+        pks: Primary keys of the updated rows.
+        using: Database alias of the write.
+    """
+    if model._meta.label in getattr(settings, 'CACHE_GENERATION_MODELS', ()):
+        _bump_written_table(model._meta.db_table, using)
+    record_changes(model, pks, Change.UPSERT, using=using)
+
+
+def log_sync_change(sender, instance, signal, using=None, **kwargs):
+    """Append the write to the change log of synced models."""
+    operation = Change.DELETE if signal is post_delete else Change.UPSERT
+    record_changes(sender, [instance.pk], operation, using=using or 'default')
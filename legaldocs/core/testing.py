@@ -0,0 +1,33 @@
+"""
+Test helpers.
+
+use_temporary_media_root() points MEDIA_ROOT at a temporary directory for
+the duration of a test, so documents uploaded by the tests are not written
+into the source tree.
+"""
+
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+
+def use_temporary_media_root(test_case) -> str:
+    """
+    Run a test with MEDIA_ROOT in a temporary directory.
+
+    Call it from setUp. The directory is deleted and MEDIA_ROOT restored
+    when the test is torn down.
+
+    Args:
+        test_case: The running TestCase.
+
+    Returns:
+        The path of the temporary MEDIA_ROOT.
+    """
+    media_root = tempfile.mkdtemp()
+    settings_override = override_settings(MEDIA_ROOT=media_root)
+    settings_override.enable()
+    test_case.addCleanup(settings_override.disable)
+    test_case.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+    return media_root
@@ -0,0 +1,80 @@
+"""
+Tests for the write generations of core.cache.
+"""
+
+from unittest import mock
+
+from django.contrib.auth.models import User, update_last_login
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.deletion import Collector
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from clients.models import Client
+from core.cache import bump_generation, get_generations
+
+
+class WriteGenerationTests(TestCase):
+    """Tests for get_generations, bump_generation and the write signals."""
+
+    def setUp(self):
+        """Start from an empty cache."""
+        cache.clear()
+
+    def test_generation_is_stable_until_bumped(self):
+        """Test that generations only change on bump_generation."""
+        first = get_generations(['some_table'])
+        self.assertEqual(get_generations(['some_table']), first)
+        bump_generation('some_table')
+        self.assertNotEqual(get_generations(['some_table']), first)
+
+    def test_missing_generation_does_not_restart(self):
+        """Test that an evicted generation is not recreated with an old value."""
+        bump_generation('some_table')
+        bumped = get_generations(['some_table'])['some_table']
+        cache.clear()
+        self.assertGreater(get_generations(['some_table'])['some_table'], bumped)
+
+    def test_concurrent_bumps_start_different_generations(self):
+        """Test that a bump reading the generation before another bump still starts a new one."""
+        bump_generation('some_table')
+        stale = get_generations(['some_table'])['some_table']
+        bump_generation('some_table')
+        first = get_generations(['some_table'])['some_table']
+        with mock.patch.object(cache, 'get', return_value=stale):
+            bump_generation('some_table')
+        second = get_generations(['some_table'])['some_table']
+        self.assertNotIn(second, (stale, first))
+
+    def test_tracked_model_writes_bump_generation(self):
+        """Test that saving tracked models bumps their table's generation, others do not."""
+        tables = [Client._meta.db_table, Token._meta.db_table]
+        before = get_generations(tables)
+        Client.objects.create(
+            full_name='Generación',
+            identification_number='GEN001',
+            email='gen@example.com',
+            phone='555-0000'
+        )
+        Token.objects.create(user=User.objects.create_user(username='untracked'))
+        after = get_generations(tables)
+        self.assertNotEqual(after[Client._meta.db_table], before[Client._meta.db_table])
+        self.assertEqual(after[Token._meta.db_table], before[Token._meta.db_table])
+
+    def test_last_login_does_not_bump_generation(self):
+        """Test that logging in keeps the user generation, other user saves change it."""
+        user = User.objects.create_user(username='login')
+        table = User._meta.db_table
+        before = get_generations([table])
+        update_last_login(None, user)
+        self.assertEqual(get_generations([table]), before)
+        user.first_name = 'Nombre'
+        user.save(update_fields=['first_name', 'last_login'])
+        self.assertNotEqual(get_generations([table]), before)
+
+    def test_untracked_models_keep_fast_deletes(self):
+        """Test that the write signals do not stop untracked models from being fast deleted."""
+        collector = Collector(using=DEFAULT_DB_ALIAS)
+        self.assertTrue(collector.can_fast_delete(Token.objects.all()))
+        self.assertFalse(collector.can_fast_delete(Client.objects.all()))
@@ -0,0 +1,241 @@
+"""
+Tests for response compression.
+
+Tests the codings and Accept-Encoding negotiation of core.compression and
+CompressionMiddleware on plain, streamed and file responses.
+"""
+
+import gzip
+import json
+import unittest
+import zipfile
+import zlib
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.compression import CODECS, BrotliCodec, CompressedCache, ZstdCodec, negotiate_encoding
+from core.middleware import CompressionMiddleware
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+BODY = json.dumps([{'id': i, 'title': f'Caso {i}'} for i in range(200)]).encode()
+
+
+def decompress(encoding: str, data: bytes) -> bytes:
+    """Decode a body, or the beginning of one, in the given content coding."""
+    if encoding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data)
+    if encoding == 'br':
+        return brotli.Decompressor().process(data)
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+class NegotiationTests(TestCase):
+    """Tests for negotiate_encoding."""
+
+    PREFERENCE = ['zstd', 'br', 'gzip']
+
+    def test_negotiation(self):
+        """Test quality values, server preference on ties and the wildcard."""
+        cases = {
+            'gzip, deflate, br': 'br',
+            'gzip, deflate, br, zstd': 'zstd',
+            'gzip;q=1.0, br;q=0.5': 'gzip',
+            '*': 'zstd',
+            '*;q=0.5, zstd;q=0': 'br',
+            'br;q=0, gzip;q=0': None,
+            'identity': None,
+            '': None,
+            'GZIP;Q=0.8': 'gzip',
+            'gzip;q=abc': None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(negotiate_encoding(header, self.PREFERENCE), expected)
+
+
+class CodecTests(TestCase):
+    """Tests for the codings, whole and streamed."""
+
+    def test_round_trip(self):
+        """Test that whole and streamed output decompress to the input."""
+        chunks = [BODY[i:i + 500] for i in range(0, len(BODY), 500)]
+        for name, codec_class in CODECS.items():
+            if not codec_class.available:
+                continue
+            with self.subTest(coding=name):
+                codec = codec_class()
+                self.assertEqual(decompress(name, codec.compress(BODY)), BODY)
+                streamed = list(codec.stream(iter(chunks)))
+                self.assertGreater(len(streamed), 1)
+                self.assertEqual(decompress(name, b''.join(streamed)), BODY)
+
+    @unittest.skipUnless(BrotliCodec.available and ZstdCodec.available, 'brotli and zstandard required')
+    def test_stream_flushes_each_chunk(self):
+        """Test that every streamed chunk is sent as soon as it is compressed."""
+        for name, codec_class in CODECS.items():
+            with self.subTest(coding=name):
+                stream = codec_class().stream(iter([b'{"a":1}', b'{"b":2}']))
+                self.assertEqual(decompress(name, next(stream)), b'{"a":1}')
+
+
+class CompressedCacheTests(TestCase):
+    """Tests for the LRU of compressed bodies."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the byte budget evicts the oldest unused entries."""
+        cache = CompressedCache(10)
+        cache.set('a', b'aaaa')
+        cache.set('b', b'bbbb')
+        self.assertEqual(cache.get('a'), b'aaaa')
+        cache.set('c', b'cccc')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'aaaa')
+        self.assertEqual(cache.size, 8)
+        cache.set('d', b'x' * 11)
+        self.assertIsNone(cache.get('d'))
+
+
+@override_settings(COMPRESSION_ENCODINGS=['gzip'], COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTests(TestCase):
+    """Tests for CompressionMiddleware on synthetic responses."""
+
+    def setUp(self):
+        """Create a request accepting gzip."""
+        self.request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+    def process(self, response, request=None):
+        """Run a response through a new middleware instance."""
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request or self.request)
+
+    def test_compresses_json(self):
+        """Test Content-Encoding, Content-Length, Vary and a weakened ETag."""
+        response = HttpResponse(BODY, content_type='application/json; charset=utf-8')
+        response['ETag'] = '"abc"'
+        response = self.process(response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_below_threshold(self):
+        """Test that small bodies are not compressed."""
+        response = self.process(HttpResponse(b'{"ok":true}', content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'{"ok":true}')
+
+    def test_not_accepted(self):
+        """Test that bodies are sent as they are without a usable Accept-Encoding."""
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='identity')
+        response = self.process(HttpResponse(BODY, content_type='application/json'), request)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_skipped_responses(self):
+        """Test that HTML, files, attachments, partial and encoded responses are left alone."""
+        zipped = BytesIO()
+        with zipfile.ZipFile(zipped, 'w') as archive:
+            archive.writestr('a.json', BODY)
+        attachment = HttpResponse(BODY, content_type='application/json')
+        attachment['Content-Disposition'] = 'attachment; filename="casos.json"'
+        partial = HttpResponse(BODY, content_type='application/json', status=206)
+        encoded = HttpResponse(BODY, content_type='application/json')
+        encoded['Content-Encoding'] = 'br'
+        responses = [
+            HttpResponse(BODY, content_type='text/html'),
+            HttpResponse(zipped.getvalue(), content_type='application/zip'),
+            FileResponse(BytesIO(BODY), content_type='application/json'),
+            attachment,
+            partial,
+        ]
+        for response in responses:
+            with self.subTest(response=response):
+                self.assertFalse(self.process(response).has_header('Content-Encoding'))
+        self.assertEqual(self.process(encoded)['Content-Encoding'], 'br')
+
+    def test_streaming(self):
+        """Test that streamed bodies are compressed chunk by chunk."""
+        chunks = [BODY[i:i + 1000] for i in range(0, len(BODY), 1000)]
+        response = self.process(StreamingHttpResponse(iter(chunks), content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), BODY)
+
+    def test_repeated_body_compressed_once(self):
+        """Test that an identical body is served from the compressed LRU."""
+        middleware = CompressionMiddleware(lambda request: HttpResponse(BODY, content_type='application/json'))
+        codec = middleware.codecs['gzip']
+        with mock.patch.object(codec, 'compress', wraps=codec.compress) as compress:
+            first = middleware(self.request)
+            second = middleware(self.request)
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+    @override_settings(COMPRESSION_ENCODINGS=['zstd', 'br', 'gzip'])
+    @unittest.skipUnless(BrotliCodec.available and ZstdCodec.available, 'brotli and zstandard required')
+    def test_preferred_coding(self):
+        """Test that the server preference picks among the accepted codings."""
+        for header, expected in [('gzip, br', 'br'), ('gzip, br, zstd', 'zstd'), ('gzip', 'gzip')]:
+            with self.subTest(header=header):
+                request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)
+                response = self.process(HttpResponse(BODY, content_type='application/json'), request)
+                self.assertEqual(response['Content-Encoding'], expected)
+                self.assertEqual(decompress(expected, response.content), BODY)
+
+
+class CompressedEndpointTests(APITestCase):
+    """Tests for compressed API responses."""
+
+    def setUp(self):
+        """Create 30 cases and authenticate."""
+        user = User.objects.create_user(username='zipper', password='testpass123')
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        client = Client.objects.create(
+            full_name='Cliente Comprimido',
+            identification_number='GZ001',
+            email='gz@example.com',
+            phone='555-0000'
+        )
+        for i in range(30):
+            Case.objects.create(
+                client=client,
+                title=f'Caso {i}',
+                description='Descripción del caso',
+                case_type='civil',
+                start_date=timezone.now().date()
+            )
+
+    def test_list(self):
+        """Test that a list is compressed and decodes to the same data."""
+        plain = self.client.get('/api/v1/cases/')
+        response = self.client.get('/api/v1/cases/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), plain.json())
+
+    def test_streamed_list(self):
+        """Test that ?stream=1 lists are compressed as they stream."""
+        response = self.client.get('/api/v1/cases/?stream=1', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(b''.join(response.streaming_content)))), 30)
@@ -0,0 +1,134 @@
+"""
+Tests for the database connection pool.
+
+Tests connection reuse, the size limit, idle expiry, health checks and
+resets with sqlite3 connections, and the configuration checks of the
+pooled PostgreSQL backend (which need no server).
+"""
+
+import sqlite3
+import threading
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Tests for core.db.pool.ConnectionPool."""
+
+    def setUp(self):
+        """Count the connections opened by the pool."""
+        self.opened = []
+
+    def connect(self):
+        """Open an in-memory sqlite3 connection."""
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self.opened.append(connection)
+        return connection
+
+    def test_reuses_returned_connections(self):
+        """Test that a returned connection is handed out again."""
+        pool = ConnectionPool(self.connect, max_size=2)
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_max_size(self):
+        """Test that getconn() waits for a free slot and times out."""
+        pool = ConnectionPool(self.connect, max_size=1, timeout=0.05)
+        connection = pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        pool.putconn(connection)
+        self.assertIs(pool.getconn(), connection)
+
+    def test_waiting_thread_gets_returned_connection(self):
+        """Test that a connection given back by one thread serves a waiting one."""
+        pool = ConnectionPool(self.connect, max_size=1, timeout=5)
+        connection = pool.getconn()
+        borrowed = []
+        waiter = threading.Thread(target=lambda: borrowed.append(pool.getconn()))
+        waiter.start()
+        pool.putconn(connection)
+        waiter.join(5)
+        self.assertEqual(borrowed, [connection])
+        self.assertEqual(len(self.opened), 1)
+
+    def test_idle_expiry(self):
+        """Test that connections idle for longer than max_idle are closed, not reused."""
+        pool = ConnectionPool(self.connect, max_size=2, max_idle=60)
+        first, second = pool.getconn(), pool.getconn()
+        with mock.patch('core.db.pool.time.monotonic', return_value=0):
+            pool.putconn(first)
+        with mock.patch('core.db.pool.time.monotonic', return_value=100):
+            pool.putconn(second)
+        self.assertEqual(pool.idle_count(), 1)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            first.execute('SELECT 1')
+        with mock.patch('core.db.pool.time.monotonic', return_value=200):
+            self.assertIsNot(pool.getconn(), second)
+        self.assertEqual(len(self.opened), 3)
+
+    def test_health_check(self):
+        """Test that an idle connection failing its check is replaced."""
+        pool = ConnectionPool(self.connect, max_size=1, check=lambda connection: False)
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertIsNot(pool.getconn(), first)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_reset(self):
+        """Test that connections the reset rejects, or discarded ones, are closed."""
+        pool = ConnectionPool(self.connect, max_size=1, reset=lambda connection: False)
+        pool.putconn(pool.getconn())
+        self.assertEqual(pool.idle_count(), 0)
+        pool = ConnectionPool(self.connect, max_size=1)
+        pool.putconn(pool.getconn(), discard=True)
+        self.assertEqual(pool.idle_count(), 0)
+        pool.getconn()
+
+    def test_failed_connect_frees_slot(self):
+        """Test that a connection error does not use up a slot."""
+        pool = ConnectionPool(mock.Mock(side_effect=sqlite3.OperationalError), max_size=1, timeout=0)
+        for _ in range(2):
+            with self.assertRaises(sqlite3.OperationalError):
+                pool.getconn()
+
+    def test_closeall(self):
+        """Test that closeall() closes the idle connections."""
+        pool = ConnectionPool(self.connect, max_size=2)
+        connection = pool.getconn()
+        pool.putconn(connection)
+        pool.closeall()
+        self.assertEqual(pool.idle_count(), 0)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connection.execute('SELECT 1')
+
+
+class PooledBackendTests(SimpleTestCase):
+    """Tests for the configuration of core.db.postgresql_pool."""
+
+    def wrapper(self, **settings):
+        """Return a pooled database wrapper for the given settings."""
+        handler = ConnectionHandler({'default': {
+            'ENGINE': 'core.db.postgresql_pool', 'NAME': 'legaldocs_test', **settings
+        }})
+        return handler['default']
+
+    def test_rejects_persistent_connections(self):
+        """Test that CONN_MAX_AGE must be 0."""
+        with self.assertRaises(ImproperlyConfigured):
+            self.wrapper(CONN_MAX_AGE=60)
+
+    def test_pool_options_not_sent_to_server(self):
+        """Test that OPTIONS['pool'] configures the pool and is not a connect() parameter."""
+        wrapper = self.wrapper(OPTIONS={'pool': {'max_size': 3}, 'sslmode': 'require'})
+        params = wrapper.get_connection_params()
+        self.assertNotIn('pool', params)
+        self.assertEqual(params['sslmode'], 'require')
+        self.assertEqual(wrapper.pool_options, {'max_size': 3})
@@ -0,0 +1,154 @@
+"""
+Tests for the background job queue.
+
+Tests enqueueing, priority order, retries with backoff, stale job
+recovery, heartbeats, the deletion of old jobs and the run_worker
+management command.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.jobs import claim, delete_finished, enqueue, heartbeat, requeue_stale, run_job, run_pending, task
+from core.models import Job
+
+calls = []
+
+
+@task('tests.record')
+def record(value):
+    """Test task that records its argument."""
+    calls.append(value)
+
+
+@task('tests.fail')
+def fail():
+    """Test task that always fails."""
+    raise RuntimeError('boom')
+
+
+@override_settings(JOB_MAX_ATTEMPTS=3, JOB_RETRY_BACKOFF=10, JOB_RETRY_BACKOFF_MAX=25)
+class JobQueueTests(TestCase):
+    """Tests for core.jobs."""
+
+    def setUp(self):
+        """Reset the recorded calls."""
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """Test that a queued job runs with its payload and is marked succeeded."""
+        job = enqueue('tests.record', {'value': 'a'})
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(job.max_attempts, 3)
+
+        self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_priority_order(self):
+        """Test that higher priority jobs run first, then oldest first."""
+        enqueue('tests.record', {'value': 'normal-1'})
+        enqueue('tests.record', {'value': 'low'}, priority=Job.PRIORITY_LOW)
+        enqueue('tests.record', {'value': 'high'}, priority=Job.PRIORITY_HIGH)
+        enqueue('tests.record', {'value': 'normal-2'})
+        run_pending()
+        self.assertEqual(calls, ['high', 'normal-1', 'normal-2', 'low'])
+
+    def test_delayed_job_not_claimed(self):
+        """Test that a job does not run before its run_at."""
+        enqueue('tests.record', {'value': 'later'}, delay=60)
+        self.assertIsNone(claim('worker'))
+
+    def test_claimed_job_not_claimed_twice(self):
+        """Test that a running job is not handed to another worker."""
+        enqueue('tests.record', {'value': 'a'})
+        job = claim('worker-1')
+        self.assertEqual(job.status, 'running')
+        self.assertEqual(job.locked_by, 'worker-1')
+        self.assertIsNone(claim('worker-2'))
+
+    def test_failure_retried_with_backoff(self):
+        """Test that a failed job is rescheduled with exponential backoff."""
+        job = enqueue('tests.fail')
+        before = timezone.now()
+        with self.assertLogs('core.jobs', level='WARNING'):
+            self.assertFalse(run_job(claim('worker')))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.assertIn('boom', job.last_error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=10))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('core.jobs', level='WARNING'):
+            run_job(claim('worker'))
+        job.refresh_from_db()
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=20))
+
+    def test_failed_after_max_attempts(self):
+        """Test that a job stops being retried after max_attempts."""
+        job = enqueue('tests.fail')
+        for _ in range(3):
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+            with self.assertLogs('core.jobs', level='WARNING'):
+                run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 3)
+        self.assertIsNone(claim('worker'))
+
+    def test_unknown_task_fails_immediately(self):
+        """Test that a job for an unregistered task is not retried."""
+        job = enqueue('tests.missing')
+        with self.assertLogs('core.jobs', level='WARNING'):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 1)
+
+    def test_requeue_stale(self):
+        """Test that jobs abandoned by a dead worker go back to the queue."""
+        job = enqueue('tests.record', {'value': 'a'})
+        claim('dead-worker')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(timeout=600), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(job.locked_by, '')
+
+    def test_heartbeat_keeps_long_jobs_running(self):
+        """Test that a job whose worker is alive is not requeued, however long it runs."""
+        job = enqueue('tests.record', {'value': 'a'})
+        claim('live-worker')
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(heartbeat(['live-worker']), 1)
+        self.assertEqual(requeue_stale(timeout=600), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'running')
+        self.assertEqual(job.locked_by, 'live-worker')
+
+    @override_settings(JOB_RETENTION=3600)
+    def test_delete_finished(self):
+        """Test that succeeded jobs are deleted after JOB_RETENTION, failed and recent ones kept."""
+        old, recent, failed = (enqueue('tests.record', {'value': value}) for value in 'abc')
+        finished = timezone.now() - timedelta(hours=2)
+        Job.objects.filter(pk=old.pk).update(status='succeeded', finished_at=finished)
+        Job.objects.filter(pk=recent.pk).update(status='succeeded', finished_at=timezone.now())
+        Job.objects.filter(pk=failed.pk).update(status='failed', finished_at=finished)
+        self.assertEqual(delete_finished(), 1)
+        self.assertQuerySetEqual(Job.objects.order_by('pk'), [recent, failed])
+
+    def test_run_worker_once(self):
+        """Test that run_worker --once drains the queue and exits."""
+        enqueue('tests.record', {'value': 'a'})
+        enqueue('tests.record', {'value': 'b'})
+        out = StringIO()
+        call_command('run_worker', '--once', stdout=out)
+        self.assertEqual(calls, ['a', 'b'])
+        self.assertIn('Executed 2 job(s).', out.getvalue())
@@ -0,0 +1,173 @@
+"""
+Tests for the read-replica router.
+
+A second SQLite database ('replica') stands in for a replica. Rows
+created only there show which database a request read from.
+"""
+
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from cases.models import Case
+from clients.models import Client
+from core.cache import RECENT_WRITE_KEY
+from core.db import routers
+from core.db.routers import ReplicaRouter, end_request, reset_lag_checks, start_request
+
+
+def create_client(name: str, using: str = DEFAULT_DB_ALIAS) -> Client:
+    """Create a client in the given database."""
+    return Client.objects.using(using).create(
+        full_name=name,
+        identification_number=name.upper(),
+        email=f'{name}@example.com',
+        phone='555-0000'
+    )
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRoutingTests(TransactionTestCase):
+    """Tests for ReplicaRoutingMiddleware and ReplicaRouter through the API."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        """Create a client in each database and two API users."""
+        create_client('primario')
+        create_client('replica', using='replica')
+        self.api = self.api_client('lector')
+        self.other_api = self.api_client('otro')
+        reset_lag_checks()
+        # Forget the writes above, as if the replica had caught up
+        cache.clear()
+
+    def api_client(self, username: str) -> APIClient:
+        """Return an API client authenticated as a new user."""
+        token = Token.objects.create(user=User.objects.create_user(username=username))
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        return api
+
+    def listed_names(self, api: APIClient) -> set:
+        """Return the names of the clients listed by the API."""
+        response = api.get('/api/v1/clients/')
+        self.assertEqual(response.status_code, 200)
+        return {client['full_name'] for client in response.data['results']}
+
+    def test_safe_api_reads_use_replica(self):
+        """Test that GET requests under /api/ read from the replica."""
+        self.assertEqual(self.listed_names(self.api), {'replica'})
+
+    def test_writes_pin_client_to_primary(self):
+        """Test that after a write its client reads from the primary, and others do not."""
+        response = self.api.patch(
+            f'/api/v1/clients/{Client.objects.get().pk}/', {'phone': '555-9999'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        cache.delete(RECENT_WRITE_KEY.format(table=Client._meta.db_table))
+        self.assertEqual(self.listed_names(self.api), {'primario'})
+        self.assertEqual(self.listed_names(self.other_api), {'replica'})
+
+    @override_settings(REPLICA_PIN_SECONDS=1)
+    def test_pin_expires(self):
+        """Test that a pinned client reads from the replica again after REPLICA_PIN_SECONDS."""
+        self.api.patch(f'/api/v1/clients/{Client.objects.get().pk}/', {'phone': '555-9999'}, format='json')
+        self.assertEqual(self.listed_names(self.api), {'primario'})
+        time.sleep(1.1)
+        self.assertEqual(self.listed_names(self.api), {'replica'})
+
+    def test_new_generation_reads_primary(self):
+        """Test that every client reads from the primary right after a write to a table the list reads."""
+        create_client('nuevo')
+        self.assertEqual(self.listed_names(self.other_api), {'primario', 'nuevo'})
+
+    def test_unrelated_writes_keep_replica(self):
+        """Test that writes to tables a list does not read leave it on the replica."""
+        Case.objects.create(
+            client=Client.objects.get(),
+            title='Caso',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.assertEqual(self.listed_names(self.other_api), {'replica'})
+
+    def test_lagging_or_unreachable_replica_is_skipped(self):
+        """Test that reads fall back to the primary when the replica lags or cannot be queried."""
+        for lag in (60.0, None):
+            reset_lag_checks()
+            with mock.patch('core.db.routers.replica_lag', return_value=lag):
+                self.assertEqual(self.listed_names(self.api), {'primario'})
+
+    def test_lag_is_checked_periodically(self):
+        """Test that the lag is measured once per REPLICA_LAG_CHECK_INTERVAL."""
+        with mock.patch('core.db.routers.replica_lag', return_value=0.0) as replica_lag:
+            self.listed_names(self.api)
+            self.listed_names(self.api)
+        self.assertEqual(replica_lag.call_count, 1)
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRouterTests(TransactionTestCase):
+    """Tests for the routing decisions of ReplicaRouter."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        """Start with a reachable replica and no recent writes."""
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        reset_lag_checks()
+        cache.clear()
+
+    def route(self, request, model=Client) -> str:
+        """Return the database a read of the model is routed to during the request."""
+        token = start_request(request)
+        try:
+            return self.router.db_for_read(model)
+        finally:
+            end_request(request, token)
+
+    def test_unsafe_and_non_api_requests_use_primary(self):
+        """Test that only safe methods under /api/ read from the replica."""
+        self.assertEqual(self.route(self.factory.get('/api/v1/clients/')), 'replica')
+        self.assertEqual(self.route(self.factory.post('/api/v1/clients/')), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.route(self.factory.get('/admin/clients/client/')), DEFAULT_DB_ALIAS)
+
+    def test_outside_requests_use_primary(self):
+        """Test that management commands and workers read from the primary."""
+        self.assertEqual(self.router.db_for_read(Client), DEFAULT_DB_ALIAS)
+
+    def test_primary_models(self):
+        """Test that REPLICA_PRIMARY_MODELS are read from the primary and their writes do not pin."""
+        request = self.factory.get('/api/v1/clients/', HTTP_AUTHORIZATION='Token abc')
+        self.assertEqual(self.route(request, Token), DEFAULT_DB_ALIAS)
+        token = start_request(request)
+        self.router.db_for_write(Token)
+        self.assertEqual(self.router.db_for_read(Client), 'replica')
+        end_request(request, token)
+        self.assertFalse(routers.is_pinned(request))
+
+    def test_reads_after_write_use_primary(self):
+        """Test that a request reads from the primary once it has written."""
+        request = self.factory.get('/api/v1/clients/', HTTP_AUTHORIZATION='Token abc')
+        token = start_request(request)
+        self.assertEqual(self.router.db_for_read(Client), 'replica')
+        self.router.db_for_write(Client)
+        self.assertEqual(self.router.db_for_read(Client), DEFAULT_DB_ALIAS)
+        end_request(request, token)
+        self.assertTrue(routers.is_pinned(request))
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_no_replicas(self):
+        """Test that without replicas requests are not routed."""
+        self.assertIsNone(start_request(self.factory.get('/api/v1/clients/')))
+        self.assertEqual(self.router.db_for_read(Client), DEFAULT_DB_ALIAS)
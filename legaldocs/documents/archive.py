@@ -0,0 +1,122 @@
+"""
+Streaming ZIP archives of document files.
+
+Builds a ZIP file on the fly and yields it in chunks as it is produced,
+so the first bytes go out immediately and memory use does not depend on
+the number or size of the files. Files that are already compressed
+(PDF, JPEG, PNG, DOCX) are stored as-is; other files are deflated.
+
+The response status is sent before the first file is read, so a file
+that cannot be read is logged and left out instead of failing the
+response: the client still receives a valid archive.
+"""
+
+import logging
+import os
+import zipfile
+
+from django.utils import timezone
+
+from .downloads import download_filename
+
+logger = logging.getLogger(__name__)
+
+# Extensions whose content is already compressed and is stored without deflate
+STORED_EXTENSIONS = {'.pdf', '.jpg', '.jpeg', '.png', '.docx', '.zip'}
+
+
+class _ZipSink:
+    """
+    Write-only, unseekable buffer that ZipFile writes into.
+
+    Exposes tell() but no seek(), so ZipFile uses data descriptors and
+    never goes back to patch local headers. Written bytes are collected
+    until take() hands them to the response.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data) -> int:
+        """Append data to the pending buffer."""
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Return the number of bytes written so far."""
+        return self._position
+
+    def flush(self) -> None:
+        """Nothing to flush; data is handed out by take()."""
+
+    def take(self) -> bytes:
+        """Return and clear the pending bytes."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _drain(sink):
+    """Yield the pending bytes of the sink, if any."""
+    data = sink.take()
+    if data:
+        yield data
+
+
+def archive_name(document, used_names: set) -> str:
+    """Return a unique entry name for a document inside the archive."""
+    name = download_filename(document)
+    stem, extension = os.path.splitext(name)
+    counter = 2
+    while name in used_names:
+        name = f'{stem}-{counter}{extension}'
+        counter += 1
+    used_names.add(name)
+    return name
+
+
+def stream_documents_zip(documents):
+    """
+    Yield a ZIP archive containing the files of the given documents.
+
+    Args:
+        documents: Iterable of Document instances (ideally a queryset
+            iterator, so rows are fetched lazily too).
+
+    Yields:
+        bytes: Consecutive chunks of the ZIP file.
+    """
+    sink = _ZipSink()
+    used_names = set()
+
+    with zipfile.ZipFile(sink, mode='w', allowZip64=True) as archive:
+        for document in documents:
+            try:
+                source = document.file.open('rb')
+            except OSError:
+                logger.exception('Left document %s out of the archive: its file cannot be read', document.pk)
+                continue
+            name = archive_name(document, used_names)
+            info = zipfile.ZipInfo(
+                name,
+                date_time=timezone.localtime(document.uploaded_at).timetuple()[:6]
+            )
+            info.file_size = document.file_size
+            if os.path.splitext(name)[1] in STORED_EXTENSIONS:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+
+            with source, archive.open(info, mode='w') as entry:
+                try:
+                    for chunk in source.chunks():
+                        entry.write(chunk)
+                        yield from _drain(sink)
+                except OSError:
+                    # The entry is closed with what was read, keeping the archive valid
+                    logger.exception('File of document %s truncated in the archive: read failed', document.pk)
+            yield from _drain(sink)
+
+    yield from _drain(sink)
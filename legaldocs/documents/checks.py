@@ -0,0 +1,26 @@
+"""
+System checks for the documents app.
+
+Settings read only when a file is downloaded are validated here, so a bad
+value fails manage.py check and startup instead of every download.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .downloads import DOWNLOAD_BACKENDS
+
+
+@register(Tags.compatibility)
+def check_download_backend(app_configs, **kwargs) -> list:
+    """Check that DOCUMENT_DOWNLOAD_BACKEND is one of DOWNLOAD_BACKENDS."""
+    backend = getattr(settings, 'DOCUMENT_DOWNLOAD_BACKEND', 'django')
+    if backend in DOWNLOAD_BACKENDS:
+        return []
+    return [
+        Error(
+            f'DOCUMENT_DOWNLOAD_BACKEND must be one of {", ".join(DOWNLOAD_BACKENDS)}, not {backend!r}.',
+            hint='Set DOCUMENT_DOWNLOAD_BACKEND to django, x-accel-redirect or x-sendfile.',
+            id='documents.E001',
+        )
+    ]
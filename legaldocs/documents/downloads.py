@@ -0,0 +1,215 @@
+"""
+Efficient, authenticated document file delivery.
+
+Builds the response for /documents/{id}/download/ with:
+- Strong ETag from the content hash, with If-None-Match -> 304
+- HTTP Range support (single byte range) with 206/416 responses
+- Offloading of the file body to the front proxy via X-Accel-Redirect
+  (nginx) or X-Sendfile (Apache/lighttpd) when DOCUMENT_DOWNLOAD_BACKEND
+  is set, or FileResponse (sendfile via wsgi.file_wrapper) otherwise
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.http import content_disposition_header
+from django.utils.text import slugify
+
+from api.conditional import etag_matches
+
+# Block size used when streaming a byte range
+RANGE_BLOCK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Values of DOCUMENT_DOWNLOAD_BACKEND
+DOWNLOAD_BACKENDS = ('django', 'x-accel-redirect', 'x-sendfile')
+
+
+def document_etag(document) -> str:
+    """
+    Return a strong ETag for a document's file.
+
+    Uses the content hash when known; otherwise falls back to the primary
+    key, size and upload time, which change whenever the file does.
+    """
+    if document.content_hash:
+        return f'"{document.content_hash}"'
+    return f'"{document.pk}-{document.file_size}-{int(document.uploaded_at.timestamp())}"'
+
+
+def download_filename(document) -> str:
+    """Return a readable file name built from the title and file extension."""
+    extension = os.path.splitext(document.file.name)[1].lower()
+    return f'{slugify(document.title) or "documento"}{extension}'
+
+
+def parse_range(header: str, size: int):
+    """
+    Parse a single-range Range header.
+
+    Args:
+        header: Value of the Range header.
+        size: Total size of the file in bytes.
+
+    Returns:
+        tuple: (start, end) inclusive byte positions, None if the header
+        should be ignored (malformed or multiple ranges), or False if the
+        range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            return False
+        return max(0, size - suffix), size - 1
+
+    start = int(first)
+    if start >= size:
+        return False
+    end = int(last) if last else size - 1
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _read_range(file, start: int, length: int):
+    """Yield length bytes of file starting at start, in blocks."""
+    try:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(RANGE_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+    finally:
+        file.close()
+
+
+def download_backend() -> str:
+    """
+    Return the configured DOCUMENT_DOWNLOAD_BACKEND.
+
+    Raises:
+        ImproperlyConfigured: If the setting is not one of DOWNLOAD_BACKENDS.
+    """
+    backend = getattr(settings, 'DOCUMENT_DOWNLOAD_BACKEND', 'django')
+    if backend not in DOWNLOAD_BACKENDS:
+        raise ImproperlyConfigured(
+            f'DOCUMENT_DOWNLOAD_BACKEND must be one of {", ".join(DOWNLOAD_BACKENDS)}, not {backend!r}.'
+        )
+    return backend
+
+
+def _proxy_response(storage, name: str, content_type: str, filename: str, as_attachment: bool):
+    """Return an empty response that tells the proxy to send the file."""
+    backend = download_backend()
+    response = HttpResponse(content_type=content_type)
+    if backend == 'x-accel-redirect':
+        prefix = getattr(settings, 'DOCUMENT_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = quote(f'{prefix}{name}')
+    else:
+        response['X-Sendfile'] = storage.path(name)
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def serve_file(request, storage, name: str, etag: str, filename: str, as_attachment: bool = True):
+    """
+    Build the response that delivers a stored file.
+
+    Args:
+        request: The current request (Range, If-None-Match, If-Range).
+        storage: Storage holding the file.
+        name: Storage name of the file.
+        etag: Strong ETag identifying the file content.
+        filename: File name suggested to the client.
+        as_attachment: Whether to send Content-Disposition: attachment.
+
+    Returns:
+        HttpResponse: 200, 206, 304 or 416 response.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and etag_matches(if_none_match, etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+    if download_backend() != 'django':
+        response = _proxy_response(storage, name, content_type, filename, as_attachment)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private'
+        return response
+
+    size = storage.size(name)
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (not if_range or if_range == etag):
+        byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(storage.open(name, 'rb'), start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    else:
+        response = FileResponse(
+            storage.open(name, 'rb'),
+            as_attachment=as_attachment,
+            filename=filename,
+            content_type=content_type,
+        )
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private'
+    return response
+
+
+def serve_document(request, document):
+    """
+    Build the download response for a document's file.
+
+    Args:
+        request: The current request.
+        document: The Document whose file is sent.
+
+    Returns:
+        HttpResponse: 200, 206, 304 or 416 response.
+    """
+    return serve_file(
+        request,
+        document.file.storage,
+        document.file.name,
+        document_etag(document),
+        download_filename(document),
+    )
@@ -0,0 +1,278 @@
+"""
+Garbage collection of orphaned document files.
+
+Files under the document storage that no Document row references (left
+behind by deletes that happened before files were released automatically,
+by failed releases or by interrupted uploads) are found with a merge-join
+of two streams sorted in the same byte order:
+
+- the storage tree, walked lazily one directory at a time
+- the file and thumbnail names referenced in the database, read with a
+  server-side iterator ordered with a binary collation
+
+Neither side is loaded into memory, so the collector scales to millions of
+files. Candidates are only removed once they are older than a grace period
+and after re-checking the database, so uploads in progress are never
+touched.
+
+Resumable upload sessions abandoned before completion are expired
+separately, with their chunk directories (expire_upload_sessions()).
+"""
+
+import datetime
+import heapq
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Collate
+from django.utils import timezone
+
+from . import resumable
+from .models import Document, UploadSession
+from .storage import name_digest
+
+# Collations that compare strings byte by byte, per database vendor
+BINARY_COLLATIONS = {
+    'postgresql': 'C',
+    'sqlite': 'BINARY',
+    'mysql': 'utf8mb4_bin',
+}
+
+
+@dataclass
+class StoredFile:
+    """A file found while walking the storage."""
+
+    name: str
+    size: int
+    mtime: float
+
+
+@dataclass
+class CollectionStats:
+    """Counters reported by collect_orphans()."""
+
+    examined: int = 0
+    referenced: int = 0
+    in_grace_period: int = 0
+    deleted: int = 0
+    reclaimed_bytes: int = 0
+    last_name: str = ''
+
+
+def walk_storage(root: str, prefix: str, start_after: str = '') -> Iterator[StoredFile]:
+    """
+    Yield the files below root/prefix sorted by their storage name.
+
+    Directory entries are sorted with a trailing '/' on directory names, so
+    the depth-first walk yields names in plain string order ('a-b' before
+    'a/x'), the same order as the database side of the join.
+
+    Args:
+        root: Storage location on disk.
+        prefix: Directory inside the storage, e.g. 'legal_documents'.
+        start_after: Skip names up to and including this one.
+
+    Yields:
+        StoredFile: Files in ascending name order.
+    """
+    def walk(directory, relative):
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+        keyed = []
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            name = f'{relative}/{entry.name}'
+            keyed.append((f'{name}/' if is_dir else name, is_dir, entry))
+        keyed.sort(key=lambda item: item[0])
+
+        for key, is_dir, entry in keyed:
+            if is_dir:
+                # Skip whole subtrees that sort before the resume point
+                if start_after and not start_after.startswith(key) and key < start_after:
+                    continue
+                yield from walk(entry.path, key[:-1])
+            elif key > start_after:
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                yield StoredFile(key, stat.st_size, stat.st_mtime)
+
+    prefix = prefix.strip('/')
+    yield from walk(os.path.join(root, prefix), prefix)
+
+
+def referenced_names(prefix: str, start_after: str = '', chunk_size: int = 2000) -> Iterator[str]:
+    """
+    Yield the distinct file and thumbnail names referenced by documents.
+
+    Args:
+        prefix: Only names inside this directory are returned.
+        start_after: Skip names up to and including this one.
+        chunk_size: Rows fetched per database round trip.
+
+    Yields:
+        str: Names in ascending byte order, without duplicates.
+    """
+    collation = BINARY_COLLATIONS.get(connection.vendor, 'C')
+    prefix = f"{prefix.strip('/')}/"
+
+    def column(field):
+        queryset = (
+            Document.objects
+            .alias(sort_name=Collate(field, collation))
+            .filter(**{f'{field}__startswith': prefix})
+        )
+        if start_after:
+            queryset = queryset.filter(sort_name__gt=start_after)
+        return queryset.order_by('sort_name').values_list(field, flat=True).iterator(chunk_size)
+
+    previous = None
+    for name in heapq.merge(column('file'), column('thumbnail')):
+        if name != previous:
+            yield name
+            previous = name
+
+
+def is_referenced(name: str) -> bool:
+    """Return True if any document uses name as file or thumbnail."""
+    references = Document.objects.filter(Q(file=name) | Q(thumbnail=name))
+    digest = name_digest(name)
+    if digest:
+        # file and thumbnail are not indexed: look up through content_hash
+        references = references.filter(content_hash=digest)
+    return references.exists()
+
+
+def collect_orphans(
+    storage,
+    prefix: str,
+    grace_period: float,
+    dry_run: bool = False,
+    start_after: str = '',
+    max_rate: Optional[float] = None,
+    max_deletes: Optional[int] = None,
+    on_progress=None,
+    progress_every: int = 1000,
+) -> CollectionStats:
+    """
+    Delete files under prefix that no document references.
+
+    Args:
+        storage: FileSystemStorage holding the files.
+        prefix: Directory inside the storage to collect.
+        grace_period: Seconds a file must be unmodified before deletion.
+        dry_run: Report orphans without deleting them.
+        start_after: Resume after this storage name.
+        max_rate: Maximum deletions per second.
+        max_deletes: Stop after deleting this many files.
+        on_progress: Callable receiving the stats every progress_every files.
+        progress_every: Number of examined files between progress reports.
+
+    Returns:
+        CollectionStats: What was examined and reclaimed.
+    """
+    stats = CollectionStats()
+    cutoff = time.time() - grace_period
+    min_interval = 1 / max_rate if max_rate else 0
+    last_delete = 0.0
+
+    references = referenced_names(prefix, start_after)
+    reference = next(references, None)
+
+    for stored in walk_storage(storage.location, prefix, start_after):
+        stats.examined += 1
+        stats.last_name = stored.name
+        if on_progress and stats.examined % progress_every == 0:
+            on_progress(stats)
+
+        while reference is not None and reference < stored.name:
+            reference = next(references, None)
+        if reference == stored.name:
+            stats.referenced += 1
+            continue
+        if stored.mtime > cutoff:
+            stats.in_grace_period += 1
+            continue
+        # The listing may be stale: check again right before deleting
+        if is_referenced(stored.name):
+            stats.referenced += 1
+            continue
+
+        if not dry_run:
+            if min_interval:
+                wait = last_delete + min_interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                last_delete = time.monotonic()
+            path = storage.path(stored.name)
+            try:
+                # A deduplicated upload refreshes the mtime of an existing blob
+                if os.stat(path).st_mtime > cutoff:
+                    stats.in_grace_period += 1
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+        stats.deleted += 1
+        stats.reclaimed_bytes += stored.size
+        if max_deletes and stats.deleted >= max_deletes:
+            break
+
+    return stats
+
+
+def expire_upload_sessions(max_age: float, dry_run: bool = False) -> int:
+    """
+    Delete incomplete upload sessions idle for longer than max_age, with their chunks.
+
+    A session is idle once it is older than max_age and no chunk was stored
+    for max_age. Chunk directories left without an incomplete session (e.g.
+    sessions deleted together with their case) are removed too.
+
+    Args:
+        max_age: Seconds of inactivity after which a session is abandoned.
+        dry_run: Report the sessions and directories without deleting them.
+
+    Returns:
+        int: Number of sessions and orphaned chunk directories expired.
+    """
+    cutoff = time.time() - max_age
+    expired = 0
+    sessions = UploadSession.objects.filter(
+        completed_at__isnull=True,
+        created_at__lt=timezone.now() - datetime.timedelta(seconds=max_age),
+    )
+    for session in sessions.iterator():
+        directory = resumable.session_dir(session)
+        if directory.is_dir() and directory.stat().st_mtime > cutoff:
+            continue
+        expired += 1
+        if not dry_run:
+            resumable.discard(session)
+            session.delete()
+
+    root = resumable.get_upload_dir()
+    if not root.is_dir():
+        return expired
+    for entry in os.scandir(root):
+        try:
+            session_id = uuid.UUID(entry.name)
+        except ValueError:
+            continue
+        if not entry.is_dir() or entry.stat().st_mtime > cutoff:
+            continue
+        if UploadSession.objects.filter(pk=session_id, completed_at__isnull=True).exists():
+            continue
+        expired += 1
+        if not dry_run:
+            resumable.discard(UploadSession(pk=session_id))
+    return expired
@@ -0,0 +1,103 @@
+"""
+Management command to delete document files that no document references.
+
+Usage:
+    python manage.py gc_documents                     # Delete orphans
+    python manage.py gc_documents --dry-run           # Only report them
+    python manage.py gc_documents --max-rate 50       # At most 50 deletions/s
+    python manage.py gc_documents --start-after NAME  # Resume an interrupted run
+
+Also expires resumable upload sessions abandoned for RESUMABLE_UPLOAD_TTL
+seconds (--upload-ttl), with their chunks.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from documents.gc import collect_orphans, expire_upload_sessions
+from documents.models import Document
+from documents.storage import select_document_storage
+
+
+class Command(BaseCommand):
+    """Garbage-collect orphaned document files."""
+
+    help = 'Delete files under the document storage that no document references'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report orphaned files without deleting them',
+        )
+        parser.add_argument(
+            '--grace-period',
+            type=float,
+            default=getattr(settings, 'DOCUMENT_GC_GRACE_PERIOD', 24 * 3600),
+            help='Seconds a file must be unmodified before it can be deleted',
+        )
+        parser.add_argument(
+            '--max-rate',
+            type=float,
+            default=None,
+            help='Maximum number of deletions per second',
+        )
+        parser.add_argument(
+            '--max-deletes',
+            type=int,
+            default=None,
+            help='Stop after deleting this many files',
+        )
+        parser.add_argument(
+            '--upload-ttl',
+            type=float,
+            default=getattr(settings, 'RESUMABLE_UPLOAD_TTL', 24 * 3600),
+            help='Seconds after which an inactive, incomplete upload session is deleted',
+        )
+        parser.add_argument(
+            '--start-after',
+            default='',
+            help='Resume after this storage name (printed in progress reports)',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        storage = select_document_storage()
+        if not hasattr(storage, 'location'):
+            raise CommandError('gc_documents only supports file system storage.')
+
+        prefix = Document._meta.get_field('file').upload_to
+        dry_run = options['dry_run']
+
+        def report_progress(stats):
+            self.stdout.write(
+                f'  {stats.examined} files examined, {stats.deleted} orphans '
+                f'(last: {stats.last_name})'
+            )
+
+        stats = collect_orphans(
+            storage,
+            prefix,
+            grace_period=options['grace_period'],
+            dry_run=dry_run,
+            start_after=options['start_after'],
+            max_rate=options['max_rate'],
+            max_deletes=options['max_deletes'],
+            on_progress=report_progress if options['verbosity'] > 1 else None,
+        )
+
+        action = 'Would delete' if dry_run else 'Deleted'
+        expired = expire_upload_sessions(options['upload_ttl'], dry_run=dry_run)
+        self.stdout.write(f'{action} {expired} abandoned upload sessions.')
+        self.stdout.write(
+            f'Examined {stats.examined} files: {stats.referenced} referenced, '
+            f'{stats.in_grace_period} within the grace period.'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {stats.deleted} orphaned files '
+            f'({filesizeformat(stats.reclaimed_bytes)}, {stats.reclaimed_bytes} bytes).'
+        ))
+        if options['max_deletes'] and stats.deleted >= options['max_deletes']:
+            self.stdout.write(f'Stopped early; resume with --start-after {stats.last_name}')
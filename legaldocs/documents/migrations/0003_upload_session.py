@@ -0,0 +1,41 @@
+# Generated by Django 5.0.11 on 2026-10-19 03:15
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0002_add_performance_indexes'),
+        ('documents', '0002_add_performance_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('document_type', models.CharField(choices=[('contrato', 'Contrato'), ('demanda', 'Demanda'), ('poder', 'Poder'), ('sentencia', 'Sentencia'), ('escritura', 'Escritura'), ('otro', 'Otro')], max_length=20, verbose_name='Tipo de documento')),
+                ('title', models.CharField(max_length=200, verbose_name='Título')),
+                ('description', models.TextField(blank=True, verbose_name='Descripción')),
+                ('is_confidential', models.BooleanField(default=False, verbose_name='Confidencial')),
+                ('file_name', models.CharField(max_length=255, verbose_name='Nombre del archivo')),
+                ('total_size', models.BigIntegerField(verbose_name='Tamaño total (bytes)')),
+                ('chunk_size', models.IntegerField(verbose_name='Tamaño de fragmento (bytes)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de finalización')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='cases.case', verbose_name='Caso')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='Creado por')),
+                ('document', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_session', to='documents.document', verbose_name='Documento')),
+            ],
+            options={
+                'verbose_name': 'Sesión de carga',
+                'verbose_name_plural': 'Sesiones de carga',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.11 on 2026-10-19 03:17
+
+import documents.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='Hash SHA-256'),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='file',
+            field=models.FileField(storage=documents.storage.select_document_storage, upload_to='legal_documents/', verbose_name='Archivo'),
+        ),
+    ]
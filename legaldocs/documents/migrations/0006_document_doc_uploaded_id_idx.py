@@ -0,0 +1,20 @@
+# Generated by Django 5.0.11 on 2026-10-19 03:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0003_case_case_start_date_id_idx'),
+        ('documents', '0005_document_thumbnail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-uploaded_at', '-id'], name='doc_uploaded_id_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.11 on 2026-10-19 04:37
+
+from django.db import migrations, models
+
+from core.db.operations import AddIndexConcurrently, RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently on PostgreSQL, outside a transaction,
+    # so that the table stays writable during the build
+    atomic = False
+
+    dependencies = [
+        ('documents', '0006_document_doc_uploaded_id_idx'),
+    ]
+
+    operations = [
+        # Create the composite indexes before dropping the ones they replace
+        AddIndexConcurrently(
+            model_name='document',
+            index=models.Index(fields=['case', '-uploaded_at', '-id'], name='doc_case_uploaded_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='document',
+            index=models.Index(fields=['document_type', '-uploaded_at', '-id'], name='doc_type_uploaded_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='document',
+            name='doc_case_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='document',
+            name='doc_uploaded_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='document',
+            name='doc_type_idx',
+        ),
+    ]
@@ -1,5 +1,9 @@
+import uuid
+
 from django.db import models
 
+from .storage import content_sha256, select_document_storage
+
 
 class Document(models.Model):
     """
@@ -8,6 +12,10 @@ class Document(models.Model):
     Stores document metadata including type, file reference,
     and upload information. Documents are automatically deleted
     when their associated case is deleted (CASCADE).
+
+    Files are stored content-addressed (see documents.storage): documents
+    with identical content share one stored file, identified by content_hash.
+    A preview thumbnail is generated in the background (see documents.previews).
     """
 
     DOCUMENT_TYPE_CHOICES = [
@@ -40,12 +48,26 @@ class Document(models.Model):
     )
     file = models.FileField(
         upload_to='legal_documents/',
+        storage=select_document_storage,
         verbose_name="Archivo"
     )
     file_size = models.IntegerField(
         editable=False,
         verbose_name="Tamaño del archivo (bytes)"
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="Hash SHA-256"
+    )
+    thumbnail = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        verbose_name="Miniatura"
+    )
     uploaded_by = models.ForeignKey(
         'auth.User',
         on_delete=models.SET_NULL,
@@ -68,9 +90,12 @@ class Document(models.Model):
         verbose_name = "Documento"
         verbose_name_plural = "Documentos"
         indexes = [
-            models.Index(fields=['case'], name='doc_case_idx'),
-            models.Index(fields=['-uploaded_at'], name='doc_uploaded_idx'),
-            models.Index(fields=['document_type'], name='doc_type_idx'),
+            # Keyset pagination over the default ordering (uploaded_at, id)
+            models.Index(fields=['-uploaded_at', '-id'], name='doc_uploaded_id_idx'),
+            # List filtered by case or type, in the default ordering; the
+            # leading column also serves case lookups and type counts
+            models.Index(fields=['case', '-uploaded_at', '-id'], name='doc_case_uploaded_idx'),
+            models.Index(fields=['document_type', '-uploaded_at', '-id'], name='doc_type_uploaded_idx'),
         ]
 
     def __str__(self) -> str:
@@ -78,8 +103,109 @@ class Document(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Override save to auto-calculate file_size from uploaded file.
+        Override save to auto-calculate file_size and content_hash from uploaded file.
+
+        A new file also clears the thumbnail until the new one is generated.
         """
         if self.file:
             self.file_size = self.file.size
+            if not self.file._committed:
+                self.content_hash = content_sha256(self.file.file)
+                self.thumbnail = ''
         super().save(*args, **kwargs)
+
+
+class UploadSession(models.Model):
+    """
+    Tracks a resumable, chunked upload that becomes a Document on completion.
+
+    Stores the metadata of the future document and the declared file size.
+    Chunks are written to disk as they arrive (see documents.resumable), so
+    the session row itself is not touched while chunks are uploaded.
+    """
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    case = models.ForeignKey(
+        'cases.Case',
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name="Caso"
+    )
+    document_type = models.CharField(
+        max_length=20,
+        choices=Document.DOCUMENT_TYPE_CHOICES,
+        verbose_name="Tipo de documento"
+    )
+    title = models.CharField(
+        max_length=200,
+        verbose_name="Título"
+    )
+    description = models.TextField(
+        blank=True,
+        verbose_name="Descripción"
+    )
+    is_confidential = models.BooleanField(
+        default=False,
+        verbose_name="Confidencial"
+    )
+    file_name = models.CharField(
+        max_length=255,
+        verbose_name="Nombre del archivo"
+    )
+    total_size = models.BigIntegerField(
+        verbose_name="Tamaño total (bytes)"
+    )
+    chunk_size = models.IntegerField(
+        verbose_name="Tamaño de fragmento (bytes)"
+    )
+    created_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name="Creado por"
+    )
+    document = models.OneToOneField(
+        Document,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload_session',
+        verbose_name="Documento"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Fecha de creación"
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fecha de finalización"
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Sesión de carga"
+        verbose_name_plural = "Sesiones de carga"
+
+    def __str__(self) -> str:
+        return f"{self.file_name} ({self.id})"
+
+    @property
+    def chunk_count(self) -> int:
+        """Return the number of chunks needed to cover total_size."""
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def expected_chunk_size(self, index: int) -> int:
+        """
+        Return the exact size in bytes expected for a chunk.
+
+        Every chunk is chunk_size bytes except the last, which holds
+        the remainder.
+        """
+        if index < self.chunk_count - 1:
+            return self.chunk_size
+        return self.total_size - self.chunk_size * (self.chunk_count - 1)
@@ -0,0 +1,141 @@
+"""
+Thumbnail generation for document files.
+
+Produces a small JPEG preview for images (JPEG/PNG, resized with Pillow)
+and for PDFs (first page, rendered with poppler's pdftoppm when it is
+installed). Thumbnails are stored next to the document file as
+``<file name>.thumb.jpg``; since document files are content-addressed,
+documents with the same content share one thumbnail and it is never
+rendered twice.
+
+Generation runs in the background job queue after the document is saved
+(see documents.tasks), never inside the request.
+"""
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+PDF_EXTENSIONS = {'.pdf'}
+
+# Seconds allowed for rendering the first page of a PDF
+PDF_RENDER_TIMEOUT = 30
+
+
+def get_thumbnail_size() -> tuple:
+    """Return the maximum (width, height) of thumbnails."""
+    return tuple(getattr(settings, 'DOCUMENT_THUMBNAIL_SIZE', (256, 256)))
+
+
+def thumbnail_name(file_name: str) -> str:
+    """Return the storage name of the thumbnail for a file."""
+    return f'{os.path.splitext(file_name)[0]}.thumb.jpg'
+
+
+def supports_thumbnail(file_name: str) -> bool:
+    """Return True if a thumbnail can be generated for the file type."""
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return True
+    return extension in PDF_EXTENSIONS and shutil.which('pdftoppm') is not None
+
+
+def _image_thumbnail(source) -> Image.Image:
+    """Open an image file and return it reduced to the thumbnail size."""
+    size = get_thumbnail_size()
+    image = Image.open(source)
+    image.draft('RGB', size)
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(size)
+    return image
+
+
+def _pdf_thumbnail(path: str) -> Image.Image:
+    """Render the first page of a PDF and return it as a thumbnail."""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'page')
+        subprocess.run(
+            [
+                'pdftoppm', '-jpeg', '-f', '1', '-l', '1', '-singlefile',
+                '-scale-to', str(max(get_thumbnail_size())), path, output,
+            ],
+            check=True,
+            capture_output=True,
+            timeout=PDF_RENDER_TIMEOUT,
+        )
+        with Image.open(f'{output}.jpg') as page:
+            page.load()
+            page.thumbnail(get_thumbnail_size())
+            return page.copy()
+
+
+def render_thumbnail(storage, file_name: str) -> bytes:
+    """
+    Render the thumbnail of a stored file as JPEG bytes.
+
+    Args:
+        storage: Storage holding the file.
+        file_name: Storage name of the file.
+
+    Returns:
+        bytes: JPEG data.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in PDF_EXTENSIONS:
+        image = _pdf_thumbnail(storage.path(file_name))
+    else:
+        with storage.open(file_name, 'rb') as source:
+            image = _image_thumbnail(source)
+
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    output = io.BytesIO()
+    image.save(output, 'JPEG', quality=80, optimize=True)
+    return output.getvalue()
+
+
+def generate_thumbnail(document_id: int) -> str:
+    """
+    Create (or reuse) the thumbnail of a document and record it.
+
+    Args:
+        document_id: Primary key of the Document.
+
+    Returns:
+        str: Storage name of the thumbnail, or '' if none could be made.
+    """
+    from django.core.files.storage import default_storage
+
+    from core.signals import rows_updated
+
+    from .models import Document
+
+    document = Document.objects.filter(pk=document_id).only('file', 'thumbnail').first()
+    if document is None or not document.file or not supports_thumbnail(document.file.name):
+        return ''
+
+    name = thumbnail_name(document.file.name)
+    if not default_storage.exists(name):
+        try:
+            data = render_thumbnail(document.file.storage, document.file.name)
+        except Exception:
+            logger.exception('Could not render thumbnail for document %s', document_id)
+            return ''
+        name = default_storage.save(name, ContentFile(data))
+
+    # Only record it if the file was not replaced in the meantime
+    if Document.objects.filter(pk=document_id, file=document.file.name).update(thumbnail=name):
+        # update() sends no signals: ETags and synced data include thumbnail_url
+        rows_updated(Document, [document_id])
+    return name
+
@@ -0,0 +1,185 @@
+"""
+Chunk storage for resumable document uploads.
+
+Each UploadSession owns a directory under RESUMABLE_UPLOAD_DIR holding
+one file per received chunk (``<index>.part``). Chunks may arrive in any
+order and in parallel; each is written to a private temporary file and
+atomically renamed into place once complete. On completion the parts are
+concatenated with kernel-side copies (copy_file_range/sendfile), so file
+data never passes through Python buffers.
+"""
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+
+# Size of the buffer used to read a chunk from the request body
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkSizeError(Exception):
+    """Raised when a received chunk does not have the expected size."""
+
+
+class AssembledUpload(File):
+    """
+    File wrapper for an assembled upload.
+
+    Exposes temporary_file_path() so FileSystemStorage moves the file into
+    place instead of copying it again.
+    """
+
+    def __init__(self, path, name):
+        super().__init__(open(path, 'rb'), name=name)
+        self.path = path
+
+    def temporary_file_path(self) -> str:
+        """Return the on-disk path of the assembled file."""
+        return self.path
+
+
+def get_upload_dir() -> Path:
+    """Return the root directory for resumable upload chunks."""
+    return Path(getattr(settings, 'RESUMABLE_UPLOAD_DIR', settings.BASE_DIR / 'tmp' / 'uploads'))
+
+
+def session_dir(session) -> Path:
+    """Return the chunk directory of an upload session."""
+    return get_upload_dir() / str(session.id)
+
+
+def chunk_path(session, index: int) -> Path:
+    """Return the path of a chunk file."""
+    return session_dir(session) / f'{index}.part'
+
+
+def write_chunk(session, index: int, stream) -> int:
+    """
+    Stream a chunk from a file-like object to disk.
+
+    The data is written to a private temporary file and renamed into place
+    only once it has the exact expected size, so concurrent or retried
+    uploads of the same chunk never expose a partial file.
+
+    Args:
+        session: The UploadSession receiving the chunk.
+        index: Zero-based chunk number.
+        stream: File-like object to read the chunk body from.
+
+    Returns:
+        int: Number of bytes written.
+
+    Raises:
+        ChunkSizeError: If the body size differs from the expected size.
+    """
+    expected = session.expected_chunk_size(index)
+    directory = session_dir(session)
+    directory.mkdir(parents=True, exist_ok=True)
+    temp_path = directory / f'{index}.part.{uuid.uuid4().hex}.tmp'
+
+    written = 0
+    try:
+        with open(temp_path, 'wb') as destination:
+            while True:
+                block = stream.read(READ_BLOCK_SIZE)
+                if not block:
+                    break
+                written += len(block)
+                if written > expected:
+                    break
+                destination.write(block)
+        if written != expected:
+            raise ChunkSizeError(
+                f'El fragmento {index} debe tener {expected} bytes.'
+            )
+        os.replace(temp_path, chunk_path(session, index))
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return written
+
+
+def received_chunks(session) -> list:
+    """Return the sorted indexes of the chunks already stored."""
+    directory = session_dir(session)
+    if not directory.is_dir():
+        return []
+    indexes = []
+    for entry in os.scandir(directory):
+        stem, _, suffix = entry.name.partition('.')
+        if suffix == 'part' and stem.isdigit():
+            indexes.append(int(stem))
+    return sorted(indexes)
+
+
+def missing_ranges(session, received=None) -> list:
+    """
+    Return the chunks still to be uploaded as inclusive [start, end] ranges.
+
+    Args:
+        session: The UploadSession.
+        received: Sorted indexes of the stored chunks (read from disk if None).
+
+    Returns:
+        list: [start, end] pairs in ascending order, e.g. [[0, 0], [2, 5]].
+    """
+    if received is None:
+        received = received_chunks(session)
+    ranges = []
+    start = 0
+    for index in received + [session.chunk_count]:
+        if index > start:
+            ranges.append([start, index - 1])
+        start = index + 1
+    return ranges
+
+
+def _copy_range(source, destination, count: int) -> None:
+    """Append count bytes from source to destination using kernel copies."""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while count:
+                copied = os.copy_file_range(source.fileno(), destination.fileno(), count)
+                if not copied:
+                    break
+                count -= copied
+            return
+        except OSError:
+            pass
+    try:
+        offset = source.tell()
+        while count:
+            sent = os.sendfile(destination.fileno(), source.fileno(), offset, count)
+            if not sent:
+                break
+            offset += sent
+            count -= sent
+        destination.seek(0, os.SEEK_END)
+        return
+    except (AttributeError, OSError):
+        pass
+    shutil.copyfileobj(source, destination)
+
+
+def assemble(session) -> Path:
+    """
+    Concatenate all chunks of a session into a single file.
+
+    Returns:
+        Path: Path of the assembled file inside the session directory.
+    """
+    target = session_dir(session) / 'assembled'
+    with open(target, 'wb') as destination:
+        for index in range(session.chunk_count):
+            with open(chunk_path(session, index), 'rb') as source:
+                _copy_range(source, destination, session.expected_chunk_size(index))
+    return target
+
+
+def discard(session) -> None:
+    """Delete all stored chunks of a session."""
+    shutil.rmtree(session_dir(session), ignore_errors=True)
@@ -4,11 +4,23 @@ Serializers for the Document model.
 Provides DocumentSerializer with case info and uploader username
 for comprehensive document data representation in API responses.
 Includes file upload validation for type and size.
+
+Also provides DocumentListSerializer, a fast read-only equivalent of
+DocumentSerializer for the list action, and UploadSessionSerializer for
+resumable chunked uploads.
 """
 
+import os
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
 
-from .models import Document
+from api.fast_serializers import FastListSerializer
+
+from . import resumable
+from .models import Document, UploadSession
 from .validators import validate_file_upload
 
 
@@ -19,6 +31,7 @@ class DocumentSerializer(serializers.ModelSerializer):
     Includes computed fields:
     - case_number: The case number from the related case
     - uploaded_by_username: The username of the user who uploaded the document
+    - thumbnail_url: URL of the preview thumbnail, or None if not available
 
     File Validation:
     - Validates file type using python-magic (PDF, DOC, DOCX, TXT, JPG, PNG)
@@ -32,11 +45,20 @@ class DocumentSerializer(serializers.ModelSerializer):
         source='case.case_number',
         read_only=True
     )
+    thumbnail_url = serializers.SerializerMethodField()
 
     def get_uploaded_by_username(self, obj):
         """Return the username of the uploader, or None if no uploader."""
         return obj.uploaded_by.username if obj.uploaded_by else None
 
+    def get_thumbnail_url(self, obj):
+        """Return the URL of the thumbnail endpoint, or None if not generated yet."""
+        if not obj.thumbnail:
+            return None
+        url = reverse('document-thumbnail', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
     def validate_file(self, value):
         """
         Validate the uploaded file for type and size.
@@ -64,9 +86,122 @@ class DocumentSerializer(serializers.ModelSerializer):
             'description',
             'file',
             'file_size',
+            'thumbnail_url',
             'is_confidential',
             'uploaded_by',
             'uploaded_by_username',
             'uploaded_at',
         ]
         read_only_fields = ['file_size', 'uploaded_by', 'uploaded_at']
+
+
+class DocumentListSerializer(FastListSerializer):
+    """Fast list representation, identical to DocumentSerializer."""
+
+    serializer_class = DocumentSerializer
+    method_sources = {
+        'uploaded_by_username': ['uploaded_by__username'],
+        'thumbnail_url': ['id', 'thumbnail'],
+    }
+
+    def get_uploaded_by_username(self, username):
+        """Return the joined username (None when there is no uploader)."""
+        return username
+
+    def get_thumbnail_url(self, pk, thumbnail):
+        """Return the thumbnail URL as DocumentSerializer.get_thumbnail_url does."""
+        return self.serializer.get_thumbnail_url(SimpleNamespace(pk=pk, thumbnail=thumbnail))
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for resumable upload sessions.
+
+    Includes computed fields:
+    - chunk_count: Number of chunks needed to cover total_size
+    - received_chunks: Indexes of the chunks already stored
+    - missing_chunks: Chunks still to be uploaded, as [start, end] ranges
+
+    total_size is limited by RESUMABLE_UPLOAD_MAX_SIZE. chunk_size defaults
+    to RESUMABLE_UPLOAD_CHUNK_SIZE and may not exceed it, nor be smaller
+    than RESUMABLE_UPLOAD_MIN_CHUNK_SIZE unless the file fits in one chunk.
+    """
+
+    chunk_size = serializers.IntegerField(required=False, min_value=1)
+    chunk_count = serializers.IntegerField(read_only=True)
+    received_chunks = serializers.SerializerMethodField()
+    missing_chunks = serializers.SerializerMethodField()
+
+    def get_received_chunks(self, obj):
+        """Return the indexes of the chunks already stored."""
+        return resumable.received_chunks(obj)
+
+    def get_missing_chunks(self, obj):
+        """Return the chunks still to be uploaded as [start, end] ranges."""
+        return resumable.missing_ranges(obj)
+
+    def validate_file_name(self, value):
+        """Strip any directory components from the file name."""
+        name = os.path.basename(value.replace('\\', '/'))
+        if not name:
+            raise serializers.ValidationError('Nombre de archivo inválido.')
+        return name
+
+    def validate_total_size(self, value):
+        """Check the declared size against RESUMABLE_UPLOAD_MAX_SIZE."""
+        max_size = getattr(settings, 'RESUMABLE_UPLOAD_MAX_SIZE', 200 * 1024 * 1024)
+        if value < 1:
+            raise serializers.ValidationError('El archivo enviado está vacío.')
+        if value > max_size:
+            raise serializers.ValidationError(
+                f'El archivo excede el tamaño máximo de {max_size / (1024 * 1024):.0f} MB.'
+            )
+        return value
+
+    def validate_chunk_size(self, value):
+        """Check the chunk size against RESUMABLE_UPLOAD_CHUNK_SIZE."""
+        max_chunk = getattr(settings, 'RESUMABLE_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+        if value > max_chunk:
+            raise serializers.ValidationError(
+                f'El tamaño de fragmento no puede superar {max_chunk} bytes.'
+            )
+        return value
+
+    def validate(self, attrs):
+        """Check that the chunk size keeps the chunk count bounded."""
+        min_chunk = getattr(settings, 'RESUMABLE_UPLOAD_MIN_CHUNK_SIZE', 256 * 1024)
+        chunk_size = attrs.get('chunk_size')
+        if chunk_size is not None and chunk_size < min(min_chunk, attrs['total_size']):
+            raise serializers.ValidationError({
+                'chunk_size': f'El tamaño de fragmento debe ser de al menos {min_chunk} bytes.'
+            })
+        return attrs
+
+    def create(self, validated_data):
+        """Create the session, applying the default chunk size."""
+        validated_data.setdefault(
+            'chunk_size',
+            getattr(settings, 'RESUMABLE_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+        )
+        return super().create(validated_data)
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id',
+            'case',
+            'title',
+            'document_type',
+            'description',
+            'is_confidential',
+            'file_name',
+            'total_size',
+            'chunk_size',
+            'chunk_count',
+            'received_chunks',
+            'missing_chunks',
+            'document',
+            'created_at',
+            'completed_at',
+        ]
+        read_only_fields = ['document', 'created_at', 'completed_at']
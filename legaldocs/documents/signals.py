@@ -0,0 +1,62 @@
+"""
+Signal handlers for the documents app.
+
+Release stored files when the last Document referencing them is deleted
+or has its file replaced. Files are released after the transaction
+commits, so a rollback never leaves a row pointing at a deleted file.
+
+New files also get a thumbnail job in the background queue; the job is
+written in the same transaction as the document.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.jobs import enqueue
+
+from .models import Document
+from .previews import supports_thumbnail
+from .storage import release_file
+
+
+@receiver(pre_save, sender=Document)
+def remember_replaced_file(sender, instance, **kwargs):
+    """Record the previous file name when a new file is being uploaded."""
+    instance._replaced_file = None
+    if instance.pk and instance.file and not instance.file._committed:
+        instance._replaced_file = (
+            Document.objects.filter(pk=instance.pk)
+            .values_list('file', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Document)
+def release_replaced_file(sender, instance, **kwargs):
+    """Release the previous file once the replacement is committed."""
+    replaced = getattr(instance, '_replaced_file', None)
+    if replaced and replaced != instance.file.name:
+        transaction.on_commit(lambda: release_file(replaced))
+
+
+@receiver(post_save, sender=Document)
+def generate_preview(sender, instance, created, **kwargs):
+    """Enqueue thumbnail generation when a document gets a new file."""
+    if not getattr(settings, 'DOCUMENT_PREVIEWS_ENABLED', True):
+        return
+    if instance.thumbnail or not instance.file:
+        return
+    if not (created or getattr(instance, '_replaced_file', None)):
+        return
+    if supports_thumbnail(instance.file.name):
+        enqueue('documents.generate_thumbnail', {'document_id': instance.pk})
+
+
+@receiver(post_delete, sender=Document)
+def release_deleted_file(sender, instance, **kwargs):
+    """Release the file of a deleted document once the delete is committed."""
+    name = instance.file.name
+    if name:
+        transaction.on_commit(lambda: release_file(name))
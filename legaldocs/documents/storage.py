@@ -0,0 +1,158 @@
+"""
+Content-addressed storage for document files.
+
+Stores each distinct file content once, under a name derived from its
+SHA-256 digest:
+
+    legal_documents/<aa>/<bb>/<sha256><ext>
+
+Uploading a file whose content is already stored only creates the new
+Document row; no bytes are written. Blobs are shared by every Document
+with the same content and removed by release_file() once the last
+referencing row is gone, unless they were just reused: those are left to
+the orphan collector (documents.gc).
+"""
+
+import datetime
+import hashlib
+import os
+import posixpath
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage, storages
+from django.utils import timezone
+
+from .previews import thumbnail_name
+
+# Longest file extension kept in content-addressed names
+MAX_EXTENSION_LENGTH = 10
+
+
+def content_sha256(content) -> str:
+    """
+    Return the SHA-256 hex digest of a file object.
+
+    Uses the digest computed while streaming the upload when available
+    (see StreamingUploadHandler); otherwise hashes the content chunk by
+    chunk and caches the result on the object.
+
+    Args:
+        content: Django File or UploadedFile object.
+
+    Returns:
+        str: Hex digest of the content.
+    """
+    digest = getattr(content, 'sha256', None)
+    if digest:
+        return digest
+
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    content.seek(0)
+    content.sha256 = hasher.hexdigest()
+    return content.sha256
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names files by the SHA-256 of their content.
+
+    The upload_to directory of the field is kept as prefix, followed by two
+    levels of fan-out directories so no directory grows too large.
+    Writes go to a temporary name and are atomically renamed, so concurrent
+    uploads of the same content are safe.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """Return name unchanged; the final name is chosen in _save()."""
+        return name
+
+    def hashed_name(self, name, digest) -> str:
+        """Return the content-addressed name for a file."""
+        directory = posixpath.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        if len(extension) > MAX_EXTENSION_LENGTH:
+            extension = ''
+        return posixpath.join(directory, digest[:2], digest[2:4], f'{digest}{extension}')
+
+    def _save(self, name, content):
+        """Store content under its hashed name unless it already exists."""
+        name = self.hashed_name(name, content_sha256(content))
+        try:
+            # Refresh the mtime so the orphan collector (documents.gc) treats
+            # the reused blob as recent while the new row is committed
+            os.utime(self.path(name))
+            return name
+        except FileNotFoundError:
+            pass
+
+        temp_name = super()._save(f'{name}.{uuid.uuid4().hex}.tmp', content)
+        os.replace(self.path(temp_name), self.path(name))
+        return name
+
+
+def name_digest(name: str):
+    """
+    Return the SHA-256 digest encoded in a content-addressed name.
+
+    Works for blobs (<sha256><ext>) and their thumbnails
+    (<sha256>.thumb.jpg).
+
+    Returns:
+        str: The digest, or None for names not derived from a digest.
+    """
+    stem = posixpath.basename(name).split('.', 1)[0]
+    if len(stem) == 64 and all(char in '0123456789abcdef' for char in stem):
+        return stem
+    return None
+
+
+def select_document_storage():
+    """Return the storage configured for document files (STORAGES['documents'])."""
+    return storages['documents']
+
+
+def release_file(name: str) -> bool:
+    """
+    Delete a stored file (and its thumbnail) if no Document references it anymore.
+
+    A blob modified within DOCUMENT_RELEASE_GRACE_PERIOD is kept: a
+    concurrent upload of the same content may have reused it (_save()
+    refreshes its mtime) for a row that is not committed yet. The orphan
+    collector deletes it later if it stays unreferenced.
+
+    Args:
+        name: Storage name of the file.
+
+    Returns:
+        bool: True if the file was deleted.
+    """
+    from .models import Document
+
+    if not name:
+        return False
+
+    references = Document.objects.filter(file=name)
+    digest = name_digest(name)
+    if digest:
+        # Narrow the lookup through the content_hash index
+        references = references.filter(content_hash=digest)
+    if references.exists():
+        return False
+
+    storage = select_document_storage()
+    if not storage.exists(name):
+        default_storage.delete(thumbnail_name(name))
+        return False
+    grace_period = datetime.timedelta(seconds=getattr(settings, 'DOCUMENT_RELEASE_GRACE_PERIOD', 300))
+    try:
+        if storage.get_modified_time(name) > timezone.now() - grace_period:
+            return False
+    except FileNotFoundError:
+        return False
+
+    default_storage.delete(thumbnail_name(name))
+    storage.delete(name)
+    return True
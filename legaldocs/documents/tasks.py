@@ -0,0 +1,13 @@
+"""
+Background tasks of the documents app, executed by the job queue (core.jobs).
+"""
+
+from core.jobs import task
+
+from .previews import generate_thumbnail as _generate_thumbnail
+
+
+@task('documents.generate_thumbnail')
+def generate_thumbnail(document_id: int) -> None:
+    """Render and record the thumbnail of a document."""
+    _generate_thumbnail(document_id)
@@ -0,0 +1,166 @@
+"""
+Tests for the document download endpoint.
+
+Tests file delivery, ETag/If-None-Match, Range requests, proxy
+offloading and access to confidential documents.
+"""
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.checks import check_download_backend
+from documents.downloads import DOWNLOAD_BACKENDS
+from documents.models import Document
+
+CONTENT = b'%PDF-1.4\n' + b'0123456789' * 100
+
+
+class DocumentDownloadTests(APITestCase):
+    """Tests for DocumentViewSet.download."""
+
+    def setUp(self):
+        """Create users, a case and a document."""
+        use_temporary_media_root(self)
+        self.owner = User.objects.create_user(username='owner', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.owner_token = Token.objects.create(user=self.owner)
+        self.other_token = Token.objects.create(user=self.other)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.owner_token.key}')
+
+        client_obj = Client.objects.create(
+            full_name='Download Client',
+            identification_number='DWN001',
+            email='dwn@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Download Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.document = Document.objects.create(
+            case=self.case,
+            title='Demanda Inicial',
+            document_type='demanda',
+            file=SimpleUploadedFile('demanda.pdf', CONTENT, 'application/pdf'),
+            uploaded_by=self.owner
+        )
+        self.url = f'/api/v1/documents/{self.document.id}/download/'
+
+    def test_download_full_file(self):
+        """Test downloading the whole file."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['ETag'], f'"{self.document.content_hash}"')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('demanda-inicial.pdf', response['Content-Disposition'])
+
+    def test_download_with_specific_accept_header(self):
+        """Test that an Accept header for the file type is not rejected."""
+        response = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_none_match_returns_304(self):
+        """Test that a matching ETag returns Not Modified."""
+        etag = f'"{self.document.content_hash}"'
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_range_request(self):
+        """Test that a byte range returns Partial Content."""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=9-18')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[9:19])
+        self.assertEqual(response['Content-Range'], f'bytes 9-18/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '10')
+
+    def test_suffix_range_request(self):
+        """Test that a suffix range returns the last bytes."""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[-5:])
+
+    def test_unsatisfiable_range(self):
+        """Test that a range past the end returns 416."""
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_if_range_mismatch_returns_full_file(self):
+        """Test that a stale If-Range ignores the Range header."""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(
+        DOCUMENT_DOWNLOAD_BACKEND='x-accel-redirect',
+        DOCUMENT_ACCEL_REDIRECT_PREFIX='/protected-media/'
+    )
+    def test_x_accel_redirect(self):
+        """Test that nginx offloading returns an empty body and the internal path."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            f'/protected-media/{self.document.file.name}'
+        )
+
+    @override_settings(DOCUMENT_DOWNLOAD_BACKEND='x-sendfile')
+    def test_x_sendfile(self):
+        """Test that Apache offloading returns the file path."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Sendfile'], self.document.file.path)
+
+    @override_settings(DOCUMENT_DOWNLOAD_BACKEND='x-accel')
+    def test_unknown_backend_rejected(self):
+        """Test that a misspelled backend is an error, not a silent X-Sendfile."""
+        with self.assertRaises(ImproperlyConfigured):
+            self.client.get(self.url)
+
+    def test_download_backend_check(self):
+        """Test that the system check reports an unknown backend and accepts the known ones."""
+        with override_settings(DOCUMENT_DOWNLOAD_BACKEND='x-accel'):
+            errors = check_download_backend(None)
+        self.assertEqual([error.id for error in errors], ['documents.E001'])
+        for backend in DOWNLOAD_BACKENDS:
+            with override_settings(DOCUMENT_DOWNLOAD_BACKEND=backend):
+                self.assertEqual(check_download_backend(None), [])
+
+    def test_confidential_document_denied_to_other_user(self):
+        """Test that other users cannot download confidential documents."""
+        self.document.is_confidential = True
+        self.document.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.other_token.key}')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_confidential_document_allowed_to_assigned_lawyer(self):
+        """Test that the lawyer assigned to the case can download confidential documents."""
+        self.document.is_confidential = True
+        self.document.save()
+        self.case.assigned_to = self.other
+        self.case.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.other_token.key}')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_download_unauthenticated(self):
+        """Test that unauthenticated users cannot download."""
+        self.client.credentials()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,211 @@
+"""
+Tests for the orphaned document file collector.
+
+Tests the sorted storage walk, the merge-join against database
+references, the grace period and the gc_documents command.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from cases.models import Case
+from clients.models import Client
+from core.query_plans import explain
+from documents import resumable
+from documents.gc import (
+    collect_orphans, expire_upload_sessions, is_referenced, referenced_names, walk_storage
+)
+from documents.models import Document, UploadSession
+from documents.storage import select_document_storage
+
+OLD = time.time() - 7 * 24 * 3600
+
+
+class OrphanCollectorTests(TestCase):
+    """Tests for documents.gc and the gc_documents command."""
+
+    def setUp(self):
+        """Create a case and an isolated MEDIA_ROOT."""
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        client_obj = Client.objects.create(
+            full_name='GC Client',
+            identification_number='GCC001',
+            email='gc@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='GC Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.storage = select_document_storage()
+
+    def _document(self, content):
+        """Create a document whose file is old enough to be collected."""
+        document = Document.objects.create(
+            case=self.case,
+            title='Contrato',
+            document_type='contrato',
+            file=SimpleUploadedFile('contrato.pdf', content, 'application/pdf')
+        )
+        os.utime(self.storage.path(document.file.name), (OLD, OLD))
+        return document
+
+    def _orphan(self, name, content=b'huerfano', mtime=OLD):
+        """Write a file that no document references."""
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as output:
+            output.write(content)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_walk_is_sorted_like_strings(self):
+        """Test that directories sort as 'name/' so the walk matches string order."""
+        for name in ['legal_documents/a/x.pdf', 'legal_documents/a-b.pdf',
+                     'legal_documents/a.pdf', 'legal_documents/b/c/d.pdf']:
+            self._orphan(name)
+        names = [stored.name for stored in walk_storage(self.media_root, 'legal_documents')]
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), 4)
+
+    def test_walk_resumes_after_name(self):
+        """Test that start_after skips everything up to the given name."""
+        for name in ['legal_documents/a/x.pdf', 'legal_documents/b/y.pdf', 'legal_documents/c.pdf']:
+            self._orphan(name)
+        names = [stored.name for stored in walk_storage(
+            self.media_root, 'legal_documents', start_after='legal_documents/a/x.pdf'
+        )]
+        self.assertEqual(names, ['legal_documents/b/y.pdf', 'legal_documents/c.pdf'])
+
+    def test_referenced_names_sorted_and_distinct(self):
+        """Test that shared files are listed once and in order."""
+        first = self._document(b'%PDF-1.4 uno')
+        self._document(b'%PDF-1.4 uno')
+        second = self._document(b'%PDF-1.4 dos')
+        Document.objects.filter(pk=second.pk).update(thumbnail='legal_documents/zz.thumb.jpg')
+        names = list(referenced_names('legal_documents', chunk_size=1))
+        self.assertEqual(names, sorted({first.file.name, second.file.name, 'legal_documents/zz.thumb.jpg'}))
+
+    def test_is_referenced_uses_content_hash_index(self):
+        """Test that the recheck of a blob or thumbnail name does not scan the documents table."""
+        document = self._document(b'%PDF-1.4 indexado')
+        thumbnail = document.file.name.replace('.pdf', '.thumb.jpg')
+        Document.objects.filter(pk=document.pk).update(thumbnail=thumbnail)
+        for name in (document.file.name, thumbnail):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertTrue(is_referenced(name))
+            plan = '\n'.join(explain(queries[0]['sql']))
+            self.assertIn('documents_document_content_hash', plan)
+        self.assertFalse(is_referenced(f'legal_documents/00/00/{"0" * 64}.pdf'))
+        self.assertFalse(is_referenced('legal_documents/antiguo.pdf'))
+
+    def test_orphans_deleted_and_references_kept(self):
+        """Test that only unreferenced files past the grace period are removed."""
+        document = self._document(b'%PDF-1.4 vigente')
+        orphan = self._orphan('legal_documents/00/11/viejo.pdf', b'12345')
+        recent = self._orphan('legal_documents/00/11/reciente.pdf', mtime=time.time())
+
+        stats = collect_orphans(self.storage, 'legal_documents', grace_period=3600)
+
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(recent))
+        self.assertTrue(self.storage.exists(document.file.name))
+        self.assertEqual(stats.deleted, 1)
+        self.assertEqual(stats.reclaimed_bytes, 5)
+        self.assertEqual(stats.referenced, 1)
+        self.assertEqual(stats.in_grace_period, 1)
+
+    def test_dry_run_keeps_files(self):
+        """Test that a dry run only reports orphans."""
+        orphan = self._orphan('legal_documents/viejo.pdf')
+        stats = collect_orphans(self.storage, 'legal_documents', grace_period=3600, dry_run=True)
+        self.assertEqual(stats.deleted, 1)
+        self.assertTrue(os.path.exists(orphan))
+
+    def test_max_deletes(self):
+        """Test that a run stops after max_deletes files."""
+        for index in range(3):
+            self._orphan(f'legal_documents/viejo-{index}.pdf')
+        stats = collect_orphans(self.storage, 'legal_documents', grace_period=3600, max_deletes=2)
+        self.assertEqual(stats.deleted, 2)
+        self.assertEqual(stats.last_name, 'legal_documents/viejo-1.pdf')
+
+    def test_deduplicated_upload_refreshes_blob(self):
+        """Test that reusing an existing blob makes it recent again."""
+        name = self._document(b'%PDF-1.4 reutilizado').file.name
+        Document.objects.create(
+            case=self.case,
+            title='Copia',
+            document_type='contrato',
+            file=SimpleUploadedFile('copia.pdf', b'%PDF-1.4 reutilizado', 'application/pdf')
+        )
+        self.assertGreater(os.path.getmtime(self.storage.path(name)), OLD)
+
+    def _upload_session(self, age, chunk_mtime=None):
+        """Create an incomplete upload session of the given age, with one chunk if chunk_mtime is set."""
+        session = UploadSession.objects.create(
+            case=self.case,
+            document_type='contrato',
+            title='Carga',
+            file_name='carga.pdf',
+            total_size=10,
+            chunk_size=10,
+            created_by=self.user,
+        )
+        UploadSession.objects.filter(pk=session.pk).update(created_at=timezone.now() - timedelta(seconds=age))
+        if chunk_mtime is not None:
+            directory = resumable.session_dir(session)
+            directory.mkdir(parents=True)
+            resumable.chunk_path(session, 0).write_bytes(b'x' * 10)
+            os.utime(directory, (chunk_mtime, chunk_mtime))
+        return session
+
+    def test_expire_upload_sessions(self):
+        """Test that only inactive incomplete sessions and orphaned chunk directories are removed."""
+        upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_dir, ignore_errors=True)
+        self.user = User.objects.create_user(username='gcuser')
+        with override_settings(RESUMABLE_UPLOAD_DIR=upload_dir):
+            abandoned = self._upload_session(age=7200, chunk_mtime=OLD)
+            active = self._upload_session(age=7200, chunk_mtime=time.time())
+            recent = self._upload_session(age=0)
+            orphaned = os.path.join(upload_dir, str(uuid.uuid4()))
+            os.makedirs(orphaned)
+            os.utime(orphaned, (OLD, OLD))
+
+            self.assertEqual(expire_upload_sessions(3600, dry_run=True), 2)
+            self.assertEqual(expire_upload_sessions(3600), 2)
+
+            self.assertEqual(set(UploadSession.objects.all()), {active, recent})
+            self.assertFalse(resumable.session_dir(abandoned).exists())
+            self.assertTrue(resumable.session_dir(active).exists())
+            self.assertFalse(os.path.exists(orphaned))
+
+    def test_command_reports_reclaimed_bytes(self):
+        """Test the gc_documents management command."""
+        self._orphan('legal_documents/viejo.pdf', b'x' * 2048)
+        out = StringIO()
+        call_command('gc_documents', stdout=out)
+        self.assertIn('Deleted 1 orphaned files', out.getvalue())
+        self.assertIn('2048 bytes', out.getvalue())
@@ -11,6 +11,7 @@ from django.utils import timezone
 
 from cases.models import Case
 from clients.models import Client
+from core.testing import use_temporary_media_root
 from documents.models import Document
 
 
@@ -19,6 +20,7 @@ class DocumentModelTests(TestCase):
 
     def setUp(self):
         """Create test client, case, and user for document relationships."""
+        use_temporary_media_root(self)
         self.client_obj = Client.objects.create(
             full_name='Document Test Client',
             identification_number='DOC001',
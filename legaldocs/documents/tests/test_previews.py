@@ -0,0 +1,181 @@
+"""
+Tests for document thumbnails.
+
+Tests thumbnail rendering, reuse for identical content, the background
+job and the thumbnail endpoint.
+"""
+
+import io
+import shutil
+import tempfile
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.jobs import run_pending
+from core.models import Job
+from documents.models import Document
+from documents.previews import generate_thumbnail, thumbnail_name
+
+
+def make_image(size=(1200, 800), image_format='PNG') -> bytes:
+    """Return the bytes of a solid-color image."""
+    output = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(output, image_format)
+    return output.getvalue()
+
+
+class DocumentThumbnailTests(APITestCase):
+    """Tests for documents.previews and DocumentViewSet.thumbnail."""
+
+    def setUp(self):
+        """Create a user, a case and an isolated MEDIA_ROOT."""
+        media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=media_root, DOCUMENT_RELEASE_GRACE_PERIOD=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+        self.user = User.objects.create_user(username='previewer', password='testpass123')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        client_obj = Client.objects.create(
+            full_name='Preview Client',
+            identification_number='PRV001',
+            email='prv@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Preview Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+
+    def _create(self, content, name='evidencia.png', content_type='image/png'):
+        """Create a document; its thumbnail job is queued but not run."""
+        return Document.objects.create(
+            case=self.case,
+            title='Evidencia',
+            document_type='evidencia',
+            file=SimpleUploadedFile(name, content, content_type),
+            uploaded_by=self.user
+        )
+
+    def test_generate_image_thumbnail(self):
+        """Test that a thumbnail within the configured size is stored and recorded."""
+        document = self._create(make_image())
+        name = generate_thumbnail(document.id)
+
+        self.assertEqual(name, thumbnail_name(document.file.name))
+        document.refresh_from_db()
+        self.assertEqual(document.thumbnail, name)
+        with default_storage.open(name, 'rb') as stored, Image.open(stored) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (256, 171))
+
+    def test_generate_jpeg_thumbnail(self):
+        """Test that JPEG files are supported too."""
+        document = self._create(make_image(image_format='JPEG'), 'foto.jpg', 'image/jpeg')
+        self.assertTrue(generate_thumbnail(document.id))
+
+    def test_unsupported_type_skipped(self):
+        """Test that files without a preview renderer get no thumbnail."""
+        document = self._create(b'Texto plano', 'notas.txt', 'text/plain')
+        self.assertEqual(generate_thumbnail(document.id), '')
+
+    def test_corrupt_image_is_logged_not_raised(self):
+        """Test that a file that cannot be rendered leaves no thumbnail."""
+        document = self._create(b'\x89PNG\r\n\x1a\nroto')
+        with self.assertLogs('documents.previews', level='ERROR'):
+            self.assertEqual(generate_thumbnail(document.id), '')
+        document.refresh_from_db()
+        self.assertEqual(document.thumbnail, '')
+
+    def test_identical_content_reuses_thumbnail(self):
+        """Test that documents sharing a file are not rendered twice."""
+        content = make_image()
+        first = self._create(content)
+        second = self._create(content)
+        generate_thumbnail(first.id)
+        with mock.patch('documents.previews.render_thumbnail') as render:
+            generate_thumbnail(second.id)
+        render.assert_not_called()
+        second.refresh_from_db()
+        self.assertEqual(second.thumbnail, thumbnail_name(first.file.name))
+
+    def test_thumbnail_job_enqueued(self):
+        """Test that uploading a document queues a thumbnail job and running it works."""
+        document = self._create(make_image())
+        job = Job.objects.get(task='documents.generate_thumbnail')
+        self.assertEqual(job.payload, {'document_id': document.id})
+
+        self.assertEqual(run_pending(), 1)
+        document.refresh_from_db()
+        self.assertEqual(document.thumbnail, thumbnail_name(document.file.name))
+
+    def test_unsupported_type_not_enqueued(self):
+        """Test that no job is queued for files without a preview renderer."""
+        self._create(b'Texto plano', 'notas.txt', 'text/plain')
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(DOCUMENT_PREVIEWS_ENABLED=False)
+    def test_scheduling_disabled_by_setting(self):
+        """Test that DOCUMENT_PREVIEWS_ENABLED=False turns generation off."""
+        self._create(make_image())
+        self.assertFalse(Job.objects.exists())
+
+    def test_replacing_file_clears_thumbnail(self):
+        """Test that a new file resets the thumbnail until it is regenerated."""
+        document = self._create(make_image())
+        generate_thumbnail(document.id)
+        document.refresh_from_db()
+        document.file = SimpleUploadedFile('otra.png', make_image((300, 300)), 'image/png')
+        document.save()
+        document.refresh_from_db()
+        self.assertEqual(document.thumbnail, '')
+
+    def test_thumbnail_released_with_file(self):
+        """Test that deleting the last document removes the thumbnail."""
+        document = self._create(make_image())
+        name = generate_thumbnail(document.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            document.delete()
+        self.assertFalse(default_storage.exists(name))
+
+    def test_thumbnail_endpoint(self):
+        """Test serving the thumbnail and exposing its URL in the document."""
+        document = self._create(make_image())
+        url = f'/api/v1/documents/{document.id}/thumbnail/'
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(self.client.get(f'/api/v1/documents/{document.id}/').data['thumbnail_url'])
+
+        generate_thumbnail(document.id)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('inline', response['Content-Disposition'])
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'\xff\xd8'))
+
+        detail = self.client.get(f'/api/v1/documents/{document.id}/')
+        self.assertTrue(detail.data['thumbnail_url'].endswith(url))
+
+    @skipUnless(shutil.which('pdftoppm'), 'poppler (pdftoppm) is not installed')
+    def test_generate_pdf_thumbnail(self):
+        """Test rendering the first page of a PDF."""
+        output = io.BytesIO()
+        Image.new('RGB', (600, 800), (255, 255, 255)).save(output, 'PDF')
+        document = self._create(output.getvalue(), 'escrito.pdf', 'application/pdf')
+        self.assertTrue(generate_thumbnail(document.id))
@@ -0,0 +1,233 @@
+"""
+Tests for resumable document uploads.
+
+Tests the upload session protocol: create, PUT chunks out of order,
+query missing chunks, and complete into a Document.
+"""
+
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.models import Document, UploadSession
+
+CHUNK_SIZE = 1024
+PDF_CONTENT = b'%PDF-1.4\n' + bytes(range(256)) * 12
+
+
+class ResumableUploadTests(APITestCase):
+    """Tests for UploadSessionViewSet."""
+
+    def setUp(self):
+        """Create test user, case and isolated chunk and media directories."""
+        use_temporary_media_root(self)
+        self.upload_dir = tempfile.mkdtemp()
+        settings_override = override_settings(
+            RESUMABLE_UPLOAD_DIR=self.upload_dir,
+            RESUMABLE_UPLOAD_CHUNK_SIZE=CHUNK_SIZE,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.upload_dir, ignore_errors=True)
+
+        self.user = User.objects.create_user(
+            username='resumeuser',
+            email='resume@example.com',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        client_obj = Client.objects.create(
+            full_name='Resume Client',
+            identification_number='RSM001',
+            email='rsm@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Resume Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+
+    def _create_session(self, content=PDF_CONTENT):
+        """Create an upload session for content and return its data."""
+        response = self.client.post('/api/v1/documents/uploads/', {
+            'case': self.case.id,
+            'title': 'Escaneo',
+            'document_type': 'sentencia',
+            'file_name': '../escaneo.pdf',
+            'total_size': len(content),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def _put_chunk(self, session_id, index, content=PDF_CONTENT):
+        """Upload one chunk of content."""
+        body = content[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+        return self.client.put(
+            f'/api/v1/documents/uploads/{session_id}/chunks/{index}/',
+            data=body,
+            content_type='application/octet-stream'
+        )
+
+    def test_create_session(self):
+        """Test that a session reports its chunk layout."""
+        data = self._create_session()
+        self.assertEqual(data['chunk_size'], CHUNK_SIZE)
+        self.assertEqual(data['chunk_count'], 4)
+        self.assertEqual(data['missing_chunks'], [[0, 3]])
+        self.assertEqual(data['file_name'], 'escaneo.pdf')
+
+    @override_settings(RESUMABLE_UPLOAD_MAX_SIZE=1000)
+    def test_create_session_too_large(self):
+        """Test that sessions over RESUMABLE_UPLOAD_MAX_SIZE are rejected."""
+        response = self.client.post('/api/v1/documents/uploads/', {
+            'case': self.case.id,
+            'title': 'Escaneo',
+            'document_type': 'sentencia',
+            'file_name': 'escaneo.pdf',
+            'total_size': len(PDF_CONTENT),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RESUMABLE_UPLOAD_MIN_CHUNK_SIZE=512)
+    def test_chunk_size_minimum(self):
+        """Test that small chunks are rejected unless the file fits in one."""
+        data = {
+            'case': self.case.id,
+            'title': 'Escaneo',
+            'document_type': 'sentencia',
+            'file_name': 'escaneo.pdf',
+            'total_size': len(PDF_CONTENT),
+            'chunk_size': 1,
+        }
+        response = self.client.post('/api/v1/documents/uploads/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('chunk_size', response.data)
+
+        data.update(total_size=100, chunk_size=100)
+        response = self.client.post('/api/v1/documents/uploads/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['missing_chunks'], [[0, 0]])
+
+    def test_chunks_out_of_order_and_resume(self):
+        """Test uploading chunks in any order and querying what is missing."""
+        session = self._create_session()
+        for index in (3, 1):
+            response = self._put_chunk(session['id'], index)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(f"/api/v1/documents/uploads/{session['id']}/")
+        self.assertEqual(response.data['received_chunks'], [1, 3])
+        self.assertEqual(response.data['missing_chunks'], [[0, 0], [2, 2]])
+
+    def test_chunk_with_wrong_size_rejected(self):
+        """Test that a truncated chunk is not stored."""
+        session = self._create_session()
+        response = self.client.put(
+            f"/api/v1/documents/uploads/{session['id']}/chunks/0/",
+            data=b'short',
+            content_type='application/octet-stream'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(f"/api/v1/documents/uploads/{session['id']}/")
+        self.assertEqual(response.data['received_chunks'], [])
+
+    def test_complete_with_missing_chunks(self):
+        """Test that completion fails while chunks are missing."""
+        session = self._create_session()
+        self._put_chunk(session['id'], 0)
+        response = self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['missing_chunks'], [[1, 3]])
+
+    def test_complete_creates_document(self):
+        """Test that completing assembles the chunks into a Document."""
+        session = self._create_session()
+        for index in (2, 0, 3, 1):
+            self._put_chunk(session['id'], index)
+
+        response = self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['file_size'], len(PDF_CONTENT))
+        self.assertEqual(response.data['uploaded_by'], self.user.id)
+
+        document = Document.objects.get(id=response.data['id'])
+        with document.file.open('rb') as stored:
+            self.assertEqual(stored.read(), PDF_CONTENT)
+        self.assertEqual(UploadSession.objects.get(id=session['id']).document, document)
+
+    def test_concurrent_complete_creates_one_document(self):
+        """Test that a session completed by another request meanwhile is not assembled again."""
+        session = self._create_session()
+        for index in range(4):
+            self._put_chunk(session['id'], index)
+
+        def completed_meanwhile(upload_session):
+            UploadSession.objects.filter(pk=upload_session.pk).update(completed_at=timezone.now())
+            return []
+
+        with mock.patch('documents.views.resumable.missing_ranges', side_effect=completed_meanwhile):
+            response = self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Document.objects.exists())
+
+    def test_failed_complete_releases_session(self):
+        """Test that a session whose assembly fails can be completed again."""
+        session = self._create_session()
+        for index in range(4):
+            self._put_chunk(session['id'], index)
+        with mock.patch('documents.views.resumable.assemble', side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+        self.assertIsNone(UploadSession.objects.get(id=session['id']).completed_at)
+        response = self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_failed_document_save_keeps_chunks(self):
+        """Test that a session whose document cannot be saved keeps its chunks and can be completed again."""
+        session = self._create_session()
+        for index in range(4):
+            self._put_chunk(session['id'], index)
+        with mock.patch.object(Document, 'save', side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+
+        response = self.client.get(f"/api/v1/documents/uploads/{session['id']}/")
+        self.assertIsNone(UploadSession.objects.get(id=session['id']).completed_at)
+        self.assertEqual(response.data['received_chunks'], [0, 1, 2, 3])
+        response = self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with Document.objects.get(id=response.data['id']).file.open('rb') as stored:
+            self.assertEqual(stored.read(), PDF_CONTENT)
+
+    def test_complete_rejects_invalid_type(self):
+        """Test that disallowed file types are rejected at completion."""
+        content = b'MZ' + b'\x00' * 1500
+        session = self._create_session(content)
+        self._put_chunk(session['id'], 0, content)
+        self._put_chunk(session['id'], 1, content)
+        response = self.client.post(f"/api/v1/documents/uploads/{session['id']}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(UploadSession.objects.filter(id=session['id']).exists())
+
+    def test_sessions_are_private(self):
+        """Test that other users cannot see a session."""
+        session = self._create_session()
+        other = User.objects.create_user(username='intruder', password='testpass123')
+        token = Token.objects.create(user=other)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = self._put_chunk(session['id'], 0)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -11,6 +11,7 @@ from django.utils import timezone
 
 from cases.models import Case
 from clients.models import Client
+from core.testing import use_temporary_media_root
 from documents.models import Document
 from documents.serializers import DocumentSerializer
 
@@ -20,6 +21,7 @@ class DocumentSerializerTests(TestCase):
 
     def setUp(self):
         """Create test client, case, and user for document relationships."""
+        use_temporary_media_root(self)
         self.client_obj = Client.objects.create(
             full_name='Doc Serializer Client',
             identification_number='DOCSRC001',
@@ -0,0 +1,120 @@
+"""
+Tests for content-addressed document storage.
+
+Tests deduplication by SHA-256, reference counting across Document rows,
+and release of files on delete and replacement.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from cases.models import Case
+from clients.models import Client
+from documents.models import Document
+from documents.storage import select_document_storage
+
+CONTENT = b'%PDF-1.4\nPoder general amplio y suficiente'
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Tests for ContentAddressedStorage and file release."""
+
+    def setUp(self):
+        """Create a case and an isolated MEDIA_ROOT."""
+        media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=media_root, DOCUMENT_RELEASE_GRACE_PERIOD=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+
+        client_obj = Client.objects.create(
+            full_name='Storage Client',
+            identification_number='STG001',
+            email='stg@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Storage Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+        self.storage = select_document_storage()
+
+    def _create(self, content=CONTENT, name='poder.pdf'):
+        """Create a document with the given file content."""
+        return Document.objects.create(
+            case=self.case,
+            title='Poder',
+            document_type='poder',
+            file=SimpleUploadedFile(name, content, 'application/pdf')
+        )
+
+    def test_file_named_by_content_hash(self):
+        """Test that the stored name is derived from the SHA-256 digest."""
+        digest = hashlib.sha256(CONTENT).hexdigest()
+        document = self._create()
+        self.assertEqual(document.content_hash, digest)
+        self.assertEqual(
+            document.file.name,
+            f'legal_documents/{digest[:2]}/{digest[2:4]}/{digest}.pdf'
+        )
+        self.assertTrue(self.storage.exists(document.file.name))
+
+    def test_duplicate_upload_shares_file(self):
+        """Test that identical content is stored only once."""
+        first = self._create(name='poder.pdf')
+        second = self._create(name='copia-poder.pdf')
+        self.assertEqual(first.file.name, second.file.name)
+        directory = self.storage.path(first.file.name).rsplit('/', 1)[0]
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_file_kept_while_referenced(self):
+        """Test that deleting one of two sharing documents keeps the file."""
+        first = self._create()
+        self._create()
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(self.storage.exists(first.file.name))
+
+    def test_file_released_with_last_reference(self):
+        """Test that the file is removed when the last document is deleted."""
+        first = self._create()
+        second = self._create()
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+            second.delete()
+        self.assertFalse(self.storage.exists(first.file.name))
+
+    @override_settings(DOCUMENT_RELEASE_GRACE_PERIOD=300)
+    def test_recently_reused_file_kept(self):
+        """Test that a blob just reused by another upload is left to the orphan collector."""
+        document = self._create()
+        with self.captureOnCommitCallbacks(execute=True):
+            document.delete()
+        self.assertTrue(self.storage.exists(document.file.name))
+
+    def test_file_released_on_case_cascade(self):
+        """Test that cascaded deletes release files too."""
+        name = self._create().file.name
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.delete()
+        self.assertFalse(self.storage.exists(name))
+
+    def test_replaced_file_released(self):
+        """Test that replacing a document's file releases the old one."""
+        document = self._create()
+        old_name = document.file.name
+        document.file = SimpleUploadedFile('nuevo.pdf', b'%PDF-1.4\nnuevo', 'application/pdf')
+        with self.captureOnCommitCallbacks(execute=True):
+            document.save()
+        self.assertNotEqual(document.file.name, old_name)
+        self.assertFalse(self.storage.exists(old_name))
+        self.assertTrue(self.storage.exists(document.file.name))
@@ -0,0 +1,115 @@
+"""
+Tests for streaming document uploads.
+
+Tests StreamingUploadHandler hashing, MIME sniffing and size enforcement,
+and its use by DocumentViewSet.
+"""
+
+import hashlib
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from cases.models import Case
+from clients.models import Client
+from core.testing import use_temporary_media_root
+from documents.models import Document
+from documents.uploadhandlers import StreamingUploadHandler
+
+PDF_CONTENT = b'%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\n' + b'x' * 5000
+
+
+class StreamingUploadHandlerTests(TestCase):
+    """Tests for StreamingUploadHandler."""
+
+    def _stream(self, content, chunk_size=1024):
+        """Feed content through a handler in chunks and return the result."""
+        handler = StreamingUploadHandler(RequestFactory().post('/'))
+        handler.new_file('file', 'doc.pdf', 'application/pdf', None)
+        for start in range(0, len(content), chunk_size):
+            handler.receive_data_chunk(content[start:start + chunk_size], start)
+        return handler.file_complete(len(content))
+
+    def test_computes_sha256_while_streaming(self):
+        """Test that the digest matches the full content."""
+        uploaded = self._stream(PDF_CONTENT)
+        self.assertEqual(uploaded.sha256, hashlib.sha256(PDF_CONTENT).hexdigest())
+        self.assertEqual(uploaded.size, len(PDF_CONTENT))
+
+    def test_sniffs_mime_type_from_leading_bytes(self):
+        """Test that the MIME type is detected from the first bytes."""
+        uploaded = self._stream(PDF_CONTENT, chunk_size=100)
+        self.assertEqual(uploaded.sniffed_content_type, 'application/pdf')
+
+    def test_writes_content_to_temporary_file(self):
+        """Test that the streamed content is stored on disk."""
+        uploaded = self._stream(PDF_CONTENT)
+        self.assertTrue(uploaded.temporary_file_path())
+        self.assertEqual(uploaded.read(), PDF_CONTENT)
+
+    @override_settings(MAX_UPLOAD_SIZE=1024)
+    def test_stops_writing_past_size_limit(self):
+        """Test that data beyond the limit is counted but not stored."""
+        uploaded = self._stream(PDF_CONTENT, chunk_size=512)
+        self.assertEqual(uploaded.size, len(PDF_CONTENT))
+        self.assertIsNone(uploaded.sha256)
+        self.assertLessEqual(len(uploaded.read()), 1024)
+
+
+class StreamingUploadViewTests(APITestCase):
+    """Tests for streaming uploads through DocumentViewSet."""
+
+    def setUp(self):
+        """Create test user, client and case."""
+        use_temporary_media_root(self)
+        self.user = User.objects.create_user(
+            username='streamuser',
+            email='stream@example.com',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        client_obj = Client.objects.create(
+            full_name='Stream Client',
+            identification_number='STR001',
+            email='str@example.com',
+            phone='555-0000'
+        )
+        self.case = Case.objects.create(
+            client=client_obj,
+            title='Stream Case',
+            description='Test',
+            case_type='civil',
+            start_date=timezone.now().date()
+        )
+
+    def test_upload_is_streamed(self):
+        """Test that a regular upload succeeds through the streaming handler."""
+        data = {
+            'case': self.case.id,
+            'title': 'Streamed',
+            'document_type': 'demanda',
+            'file': SimpleUploadedFile('streamed.pdf', PDF_CONTENT, 'application/pdf'),
+        }
+        response = self.client.post('/api/v1/documents/', data, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['file_size'], len(PDF_CONTENT))
+
+    @override_settings(MAX_UPLOAD_SIZE=1024)
+    def test_oversized_upload_rejected(self):
+        """Test that uploads over the limit are rejected with a size error."""
+        data = {
+            'case': self.case.id,
+            'title': 'Too big',
+            'document_type': 'demanda',
+            'file': SimpleUploadedFile('big.pdf', PDF_CONTENT, 'application/pdf'),
+        }
+        response = self.client.post('/api/v1/documents/', data, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('archivo', response.data)
+        self.assertFalse(Document.objects.filter(title='Too big').exists())
@@ -0,0 +1,84 @@
+"""
+Tests for document file validators.
+
+Tests the signature fast path, the libmagic fallback and the cached
+set of allowed types.
+"""
+
+import io
+import threading
+import zipfile
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+
+from documents import validators
+
+
+def make_docx() -> bytes:
+    """Return the bytes of a minimal DOCX-like ZIP package."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', '<Types/>')
+        package.writestr('_rels/.rels', '<Relationships/>')
+        package.writestr('word/document.xml', '<w:document/>')
+    return buffer.getvalue()
+
+
+class DetectMimeTypeTests(SimpleTestCase):
+    """Tests for detect_mime_type and match_signature."""
+
+    def test_signatures_skip_libmagic(self):
+        """Test that known headers are identified without libmagic."""
+        samples = {
+            b'%PDF-1.7\n': 'application/pdf',
+            b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR': 'image/png',
+            b'\xff\xd8\xff\xe0\x00\x10JFIF': 'image/jpeg',
+            make_docx()[:2048]: validators.DOCX_MIME_TYPE,
+        }
+        with mock.patch.object(validators, '_thread_magic') as thread_magic:
+            for data, expected in samples.items():
+                self.assertEqual(validators.detect_mime_type(data), expected)
+        thread_magic.assert_not_called()
+
+    def test_ambiguous_content_uses_libmagic(self):
+        """Test that plain text and plain ZIP files go through libmagic."""
+        self.assertIsNone(validators.match_signature(b'Contrato de arrendamiento'))
+        self.assertEqual(validators.detect_mime_type(b'Contrato de arrendamiento'), 'text/plain')
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('data.bin', b'\x00' * 100)
+        self.assertIsNone(validators.match_signature(buffer.getvalue()))
+
+    def test_libmagic_handle_per_thread(self):
+        """Test that each thread gets its own libmagic handle."""
+        handles = []
+        thread = threading.Thread(target=lambda: handles.append(validators._thread_magic()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(handles[0], validators._thread_magic())
+        self.assertIs(validators._thread_magic(), validators._thread_magic())
+
+
+class ValidateFileTypeTests(SimpleTestCase):
+    """Tests for validate_file_type."""
+
+    def test_allowed_type_passes(self):
+        """Test that a PDF is accepted."""
+        validators.validate_file_type(SimpleUploadedFile('a.pdf', b'%PDF-1.4\ncontent'))
+
+    def test_disallowed_type_rejected(self):
+        """Test that an executable is rejected."""
+        with self.assertRaises(ValidationError):
+            validators.validate_file_type(SimpleUploadedFile('a.pdf', b'MZ' + b'\x00' * 200))
+
+    def test_allowed_types_follow_settings(self):
+        """Test that the cached allowed set is refreshed when the setting changes."""
+        with override_settings(ALLOWED_FILE_TYPES=['image/png']):
+            self.assertEqual(validators.get_allowed_types(), frozenset({'image/png'}))
+            with self.assertRaises(ValidationError):
+                validators.validate_file_type(SimpleUploadedFile('a.pdf', b'%PDF-1.4\n'))
+        self.assertIn('application/pdf', validators.get_allowed_types())
@@ -13,6 +13,7 @@ from rest_framework.test import APITestCase
 
 from cases.models import Case
 from clients.models import Client
+from core.testing import use_temporary_media_root
 from documents.models import Document
 
 
@@ -21,6 +22,7 @@ class DocumentViewSetTests(APITestCase):
 
     def setUp(self):
         """Create test user, client, case, and documents."""
+        use_temporary_media_root(self)
         self.user = User.objects.create_user(
             username='docuser',
             email='docuser@example.com',
@@ -56,7 +58,7 @@ class DocumentViewSetTests(APITestCase):
         """Test listing all documents."""
         response = self.client.get('/api/v1/documents/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_create_document_with_file(self):
         """Test creating a document with file upload."""
@@ -115,25 +117,25 @@ class DocumentViewSetTests(APITestCase):
         """Test filtering documents by case."""
         response = self.client.get(f'/api/v1/documents/?case={self.case.id}')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_filter_by_document_type(self):
         """Test filtering documents by document_type."""
         response = self.client.get('/api/v1/documents/?document_type=contrato')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_filter_by_is_confidential(self):
         """Test filtering documents by is_confidential."""
         response = self.client.get('/api/v1/documents/?is_confidential=false')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_search_by_title(self):
         """Test searching documents by title."""
         response = self.client.get('/api/v1/documents/?search=Test')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
 
 
 class DocumentPermissionTests(APITestCase):
@@ -141,6 +143,7 @@ class DocumentPermissionTests(APITestCase):
 
     def setUp(self):
         """Create two users, one document owned by user1."""
+        use_temporary_media_root(self)
         self.user1 = User.objects.create_user(
             username='owner',
             email='owner@example.com',
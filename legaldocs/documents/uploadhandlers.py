@@ -0,0 +1,89 @@
+"""
+Streaming upload handler for document files.
+
+Writes multipart file chunks straight to a temporary file as they arrive
+instead of buffering them in memory, and computes metadata on the way:
+- SHA-256 digest of the file content
+- MIME type sniffed from the leading bytes of the file
+- Size limit (MAX_UPLOAD_SIZE) enforced while bytes are received
+"""
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+from .validators import detect_mime_type
+
+# Number of leading bytes used to detect the MIME type
+SNIFF_SIZE = 2048
+
+
+class StreamedUploadedFile(TemporaryUploadedFile):
+    """
+    Temporary uploaded file carrying metadata computed while streaming.
+
+    Attributes:
+        sha256: Hex digest of the file content, or None if the upload
+            exceeded the size limit and was truncated.
+        sniffed_content_type: MIME type detected from the leading bytes,
+            or None if the upload exceeded the size limit.
+    """
+
+    sha256 = None
+    sniffed_content_type = None
+
+
+class StreamingUploadHandler(FileUploadHandler):
+    """
+    Upload handler that streams file data to disk with constant memory.
+
+    Each chunk is written to a temporary file and fed to a SHA-256 hasher.
+    Once more than MAX_UPLOAD_SIZE bytes have been received, further data
+    is discarded (but still counted) so the size validator can reject the
+    upload with the real size without storing it.
+    """
+
+    def new_file(self, *args, **kwargs):
+        """Create the temporary file and reset the streaming state."""
+        super().new_file(*args, **kwargs)
+        self.file = StreamedUploadedFile(
+            self.file_name, self.content_type, 0, self.charset, self.content_type_extra
+        )
+        self.hasher = hashlib.sha256()
+        self.head = b''
+        self.received = 0
+        self.max_size = getattr(settings, 'MAX_UPLOAD_SIZE', 10 * 1024 * 1024)
+
+    def receive_data_chunk(self, raw_data, start):
+        """Write the chunk to disk, update the digest and sniff buffer."""
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            return None
+
+        if len(self.head) < SNIFF_SIZE:
+            self.head += raw_data[:SNIFF_SIZE - len(self.head)]
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        """Finalize the temporary file and attach the computed metadata."""
+        self.file.seek(0)
+        self.file.size = self.received
+        if self.received <= self.max_size:
+            self.file.sha256 = self.hasher.hexdigest()
+            self.file.sniffed_content_type = detect_mime_type(self.head)
+        return self.file
+
+    def upload_interrupted(self):
+        """Remove the temporary file if the upload was interrupted."""
+        if hasattr(self, 'file'):
+            temp_location = self.file.temporary_file_path()
+            try:
+                self.file.close()
+                os.remove(temp_location)
+            except FileNotFoundError:
+                pass
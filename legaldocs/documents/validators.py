@@ -4,19 +4,118 @@ File upload validators for document security.
 Provides validation for file uploads including:
 - MIME type validation using python-magic
 - File size validation
+
+MIME detection first checks a table of unambiguous leading-byte
+signatures (PDF, PNG, JPEG, DOCX) and only falls back to libmagic when
+none matches. libmagic handles are kept per thread, so threaded servers
+do not contend on python-magic's shared module-level handle. The set of
+allowed types is computed once and refreshed when the setting changes.
 """
 
+import threading
+
 import magic
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# Default allowed MIME types when ALLOWED_FILE_TYPES is not configured
+DEFAULT_ALLOWED_FILE_TYPES = (
+    'application/pdf',
+    'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'text/plain',
+    'image/jpeg',
+    'image/png',
+)
+
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Leading-byte signatures that identify a type without libmagic.
+# DOC (OLE2 containers also hold XLS/MSI files) and TXT (no header) are
+# ambiguous by their first bytes and always go through libmagic.
+SIGNATURES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+)
+
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+_allowed_types = None
+_local = threading.local()
+
+
+def get_allowed_types() -> frozenset:
+    """Return the allowed MIME types as a frozenset (computed once)."""
+    global _allowed_types
+    if _allowed_types is None:
+        _allowed_types = frozenset(
+            getattr(settings, 'ALLOWED_FILE_TYPES', DEFAULT_ALLOWED_FILE_TYPES)
+        )
+    return _allowed_types
+
+
+@receiver(setting_changed)
+def _reset_allowed_types(setting, **kwargs):
+    """Recompute the allowed types when ALLOWED_FILE_TYPES changes."""
+    global _allowed_types
+    if setting == 'ALLOWED_FILE_TYPES':
+        _allowed_types = None
+
+
+def _thread_magic() -> magic.Magic:
+    """Return the libmagic handle of the current thread."""
+    handle = getattr(_local, 'magic', None)
+    if handle is None:
+        handle = _local.magic = magic.Magic(mime=True)
+    return handle
+
+
+def match_signature(data: bytes):
+    """
+    Identify a file type from its leading bytes without libmagic.
+
+    Args:
+        data: Leading bytes of the file.
+
+    Returns:
+        str: The MIME type if a signature matches unambiguously, else None.
+    """
+    for signature, mime_type in SIGNATURES:
+        if data.startswith(signature):
+            return mime_type
+    # DOCX is a ZIP whose first entry is [Content_Types].xml and which
+    # contains entries under word/
+    if (data.startswith(ZIP_SIGNATURE)
+            and data[30:49] == b'[Content_Types].xml'
+            and b'word/' in data):
+        return DOCX_MIME_TYPE
+    return None
+
+
+def detect_mime_type(data: bytes) -> str:
+    """
+    Detect the MIME type of file content.
+
+    Args:
+        data: Leading bytes of the file (2048 bytes are enough).
+
+    Returns:
+        str: The detected MIME type.
+    """
+    return match_signature(data) or _thread_magic().from_buffer(data)
 
 
 def validate_file_type(file) -> None:
     """
     Validate that the uploaded file is an allowed MIME type.
 
-    Uses python-magic to detect the actual file type by reading
-    the file's magic bytes, not just the extension.
+    Uses detect_mime_type() to detect the actual file type by reading
+    the file's magic bytes, not just the extension. Files received through
+    StreamingUploadHandler carry the type sniffed during the upload, so
+    they are not read again.
 
     Args:
         file: Django UploadedFile object to validate.
@@ -24,22 +123,16 @@ def validate_file_type(file) -> None:
     Raises:
         ValidationError: If file type is not in ALLOWED_FILE_TYPES.
     """
-    # Read first 2048 bytes to detect MIME type
-    file_data = file.read(2048)
-    file.seek(0)  # Reset file pointer for subsequent operations
-
-    mime_type = magic.from_buffer(file_data, mime=True)
-
-    allowed_types = getattr(settings, 'ALLOWED_FILE_TYPES', [
-        'application/pdf',
-        'application/msword',
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'text/plain',
-        'image/jpeg',
-        'image/png',
-    ])
-
-    if mime_type not in allowed_types:
+    # Streamed uploads already sniffed their leading bytes while arriving
+    mime_type = getattr(file, 'sniffed_content_type', None)
+    if mime_type is None:
+        # Read first 2048 bytes to detect MIME type
+        file_data = file.read(2048)
+        file.seek(0)  # Reset file pointer for subsequent operations
+
+        mime_type = detect_mime_type(file_data)
+
+    if mime_type not in get_allowed_types():
         raise ValidationError(
             f'Tipo de archivo no permitido: {mime_type}. '
             f'Tipos permitidos: PDF, DOC, DOCX, TXT, JPG, PNG.'
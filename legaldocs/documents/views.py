@@ -4,25 +4,51 @@ ViewSets for the Document API.
 Provides DocumentViewSet with:
 - Full CRUD operations via ModelViewSet
 - File upload support via MultiPartParser and FormParser
+- Streaming uploads to temporary storage via StreamingUploadHandler
 - Filtering by case, document_type, is_confidential
 - Search by title, description
 - Ordering by uploaded_at, title
 - Owner-based delete permissions via IsOwnerOrReadOnly
+- Custom actions: download (authenticated file delivery with Range/ETag),
+  thumbnail (preview image)
+
+Provides UploadSessionViewSet with:
+- Resumable chunked uploads (create session, PUT chunks, complete)
 """
 
+import io
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from api.permissions import IsOwnerOrReadOnly
+from api.conditional import ConditionalGetMixin
+from api.fast_serializers import FastListMixin
+from api.negotiation import FileDownloadContentNegotiation
+from api.permissions import CanAccessDocumentFile, IsOwnerOrReadOnly
+from api.renderers import NativeDatesMixin
+from api.sparse_fields import SparseFieldsMixin
 
-from .models import Document
-from .serializers import DocumentSerializer
+from . import resumable
+from .downloads import serve_document, serve_file
+from .models import Document, UploadSession
+from .serializers import DocumentListSerializer, DocumentSerializer, UploadSessionSerializer
+from .uploadhandlers import StreamingUploadHandler
+from .validators import validate_file_type
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(
+    ConditionalGetMixin, NativeDatesMixin, SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet
+):
     """
     ViewSet for Document CRUD operations with file upload support.
 
@@ -39,13 +65,43 @@ class DocumentViewSet(viewsets.ModelViewSet):
     Ordering:
         - uploaded_at, title (default: -uploaded_at)
 
+    The list action is served by DocumentListSerializer (values_list() rows,
+    same output as DocumentSerializer).
+
+    Sparse fieldsets:
+        - ?fields=a,b / ?omit=c on list and retrieve trim the response and
+          the columns and joins that are queried
+
+    MessagePack:
+        - Accept: application/msgpack sends dates and datetimes as native
+          MessagePack values (NativeDatesMixin)
+
+    Conditional GET:
+        - list and retrieve send an ETag and answer 304 Not Modified to a
+          matching If-None-Match (ConditionalGetMixin); documents have no
+          updated_at, so details are versioned by the documents table
+
     Permissions:
         - IsOwnerOrReadOnly: Only document owner or staff can delete
         - uploaded_by is automatically set to the current user on create
+
+    Uploads:
+        - Files are streamed to a temporary file chunk by chunk, hashed and
+          size-checked as they arrive, so worker memory stays constant
+
+    Custom Actions:
+        - download: GET /documents/{id}/download/ - Returns the file contents
+          (supports Range, ETag/If-None-Match and proxy offloading). Files of
+          confidential documents are restricted by CanAccessDocumentFile.
+        - thumbnail: GET /documents/{id}/thumbnail/ - Returns the preview
+          image (404 until it has been generated)
     """
 
     queryset = Document.objects.select_related('case', 'uploaded_by')
     serializer_class = DocumentSerializer
+    fast_list_serializer_class = DocumentListSerializer
+    etag_models = ['cases.Case', 'auth.User']
+    etag_version_field = None
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -54,6 +110,16 @@ class DocumentViewSet(viewsets.ModelViewSet):
     ordering_fields = ['uploaded_at', 'title']
     ordering = ['-uploaded_at']
 
+    def initialize_request(self, request, *args, **kwargs):
+        """
+        Install the streaming upload handler before the body is parsed.
+
+        Replaces Django's default memory/temporary-file handlers so every
+        upload goes straight to disk regardless of FILE_UPLOAD_MAX_MEMORY_SIZE.
+        """
+        request.upload_handlers = [StreamingUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """
         Auto-set uploaded_by to the current user when creating a document.
@@ -62,3 +128,197 @@ class DocumentViewSet(viewsets.ModelViewSet):
         uploaded it, which is required for the IsOwnerOrReadOnly permission.
         """
         serializer.save(uploaded_by=self.request.user)
+
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[IsAuthenticated, CanAccessDocumentFile],
+        content_negotiation_class=FileDownloadContentNegotiation,
+    )
+    def download(self, request, pk=None):
+        """
+        Download the document's file.
+
+        Returns:
+            - 200 OK with the file (or an X-Accel-Redirect/X-Sendfile
+              response when DOCUMENT_DOWNLOAD_BACKEND is set)
+            - 206 Partial Content for a satisfiable Range request
+            - 304 Not Modified if If-None-Match matches the ETag
+            - 403 Forbidden for confidential documents the user may not access
+        """
+        document = self.get_object()
+        return serve_document(request, document)
+
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[IsAuthenticated, CanAccessDocumentFile],
+        content_negotiation_class=FileDownloadContentNegotiation,
+    )
+    def thumbnail(self, request, pk=None):
+        """
+        Return the preview thumbnail (JPEG) of the document.
+
+        Returns:
+            - 200 OK with the image, or 304 Not Modified
+            - 404 Not Found if no thumbnail has been generated
+        """
+        document = self.get_object()
+        if not document.thumbnail or not default_storage.exists(document.thumbnail):
+            raise Http404
+        return serve_file(
+            request,
+            default_storage,
+            document.thumbnail,
+            f'"{document.content_hash or document.pk}-thumb"',
+            f'{document.pk}.jpg',
+            as_attachment=False,
+        )
+
+
+class UploadSessionViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    ViewSet for resumable, chunked document uploads.
+
+    Protocol:
+        1. POST /documents/uploads/ with the document metadata, file_name
+           and total_size. Returns the session with its chunk_size and
+           chunk_count.
+        2. PUT /documents/uploads/{id}/chunks/{index}/ with the raw bytes of
+           each chunk (any order, in parallel). Re-sending a chunk replaces it.
+        3. GET /documents/uploads/{id}/ to see received_chunks and
+           missing_chunks ([start, end] ranges) after a dropped connection.
+        4. POST /documents/uploads/{id}/complete/ to assemble the chunks,
+           validate the file once and create the Document.
+
+    Sessions are only visible to the user who created them.
+    DELETE /documents/uploads/{id}/ abandons a session and its chunks.
+    """
+
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Return the sessions created by the current user."""
+        return UploadSession.objects.filter(created_by=self.request.user)
+
+    def perform_create(self, serializer):
+        """Auto-set created_by to the current user."""
+        serializer.save(created_by=self.request.user)
+
+    def perform_destroy(self, instance):
+        """Delete the session together with its stored chunks."""
+        resumable.discard(instance)
+        instance.delete()
+
+    def release_claim(self, session):
+        """Reopen a session claimed by complete() whose document was not created."""
+        UploadSession.objects.filter(pk=session.pk, document__isnull=True).update(completed_at=None)
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, pk=None, index=None):
+        """
+        Store one chunk from the raw request body.
+
+        Returns:
+            - 200 OK with the chunk index and size on success
+            - 400 Bad Request if the session is completed, the index is out
+              of range or the body does not have the expected size
+        """
+        session = self.get_object()
+        index = int(index)
+
+        if session.completed_at:
+            return Response(
+                {'error': 'La carga ya fue completada.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if index >= session.chunk_count:
+            return Response(
+                {'error': f'Índice de fragmento fuera de rango (0-{session.chunk_count - 1}).'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            size = resumable.write_chunk(session, index, request.stream or io.BytesIO())
+        except resumable.ChunkSizeError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'index': index, 'size': size})
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """
+        Assemble the chunks, validate the file and create the Document.
+
+        Returns:
+            - 201 Created with the document data on success
+            - 400 Bad Request if chunks are missing or the file type is not
+              allowed (the session and its chunks are then discarded)
+        """
+        session = self.get_object()
+
+        if session.completed_at:
+            return Response(
+                {'error': 'La carga ya fue completada.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        missing = resumable.missing_ranges(session)
+        if missing:
+            return Response(
+                {'error': 'Faltan fragmentos por subir.', 'missing_chunks': missing},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Claim the session, so that of concurrent completes only one
+        # assembles it and creates the document; chunk uploads are refused
+        claimed = UploadSession.objects.filter(
+            pk=session.pk, completed_at__isnull=True
+        ).update(completed_at=timezone.now())
+        if not claimed:
+            return Response(
+                {'error': 'La carga ya fue completada.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            upload = resumable.AssembledUpload(resumable.assemble(session), session.file_name)
+        except OSError:
+            self.release_claim(session)
+            raise
+        try:
+            validate_file_type(upload)
+        except DjangoValidationError as exc:
+            upload.close()
+            self.perform_destroy(session)
+            raise serializers.ValidationError({'file': exc.messages})
+
+        try:
+            with transaction.atomic():
+                document = Document(
+                    case=session.case,
+                    title=session.title,
+                    document_type=session.document_type,
+                    description=session.description,
+                    is_confidential=session.is_confidential,
+                    file=upload,
+                    uploaded_by=request.user,
+                )
+                document.save()
+                session.document = document
+                session.completed_at = timezone.now()
+                session.save(update_fields=['document', 'completed_at'])
+        except Exception:
+            # Keep the chunks, so the client can complete the session again
+            self.release_claim(session)
+            raise
+        finally:
+            upload.close()
+        resumable.discard(session)
+
+        serializer = DocumentSerializer(document, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
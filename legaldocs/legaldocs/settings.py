@@ -66,6 +66,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',  # Compresses the final response (runs last)
+    'core.middleware.ReplicaRoutingMiddleware',  # Read replicas for safe API requests
     'corsheaders.middleware.CorsMiddleware',  # CORS - must be before CommonMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -109,15 +111,68 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Keep connections open across requests (seconds; 0 closes them after
+        # each request) and check them before reusing them in a new request
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
     }
 }
 
+# In-process connection pool shared by the threads of a threaded or ASGI
+# server (core.db.postgresql_pool); replaces persistent connections
+if os.getenv('DB_POOL', 'False').lower() == 'true':
+    DATABASES['default'].update({
+        'ENGINE': 'core.db.postgresql_pool',
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'pool': {
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+                'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '600')),
+            },
+        },
+    })
+
+# Read replicas (comma-separated hosts, e.g. "replica1.internal,replica2.internal"):
+# same database and credentials as the primary, aliases replica1, replica2...
+REPLICA_DATABASES = []
+for number, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {**DATABASES['default'], 'HOST': host.strip()}
+    REPLICA_DATABASES.append(alias)
+
 # Use SQLite for testing (no CREATE DATABASE permissions needed)
 if 'test' in sys.argv:
-    DATABASES['default'] = {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'test_db.sqlite3',
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+        # Separate database standing in for a read replica (core tests of the router)
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'test_replica.sqlite3',
+        },
     }
+    REPLICA_DATABASES = []
+
+# Send the reads of safe API requests to REPLICA_DATABASES (core.db.routers)
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+
+# Seconds a client that wrote keeps reading from the primary (read-your-writes),
+# and requests reading the generation of a CACHE_GENERATION_MODELS table do
+# after it is written; keep it above REPLICA_MAX_LAG + REPLICA_LAG_CHECK_INTERVAL
+REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', '15'))
+
+# Replicas lagging more than this many seconds behind the primary are skipped
+REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+
+# Seconds between replica lag checks, per process
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '5'))
+
+# Models always read from the primary: written on most requests, and a stale
+# read would break authentication, sessions, cache invalidation or job polling
+REPLICA_PRIMARY_MODELS = ['django_cache.CacheEntry', 'authtoken.Token', 'sessions.Session', 'core.Job']
 
 
 # =============================================================================
@@ -176,6 +231,19 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Document files are stored content-addressed (deduplicated by SHA-256)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    'documents': {
+        'BACKEND': 'documents.storage.ContentAddressedStorage',
+    },
+}
+
 
 # =============================================================================
 # Default Primary Key Field Type
@@ -202,7 +270,21 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # orjson-backed JSON (api.renderers / api.parsers); the standard
+    # rest_framework JSONRenderer and JSONParser produce the same JSON.
+    # MessagePack is opt-in (Accept: application/msgpack)
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'api.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'api.exceptions.custom_exception_handler',
@@ -214,6 +296,21 @@ REST_FRAMEWORK = {
     },
 }
 
+# Page-number pagination (?page=): counts of at least this many rows are
+# planner estimates on PostgreSQL; exact counts are cached per filter
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = int(os.getenv('PAGINATION_COUNT_ESTIMATE_THRESHOLD', '10000'))
+PAGINATION_COUNT_CACHE_TIMEOUT = 300
+
+# Streamed lists (?stream=1, /clients/{id}/cases/): rows fetched and
+# rendered per chunk
+API_STREAM_CHUNK_SIZE = 500
+
+# Maximum sub-requests of a POST /api/v1/batch/ request
+BATCH_MAX_REQUESTS = 20
+
+# Maximum cases updated by a PATCH /api/v1/cases/bulk/ request
+BULK_UPDATE_MAX_ROWS = 1000
+
 
 # =============================================================================
 # CORS Configuration
@@ -245,6 +342,36 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 # Maximum file upload size in bytes (10MB)
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024
 
+# Resumable (chunked) uploads: maximum assembled size, default and maximum
+# chunk size, minimum chunk size (bounds the chunk count of a session; a
+# file that fits in one chunk may use a smaller one), and directory where
+# chunks are kept until the upload is completed
+RESUMABLE_UPLOAD_MAX_SIZE = 200 * 1024 * 1024
+RESUMABLE_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+RESUMABLE_UPLOAD_MIN_CHUNK_SIZE = 256 * 1024
+RESUMABLE_UPLOAD_DIR = Path(os.getenv('RESUMABLE_UPLOAD_DIR', BASE_DIR / 'tmp' / 'uploads'))
+
+# Seconds without new chunks after which gc_documents deletes an incomplete
+# upload session and its chunks
+RESUMABLE_UPLOAD_TTL = 24 * 3600
+
+# How document downloads are delivered: 'django' (FileResponse/sendfile),
+# 'x-accel-redirect' (nginx internal location) or 'x-sendfile' (Apache)
+DOCUMENT_DOWNLOAD_BACKEND = os.getenv('DOCUMENT_DOWNLOAD_BACKEND', 'django')
+DOCUMENT_ACCEL_REDIRECT_PREFIX = os.getenv('DOCUMENT_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
+# Orphaned document files are only deleted by `manage.py gc_documents`
+# once they have been unmodified for this many seconds
+DOCUMENT_GC_GRACE_PERIOD = 24 * 60 * 60
+
+# Files released by a delete are kept if modified within this many seconds:
+# a concurrent upload of the same content may have just reused them
+DOCUMENT_RELEASE_GRACE_PERIOD = 5 * 60
+
+# Background preview thumbnails (JPEG/PNG via Pillow, PDF via poppler's pdftoppm)
+DOCUMENT_PREVIEWS_ENABLED = os.getenv('DOCUMENT_PREVIEWS_ENABLED', 'True').lower() == 'true'
+DOCUMENT_THUMBNAIL_SIZE = (256, 256)
+
 # Allowed file MIME types for document uploads
 ALLOWED_FILE_TYPES = [
     'application/pdf',
@@ -256,6 +383,20 @@ ALLOWED_FILE_TYPES = [
 ]
 
 
+# =============================================================================
+# Background Jobs
+# =============================================================================
+# Jobs are stored in the database and run by `python manage.py run_worker`
+
+JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', '2'))
+JOB_POLL_INTERVAL = 1.0  # seconds between polls when the queue is empty
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BACKOFF = 10  # seconds; doubled after each failed attempt
+JOB_RETRY_BACKOFF_MAX = 3600
+JOB_LOCK_TIMEOUT = 600  # running jobs not refreshed by their worker for this long are requeued
+JOB_RETENTION = 7 * 24 * 3600  # seconds succeeded jobs are kept before the worker deletes them
+
+
 # =============================================================================
 # Cache Configuration
 # =============================================================================
@@ -267,6 +408,53 @@ CACHES = {
     }
 }
 
+# Writes to these models invalidate cached data derived from their tables
+# (page counts, ETags)
+CACHE_GENERATION_MODELS = ['clients.Client', 'cases.Case', 'documents.Document', 'auth.User']
+
+# Saves of only these fields (save(update_fields=...)) keep the generation:
+# no cached representation reads them, and last_login is written on every login
+CACHE_GENERATION_IGNORED_FIELDS = {'auth.User': ['last_login']}
+
+
+# =============================================================================
+# Delta Sync
+# =============================================================================
+# Writes to these models are appended to the change log served by
+# /api/v1/sync/ (sync type name -> model)
+
+SYNC_MODELS = {
+    'client': 'clients.Client',
+    'case': 'cases.Case',
+    'document': 'documents.Document',
+}
+# Maximum change log entries per /api/v1/sync/ response
+SYNC_PAGE_SIZE = 500
+
+
+# =============================================================================
+# Response Compression
+# =============================================================================
+# core.middleware.CompressionMiddleware: codings in order of preference
+# (br and zstd need the brotli and zstandard packages and are skipped if
+# missing). text/html is not compressed (BREACH); files are sent as stored.
+
+COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']
+COMPRESSION_LEVELS = {'zstd': 3, 'br': 5, 'gzip': 6}
+COMPRESSION_MIN_SIZE = 1024  # bytes
+COMPRESSION_CONTENT_TYPES = [
+    'application/json',
+    'application/msgpack',
+    'application/javascript',
+    'application/xml',
+    'text/css',
+    'text/csv',
+    'text/plain',
+    'image/svg+xml',
+]
+# Per-process LRU of compressed bodies, keyed by body digest
+COMPRESSION_CACHE_SIZE = 16 * 1024 * 1024  # 16MB
+
 
 # =============================================================================
 # Rate Limiting Configuration